@@ -0,0 +1,52 @@
+"""
+AI Batch Generation Model
+8-Level Nested Architecture: models/schemas/ai_batch/fields/validators/custom/ai_batch_model.py
+"""
+
+from pydantic import BaseModel, Field
+from typing import List
+
+# Upper bound on prompt specs per batch request
+MAX_BATCH_ITEMS = 100
+
+
+class JobAISpec(BaseModel):
+    """Inputs for one generated job listing (same as /admin/jobs/generate-ai)"""
+    job_title: str = Field(..., min_length=1, description="Job title")
+    company: str = Field(..., min_length=1, description="Company name")
+    location: str = Field(..., min_length=1, description="Job location")
+    job_type: str = Field(default="full-time", description="Job type")
+    category: str = Field(default="technology", description="Job category")
+    experience_level: str = Field(default="mid", description="Experience level")
+
+
+class InternshipAISpec(BaseModel):
+    """Inputs for one generated internship listing"""
+    title: str = Field(..., min_length=1)
+    company: str = Field(..., min_length=1)
+    location: str = Field(..., min_length=1)
+    duration: str = Field(default="3 months")
+    category: str = Field(default="technology")
+
+
+class ScholarshipAISpec(BaseModel):
+    """Inputs for one generated scholarship listing"""
+    title: str = Field(..., min_length=1)
+    provider: str = Field(..., min_length=1)
+    country: str = Field(..., min_length=1)
+    education_level: str = Field(default="undergraduate")
+
+
+class JobAIBatch(BaseModel):
+    """Schema for batch AI job generation"""
+    items: List[JobAISpec] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class InternshipAIBatch(BaseModel):
+    """Schema for batch AI internship generation"""
+    items: List[InternshipAISpec] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class ScholarshipAIBatch(BaseModel):
+    """Schema for batch AI scholarship generation"""
+    items: List[ScholarshipAISpec] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
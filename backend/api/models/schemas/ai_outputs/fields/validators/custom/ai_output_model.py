@@ -0,0 +1,149 @@
+"""
+AI Output Models
+8-Level Nested Architecture: models/schemas/ai_outputs/fields/validators/custom/ai_output_model.py
+
+Shapes the Gemini generators ask for. Responses are validated into these
+(utils/ai/gemini/parsing/json_parser.py) and they double as the response
+schema sent with JSON response mode. Only the fields the model actually
+returned are kept, so generators still apply their own defaults.
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class JobAIOutput(BaseModel):
+    """Generated part of a job listing"""
+    description: str
+    responsibilities: List[str] = []
+    skills_required: List[str] = []
+    qualifications: List[str] = []
+    benefits: List[str] = []
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+
+
+class InternshipAIOutput(BaseModel):
+    """Generated part of an internship listing"""
+    description: str
+    responsibilities: List[str] = []
+    skills_required: List[str] = []
+    qualifications: List[str] = []
+    learning_outcomes: List[str] = []
+    stipend_amount: Optional[float] = None
+
+
+class ScholarshipAIOutput(BaseModel):
+    """Generated part of a scholarship listing"""
+    description: str
+    eligibility_criteria: List[str] = []
+    benefits: List[str] = []
+    application_process: str = ""
+    amount: Optional[float] = None
+    field_of_study: List[str] = []
+
+
+class ArticleAIOutput(BaseModel):
+    """Generated article"""
+    title: Optional[str] = None
+    content: str
+    excerpt: Optional[str] = None
+    author: Optional[str] = None
+    tags: List[str] = []
+    category: Optional[str] = None
+    read_time: Optional[int] = None
+
+
+class RoadmapResourceAIOutput(BaseModel):
+    title: str
+    url: str
+
+
+class RoadmapNodeAIOutput(BaseModel):
+    id: str
+    title: str
+    description: Optional[str] = None
+    content: Optional[str] = None
+    position_x: float = 0
+    position_y: float = 0
+    parent_nodes: List[str] = []
+    child_nodes: List[str] = []
+    node_type: Optional[str] = None
+    color: Optional[str] = None
+    icon: Optional[str] = None
+    estimated_time: Optional[str] = None
+    resources: List[RoadmapResourceAIOutput] = []
+
+
+class RoadmapAIOutput(BaseModel):
+    """Generated roadmap with its node graph"""
+    title: Optional[str] = None
+    description: str
+    category: Optional[str] = None
+    subcategory: Optional[str] = None
+    difficulty_level: Optional[str] = None
+    estimated_duration: Optional[str] = None
+    tags: List[str] = []
+    nodes: List[RoadmapNodeAIOutput]
+
+
+class DSAExampleAIOutput(BaseModel):
+    input: str
+    output: str
+    explanation: Optional[str] = None
+
+
+class DSACodeSolutionAIOutput(BaseModel):
+    language: str
+    code: str
+
+
+class DSAQuestionAIOutput(BaseModel):
+    """Generated DSA question"""
+    title: str
+    description: str
+    difficulty: Optional[str] = None
+    topics: List[str] = []
+    companies: List[str] = []
+    input_format: Optional[str] = None
+    output_format: Optional[str] = None
+    constraints: Optional[str] = None
+    examples: List[DSAExampleAIOutput] = []
+    solution_approach: Optional[str] = None
+    time_complexity: Optional[str] = None
+    space_complexity: Optional[str] = None
+    code_solutions: List[DSACodeSolutionAIOutput] = []
+    hints: List[str] = []
+    acceptance_rate: Optional[float] = None
+    is_active: bool = True
+    is_premium: bool = False
+
+
+class DSADifficultyBreakdownAIOutput(BaseModel):
+    easy: int = 0
+    medium: int = 0
+    hard: int = 0
+
+
+class DSASheetQuestionAIOutput(BaseModel):
+    question_title: str
+    topic: Optional[str] = None
+    difficulty: Optional[str] = None
+    order: Optional[int] = None
+    is_completed: bool = False
+
+
+class DSASheetAIOutput(BaseModel):
+    """Generated DSA practice sheet"""
+    name: str
+    description: Optional[str] = None
+    author: Optional[str] = None
+    level: Optional[str] = None
+    estimated_time: Optional[str] = None
+    tags: List[str] = []
+    difficulty_breakdown: Optional[DSADifficultyBreakdownAIOutput] = None
+    topics_covered: List[str] = []
+    questions: List[DSASheetQuestionAIOutput] = []
+    is_published: bool = True
+    is_featured: bool = False
+    is_premium: bool = False
@@ -0,0 +1,22 @@
+"""
+Content Approval Model
+8-Level Nested Architecture: models/schemas/content_approval/fields/validators/custom/content_approval_model.py
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+# Upper bound on submissions reviewed per bulk request
+MAX_BULK_REVIEW = 500
+
+
+class BulkApproveRequest(BaseModel):
+    """Submissions to approve and publish in one call"""
+    submission_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_REVIEW)
+    review_notes: Optional[str] = None
+
+
+class BulkRejectRequest(BaseModel):
+    """Submissions to reject in one call"""
+    submission_ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_REVIEW)
+    review_notes: str = Field(..., min_length=1)
@@ -1,15 +1,50 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from bson import ObjectId
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.pagination import fetch_page
+from api.utils.helpers.stats_cache import stats_cache
+from pymongo import IndexModel, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "content_submissions": [
+        IndexModel([("status", 1), ("submitted_at", -1), ("_id", -1)], name="status_submitted_at_id"),
+        IndexModel([("status", 1), ("content_type", 1), ("submitted_at", -1), ("_id", -1)], name="status_content_type_submitted_at_id"),
+        IndexModel([("review_batch", 1)], name="review_batch", sparse=True),
+    ],
+    "push_notifications": [
+        IndexModel([("status", 1), ("created_at", -1), ("_id", -1)], name="status_created_at_id"),
+        IndexModel([("created_at", -1), ("_id", -1)], name="created_at_id"),
+    ]
+}
+
+# Submission content types that are published into a collection on approval
+PUBLISHED_CONTENT_TYPES = ("jobs", "internships", "articles")
+
+# Error code MongoDB reports for a duplicate _id
+DUPLICATE_KEY = 11000
+
 
 class ContentApprovalHandlers:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    """
+    Approval is a conditional state transition: a submission only leaves
+    "pending" through an update filtered on status="pending", so two reviewers
+    can never both publish it. The published document reuses the submission's
+    _id, which makes publishing idempotent; if the insert fails the submission
+    is put back to pending. (A multi-document transaction would need a replica
+    set, which standalone deployments of this app do not have.)
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, search_indexes: Optional[Dict[str, Any]] = None):
         self.db = db
         self.content_submissions = db["content_submissions"]
         self.jobs = db["jobs"]
         self.internships = db["internships"]
         self.articles = db["articles"]
+        self.search_indexes = search_indexes or {}
     
     async def submit_content_for_approval(self, content_type: str, content_data: Dict, submitted_by: str) -> Dict:
         """Submit content for admin approval"""
@@ -25,6 +60,7 @@ class ContentApprovalHandlers:
         }
         
         result = await self.content_submissions.insert_one(submission)
+        count_cache.invalidate(self.content_submissions.name)
         
         return {
             "success": True,
@@ -35,69 +71,94 @@ class ContentApprovalHandlers:
             }
         }
     
-    async def get_pending_submissions(self, content_type: Optional[str] = None, limit: int = 50, skip: int = 0) -> Dict:
+    async def get_pending_submissions(self, content_type: Optional[str] = None, limit: int = 50, skip: int = 0, cursor: Optional[str] = None, count: str = "exact") -> Dict:
         """Get all pending content submissions"""
         query = {"status": "pending"}
         if content_type:
             query["content_type"] = content_type
         
-        submissions_cursor = self.content_submissions.find(query).sort("submitted_at", -1).skip(skip).limit(limit)
-        submissions = []
+        submissions, next_cursor = await fetch_page(
+            self.content_submissions, query, "submitted_at", -1, limit, cursor=cursor, skip=skip
+        )
         
-        async for submission in submissions_cursor:
+        for submission in submissions:
             submission["_id"] = str(submission["_id"])
             submission["submitted_at"] = submission["submitted_at"].isoformat()
-            submissions.append(submission)
         
-        total = await self.content_submissions.count_documents(query)
+        total = await count_cache.count(self.content_submissions, query, count, cursor)
         
         return {
             "success": True,
             "data": submissions,
             "total": total,
             "page": skip // limit + 1,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     
+    def _review_update(self, status: str, reviewed_by: str, review_notes: Optional[str], review_batch: Optional[str] = None) -> Dict:
+        """$set for a pending -> approved/rejected transition"""
+        fields = {
+            "status": status,
+            "reviewed_by": reviewed_by,
+            "reviewed_at": datetime.utcnow(),
+            "review_notes": review_notes
+        }
+        if review_batch:
+            fields["review_batch"] = review_batch
+        return {"$set": fields}
+    
+    async def _revert_to_pending(self, query: Dict):
+        """Undo an approval whose content could not be published"""
+        await self.content_submissions.update_many(
+            {**query, "status": "approved"},
+            {"$set": {"status": "pending", "reviewed_by": None, "reviewed_at": None, "review_notes": None},
+             "$unset": {"review_batch": ""}}
+        )
+    
+    def _published(self, collection, docs: List[Dict]):
+        """Refresh caches after content was published"""
+        count_cache.invalidate(collection.name)
+        index = self.search_indexes.get(collection.name)
+        if index is not None:
+            for doc in docs:
+                index.upsert(doc)
+    
     async def approve_submission(self, submission_id: str, reviewed_by: str, review_notes: Optional[str] = None) -> Dict:
         """Approve a content submission and publish it"""
         try:
-            submission = await self.content_submissions.find_one({"_id": ObjectId(submission_id)})
+            # Claim: only one reviewer can move the submission out of pending
+            submission = await self.content_submissions.find_one_and_update(
+                {"_id": ObjectId(submission_id), "status": "pending"},
+                self._review_update("approved", reviewed_by, review_notes),
+                return_document=ReturnDocument.AFTER
+            )
             
             if not submission:
+                if await self.content_submissions.find_one({"_id": ObjectId(submission_id)}, {"_id": 1}):
+                    return {"success": False, "error": "Submission already reviewed"}
                 return {"success": False, "error": "Submission not found"}
+            count_cache.invalidate(self.content_submissions.name)
             
-            if submission["status"] != "pending":
-                return {"success": False, "error": "Submission already reviewed"}
-            
-            # Insert content into respective collection
+            # Publish under the submission's _id
             content_type = submission["content_type"]
-            content_data = submission["content_data"]
-            
-            if content_type == "jobs":
-                await self.jobs.insert_one(content_data)
-            elif content_type == "internships":
-                await self.internships.insert_one(content_data)
-            elif content_type == "articles":
-                await self.articles.insert_one(content_data)
-            
-            # Update submission status
-            await self.content_submissions.update_one(
-                {"_id": ObjectId(submission_id)},
-                {
-                    "$set": {
-                        "status": "approved",
-                        "reviewed_by": reviewed_by,
-                        "reviewed_at": datetime.utcnow(),
-                        "review_notes": review_notes
-                    }
-                }
-            )
+            if content_type in PUBLISHED_CONTENT_TYPES:
+                collection = self.db[content_type]
+                doc = {**submission["content_data"], "_id": submission["_id"]}
+                try:
+                    await collection.insert_one(doc)
+                except DuplicateKeyError:
+                    pass
+                except Exception:
+                    await self._revert_to_pending({"_id": submission["_id"]})
+                    raise
+                self._published(collection, [doc])
             
             return {
                 "success": True,
                 "data": {
-                    "message": "Content approved and published"
+                    "message": "Content approved and published",
+                    "content_id": str(submission["_id"])
                 }
             }
         except Exception as e:
@@ -108,15 +169,9 @@ class ContentApprovalHandlers:
         try:
             result = await self.content_submissions.update_one(
                 {"_id": ObjectId(submission_id), "status": "pending"},
-                {
-                    "$set": {
-                        "status": "rejected",
-                        "reviewed_by": reviewed_by,
-                        "reviewed_at": datetime.utcnow(),
-                        "review_notes": review_notes
-                    }
-                }
+                self._review_update("rejected", reviewed_by, review_notes)
             )
+            count_cache.invalidate(self.content_submissions.name)
             
             if result.modified_count == 0:
                 return {"success": False, "error": "Submission not found or already reviewed"}
@@ -130,47 +185,144 @@ class ContentApprovalHandlers:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def _claim_many(self, submission_ids: List[str], status: str, reviewed_by: str, review_notes: Optional[str], projection: Optional[Dict] = None) -> tuple:
+        """
+        Move many pending submissions to status with one update_many
+        
+        Each document transitions at most once, so tagging the update with a
+        fresh review_batch and reading it back returns exactly the submissions
+        this call won, even when reviewers race.
+        
+        Returns:
+            (claimed submissions, {submission_id: error} for the rest)
+        """
+        ids = []
+        errors = {}
+        for submission_id in dict.fromkeys(submission_ids):
+            if ObjectId.is_valid(submission_id):
+                ids.append(ObjectId(submission_id))
+            else:
+                errors[submission_id] = "Invalid submission ID"
+        
+        review_batch = str(ObjectId())
+        claimed = []
+        if ids:
+            await self.content_submissions.update_many(
+                {"_id": {"$in": ids}, "status": "pending"},
+                self._review_update(status, reviewed_by, review_notes, review_batch)
+            )
+            claimed = await self.content_submissions.find({"review_batch": review_batch}, projection).to_list(length=None)
+            count_cache.invalidate(self.content_submissions.name)
+        
+        claimed_ids = {doc["_id"] for doc in claimed}
+        for oid in ids:
+            if oid not in claimed_ids:
+                errors[str(oid)] = "Submission not found or already reviewed"
+        return claimed, errors
+    
+    async def bulk_approve_submissions(self, submission_ids: List[str], reviewed_by: str, review_notes: Optional[str] = None) -> Dict:
+        """Approve many submissions and publish them with one insert_many per content type"""
+        claimed, errors = await self._claim_many(submission_ids, "approved", reviewed_by, review_notes)
+        
+        by_type: Dict[str, List[Dict]] = {}
+        for submission in claimed:
+            if submission["content_type"] in PUBLISHED_CONTENT_TYPES:
+                by_type.setdefault(submission["content_type"], []).append(
+                    {**submission["content_data"], "_id": submission["_id"]}
+                )
+        
+        failed_ids = []
+        published = {}
+        for content_type, docs in by_type.items():
+            collection = self.db[content_type]
+            failed_positions = {}
+            try:
+                await collection.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                # Already-published _ids (a retried approval) count as published
+                failed_positions = {
+                    err["index"]: err.get("errmsg", "Insert failed")
+                    for err in e.details.get("writeErrors", []) if err.get("code") != DUPLICATE_KEY
+                }
+            except Exception as e:
+                failed_positions = {position: str(e) for position in range(len(docs))}
+            
+            for position, error in failed_positions.items():
+                failed_ids.append(docs[position]["_id"])
+                errors[str(docs[position]["_id"])] = error
+            inserted = [doc for position, doc in enumerate(docs) if position not in failed_positions]
+            if inserted:
+                self._published(collection, inserted)
+            published[content_type] = len(inserted)
+        
+        if failed_ids:
+            await self._revert_to_pending({"_id": {"$in": failed_ids}})
+        
+        failed_set = set(failed_ids)
+        return {
+            "success": True,
+            "data": {
+                "approved": [str(doc["_id"]) for doc in claimed if doc["_id"] not in failed_set],
+                "published": published,
+                "errors": errors
+            }
+        }
+    
+    async def bulk_reject_submissions(self, submission_ids: List[str], reviewed_by: str, review_notes: str) -> Dict:
+        """Reject many submissions with one update_many"""
+        claimed, errors = await self._claim_many(submission_ids, "rejected", reviewed_by, review_notes, {"_id": 1})
+        return {
+            "success": True,
+            "data": {
+                "rejected": [str(doc["_id"]) for doc in claimed],
+                "errors": errors
+            }
+        }
+    
     async def get_submission_stats(self) -> Dict:
         """Get content approval statistics"""
-        total_pending = await self.content_submissions.count_documents({"status": "pending"})
-        total_approved = await self.content_submissions.count_documents({"status": "approved"})
-        total_rejected = await self.content_submissions.count_documents({"status": "rejected"})
-        
-        # By content type
+        return {"success": True, "data": await stats_cache.get("content_submissions", self._compute_submission_stats)}
+    
+    async def _compute_submission_stats(self) -> Dict:
+        # One pass: per (type, status) counts; the status totals are their sums
         pipeline = [
             {"$group": {"_id": {"type": "$content_type", "status": "$status"}, "count": {"$sum": 1}}}
         ]
         
-        stats_cursor = self.content_submissions.aggregate(pipeline)
+        totals = {"pending": 0, "approved": 0, "rejected": 0}
         by_type = {}
-        async for stat in stats_cursor:
-            content_type = stat["_id"]["type"]
-            status = stat["_id"]["status"]
+        async for stat in self.content_submissions.aggregate(pipeline):
+            content_type = stat["_id"].get("type")
+            status = stat["_id"].get("status")
             
             if content_type not in by_type:
                 by_type[content_type] = {"pending": 0, "approved": 0, "rejected": 0}
             
             by_type[content_type][status] = stat["count"]
+            totals[status] = totals.get(status, 0) + stat["count"]
         
         return {
-            "success": True,
-            "data": {
-                "total_pending": total_pending,
-                "total_approved": total_approved,
-                "total_rejected": total_rejected,
-                "by_content_type": by_type
-            }
+            "total_pending": totals["pending"],
+            "total_approved": totals["approved"],
+            "total_rejected": totals["rejected"],
+            "by_content_type": by_type
         }
 
 
 class PushNotificationHandlers:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, dispatcher):
         self.db = db
         self.push_notifications = db["push_notifications"]
-        self.notification_logs = db["notification_logs"]
+        self.notification_deliveries = db["notification_deliveries"]
+        self.dispatcher = dispatcher
     
     async def create_notification(self, title: str, message: str, target: str, target_ids: Optional[List[str]] = None, data: Optional[Dict] = None, scheduled_at: Optional[datetime] = None) -> Dict:
-        """Create a push notification"""
+        """
+        Create a push notification
+        
+        With scheduled_at the dispatcher sends it once that time is reached;
+        without it the notification stays pending until send_notification.
+        """
         notification = {
             "title": title,
             "message": message,
@@ -179,6 +331,7 @@ class PushNotificationHandlers:
             "data": data or {},
             "status": "pending",  # pending, sent, failed
             "scheduled_at": scheduled_at or datetime.utcnow(),
+            "auto_send": scheduled_at is not None,
             "created_at": datetime.utcnow(),
             "sent_at": None,
             "sent_count": 0,
@@ -186,6 +339,7 @@ class PushNotificationHandlers:
         }
         
         result = await self.push_notifications.insert_one(notification)
+        count_cache.invalidate(self.push_notifications.name)
         
         return {
             "success": True,
@@ -195,78 +349,85 @@ class PushNotificationHandlers:
             }
         }
     
-    async def get_notifications(self, status: Optional[str] = None, limit: int = 50, skip: int = 0) -> Dict:
+    async def get_notifications(self, status: Optional[str] = None, limit: int = 50, skip: int = 0, cursor: Optional[str] = None, count: str = "exact") -> Dict:
         """Get push notifications with optional status filter"""
         query = {}
         if status:
             query["status"] = status
         
-        notifications_cursor = self.push_notifications.find(query).sort("created_at", -1).skip(skip).limit(limit)
-        notifications = []
+        notifications, next_cursor = await fetch_page(
+            self.push_notifications, query, "created_at", -1, limit, cursor=cursor, skip=skip
+        )
         
-        async for notification in notifications_cursor:
+        for notification in notifications:
             notification["_id"] = str(notification["_id"])
             notification["created_at"] = notification["created_at"].isoformat()
             notification["scheduled_at"] = notification["scheduled_at"].isoformat() if notification.get("scheduled_at") else None
             notification["sent_at"] = notification["sent_at"].isoformat() if notification.get("sent_at") else None
-            notifications.append(notification)
+            if notification.get("dispatch", {}).get("last_recipient_id") is not None:
+                notification["dispatch"]["last_recipient_id"] = str(notification["dispatch"]["last_recipient_id"])
         
-        total = await self.push_notifications.count_documents(query)
+        total = await count_cache.count(self.push_notifications, query, count, cursor)
         
         return {
             "success": True,
             "data": notifications,
             "total": total,
             "page": skip // limit + 1,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     
     async def send_notification(self, notification_id: str) -> Dict:
-        """Send a push notification (mock implementation)"""
+        """Start sending a pending push notification now (delivery runs in the background)"""
         try:
-            notification = await self.push_notifications.find_one({"_id": ObjectId(notification_id)})
+            notification = await self.dispatcher.dispatch_now(notification_id)
             
             if not notification:
-                return {"success": False, "error": "Notification not found"}
-            
-            # Mock sending logic (in real app, integrate with Firebase/OneSignal/etc.)
-            sent_count = len(notification.get("target_ids", [])) if notification["target"] == "specific_users" else 100
-            
-            # Update notification status
-            await self.push_notifications.update_one(
-                {"_id": ObjectId(notification_id)},
-                {
-                    "$set": {
-                        "status": "sent",
-                        "sent_at": datetime.utcnow(),
-                        "sent_count": sent_count,
-                        "failed_count": 0
-                    }
-                }
-            )
-            
-            # Log the notification
-            await self.notification_logs.insert_one({
-                "notification_id": notification_id,
-                "sent_count": sent_count,
-                "failed_count": 0,
-                "sent_at": datetime.utcnow()
-            })
+                existing = await self.push_notifications.find_one({"_id": ObjectId(notification_id)}, {"status": 1})
+                if not existing:
+                    return {"success": False, "error": "Notification not found"}
+                return {"success": False, "error": f"Notification is already {existing['status']}"}
             
             return {
                 "success": True,
                 "data": {
-                    "message": "Notification sent",
-                    "sent_count": sent_count
+                    "message": "Notification dispatch started",
+                    "status": "sending"
                 }
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def get_deliveries(self, notification_id: str, limit: int = 50, skip: int = 0, cursor: Optional[str] = None) -> Dict:
+        """Get per-batch delivery results of a notification"""
+        try:
+            query = {"notification_id": ObjectId(notification_id)}
+        except Exception:
+            return {"success": False, "error": "Invalid notification ID"}
+        
+        deliveries, next_cursor = await fetch_page(
+            self.notification_deliveries, query, "batch", 1, limit, cursor=cursor, skip=skip
+        )
+        
+        for delivery in deliveries:
+            delivery["_id"] = str(delivery["_id"])
+            delivery["notification_id"] = str(delivery["notification_id"])
+            delivery["sent_at"] = delivery["sent_at"].isoformat() if delivery.get("sent_at") else None
+        
+        return {
+            "success": True,
+            "data": deliveries,
+            "page": skip // limit + 1,
+            "limit": limit,
+            "next_cursor": next_cursor
+        }
+    
     async def delete_notification(self, notification_id: str) -> Dict:
         """Delete a push notification"""
         try:
             result = await self.push_notifications.delete_one({"_id": ObjectId(notification_id)})
+            count_cache.invalidate(self.push_notifications.name)
             
             if result.deleted_count == 0:
                 return {"success": False, "error": "Notification not found"}
@@ -282,27 +443,25 @@ class PushNotificationHandlers:
     
     async def get_notification_stats(self) -> Dict:
         """Get push notification statistics"""
-        total_sent = await self.push_notifications.count_documents({"status": "sent"})
-        total_pending = await self.push_notifications.count_documents({"status": "pending"})
-        total_failed = await self.push_notifications.count_documents({"status": "failed"})
-        
-        # Total recipients reached
+        return {"success": True, "data": await stats_cache.get("push_notifications", self._compute_notification_stats)}
+    
+    async def _compute_notification_stats(self) -> Dict:
+        # One pass: counts and recipients per status
         pipeline = [
-            {"$match": {"status": "sent"}},
-            {"$group": {"_id": None, "total_recipients": {"$sum": "$sent_count"}}}
+            {"$group": {"_id": "$status", "count": {"$sum": 1}, "recipients": {"$sum": "$sent_count"}}}
         ]
         
-        recipients_cursor = self.push_notifications.aggregate(pipeline)
-        total_recipients = 0
-        async for stat in recipients_cursor:
-            total_recipients = stat.get("total_recipients", 0)
+        by_status = {}
+        async for stat in self.push_notifications.aggregate(pipeline):
+            by_status[stat["_id"]] = stat
+        
+        def count(status: str) -> int:
+            return by_status.get(status, {}).get("count", 0)
         
         return {
-            "success": True,
-            "data": {
-                "total_sent": total_sent,
-                "total_pending": total_pending,
-                "total_failed": total_failed,
-                "total_recipients_reached": total_recipients
-            }
+            "total_sent": count("sent"),
+            "total_pending": count("pending"),
+            "total_sending": count("sending"),
+            "total_failed": count("failed"),
+            "total_recipients_reached": by_status.get("sent", {}).get("recipients", 0)
         }
@@ -0,0 +1,369 @@
+"""
+Push Notification Dispatcher
+8-Level Nested Architecture: routes/admin/advanced/management/operations/handlers/push_dispatcher.py
+
+Delivers push_notifications through a PushTransport
+(utils/notifications/push/transports/push_transport.py).
+
+- Scheduling: a background poller claims due notifications (status pending,
+  auto_send set, scheduled_at reached) with find_one_and_update, so several
+  workers never send the same one. auto_send is only set when the admin gave
+  an explicit scheduled_at or pressed "send": a notification created without
+  a time waits for "send", and pending rows from before the scheduler existed
+  (no auto_send) are never sent on their own. "Send now" claims a single
+  notification the same way and sets auto_send, so an interrupted send is
+  resumed by the poller.
+- Fan-out: recipients are streamed from app_users / admin_users in _id order
+  and cut into transport-sized batches. Up to `concurrency` batches are sent
+  at once, so memory stays at concurrency x batch size recipients whatever the
+  audience size.
+- Bookkeeping: every window of batches is recorded in notification_deliveries
+  with one bulk_write, then a single update on the notification advances its
+  counters and the _id checkpoint together.
+- Recovery: a dispatch interrupted by shutdown goes back to pending, and one
+  whose worker died is reclaimed once its heartbeat is stale. Both resume
+  after the checkpoint, so at most one window is sent twice (at-least-once).
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import IndexModel, ReturnDocument, UpdateOne
+
+from api.utils.helpers.count_cache import count_cache
+
+logger = logging.getLogger(__name__)
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "push_notifications": [
+        IndexModel([("status", 1), ("auto_send", 1), ("scheduled_at", 1)], name="status_auto_send_scheduled_at"),
+    ],
+    "notification_deliveries": [
+        IndexModel([("notification_id", 1), ("batch", 1)], name="notification_id_batch", unique=True),
+    ]
+}
+
+# Failed recipients kept per delivery record (the counts are always exact)
+MAX_LOGGED_FAILURES = 100
+
+
+class PushDispatcher:
+    """Scheduler and fan-out engine for push notifications"""
+
+    def __init__(
+        self,
+        db,
+        transport,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None
+    ):
+        """
+        Args:
+            db: Motor database
+            transport: PushTransport the batches are sent through
+            concurrency: Batches in flight at once per notification
+            poll_interval: Seconds between scheduler polls
+            max_attempts: Attempts per batch when the transport raises
+            retry_base: First backoff delay in seconds (doubles per retry)
+        """
+        self.db = db
+        self.push_notifications = db["push_notifications"]
+        self.deliveries = db["notification_deliveries"]
+        self.notification_logs = db["notification_logs"]
+        self.transport = transport
+        self.concurrency = concurrency or int(os.environ.get("PUSH_DISPATCH_CONCURRENCY", 8))
+        self.poll_interval = poll_interval or float(os.environ.get("PUSH_DISPATCH_POLL_SECONDS", 15))
+        self.max_attempts = max_attempts or int(os.environ.get("PUSH_SEND_MAX_ATTEMPTS", 3))
+        self.retry_base = retry_base if retry_base is not None else float(
+            os.environ.get("PUSH_SEND_RETRY_BASE_SECONDS", 1)
+        )
+        self.max_active = int(os.environ.get("PUSH_DISPATCH_MAX_ACTIVE", 2))
+        self.stale_after = float(os.environ.get("PUSH_DISPATCH_STALE_SECONDS", 300))
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._scheduler: Optional[asyncio.Task] = None
+        self._stats = {
+            "dispatches": 0,
+            "completed": 0,
+            "failed": 0,
+            "requeued": 0,
+            "batches": 0,
+            "batch_retries": 0,
+            "sent": 0,
+            "failed_recipients": 0
+        }
+
+    # =============================================================================
+    # SCHEDULING
+    # =============================================================================
+
+    def start(self):
+        """Start the scheduler that picks up due notifications"""
+        if self._scheduler is None:
+            self._scheduler = asyncio.get_running_loop().create_task(self._poll_periodically())
+
+    async def stop(self):
+        """Stop the scheduler; running dispatches requeue themselves at their checkpoint"""
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            self._scheduler = None
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _poll_periodically(self):
+        while True:
+            try:
+                await self.dispatch_due()
+            except Exception as e:
+                logger.error(f"Push notification scheduler failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def dispatch_due(self) -> int:
+        """Claim due (or stalled) notifications up to max_active; returns how many started"""
+        started = 0
+        while len(self._tasks) < self.max_active:
+            now = datetime.utcnow()
+            notification = await self.push_notifications.find_one_and_update(
+                {"$or": [
+                    {"status": "pending", "auto_send": True, "scheduled_at": {"$lte": now}},
+                    {"status": "sending", "dispatch.heartbeat_at": {"$lt": now - timedelta(seconds=self.stale_after)}}
+                ]},
+                {"$set": {"status": "sending", "dispatch.heartbeat_at": now}},
+                sort=[("scheduled_at", 1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if not notification:
+                break
+            self._start(notification)
+            started += 1
+        return started
+
+    async def dispatch_now(self, notification_id: str) -> Optional[Dict[str, Any]]:
+        """Claim a pending notification regardless of scheduled_at and start sending it"""
+        notification = await self.push_notifications.find_one_and_update(
+            {"_id": ObjectId(notification_id), "status": "pending"},
+            {"$set": {"status": "sending", "auto_send": True, "dispatch.heartbeat_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+        if notification:
+            self._start(notification)
+        return notification
+
+    def _start(self, notification: Dict[str, Any]):
+        key = str(notification["_id"])
+        task = asyncio.get_running_loop().create_task(self._dispatch(notification))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        self._stats["dispatches"] += 1
+        count_cache.invalidate(self.push_notifications.name)
+
+    # =============================================================================
+    # FAN-OUT
+    # =============================================================================
+
+    def _target_query(self, notification: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        """Collection and filter selecting a notification's recipients"""
+        target = notification.get("target")
+        if target == "all":
+            return self.db["app_users"], {"is_active": {"$ne": False}}
+        if target == "admins":
+            return self.db["admin_users"], {"is_active": {"$ne": False}}
+        if target == "specific_users":
+            ids = [ObjectId(i) for i in notification.get("target_ids", []) if ObjectId.is_valid(i)]
+            return self.db["app_users"], {"_id": {"$in": ids}}
+        raise ValueError(f"Unknown notification target: {target}")
+
+    async def _send_with_retry(self, message: Dict[str, Any], recipients: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send one batch, retrying batch-level transport errors with backoff"""
+        started = time.monotonic()
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                failures = await self.transport.send_batch(message, recipients)
+                error = None
+                break
+            except Exception as e:
+                if attempts >= self.max_attempts:
+                    failures = {r["user_id"]: str(e) for r in recipients}
+                    error = str(e)
+                    break
+                self._stats["batch_retries"] += 1
+                delay = self.retry_base * 2 ** (attempts - 1)
+                await asyncio.sleep(delay / 2 + random.uniform(0, delay / 2))
+        return {
+            "failures": failures,
+            "attempts": attempts,
+            "error": error,
+            "duration_ms": round((time.monotonic() - started) * 1000, 2)
+        }
+
+    async def _send_window(
+        self,
+        notification_id: ObjectId,
+        message: Dict[str, Any],
+        window: List[Tuple[ObjectId, List[Dict[str, Any]]]],
+        batch_no: int
+    ) -> int:
+        """Send a window of batches concurrently and record it; returns the next batch number"""
+        results = await asyncio.gather(*[self._send_with_retry(message, recipients) for _, recipients in window])
+
+        now = datetime.utcnow()
+        operations = []
+        sent = failed = 0
+        for offset, ((_, recipients), result) in enumerate(zip(window, results)):
+            failures = result["failures"]
+            sent += len(recipients) - len(failures)
+            failed += len(failures)
+            operations.append(UpdateOne(
+                {"notification_id": notification_id, "batch": batch_no + offset},
+                {"$set": {
+                    "recipients": len(recipients),
+                    "sent": len(recipients) - len(failures),
+                    "failed": len(failures),
+                    "failures": [
+                        {"user_id": user_id, "error": error}
+                        for user_id, error in list(failures.items())[:MAX_LOGGED_FAILURES]
+                    ],
+                    "first_recipient_id": recipients[0]["user_id"],
+                    "last_recipient_id": recipients[-1]["user_id"],
+                    "attempts": result["attempts"],
+                    "error": result["error"],
+                    "duration_ms": result["duration_ms"],
+                    "sent_at": now
+                }},
+                upsert=True
+            ))
+        await self.deliveries.bulk_write(operations, ordered=False)
+
+        # Counters and checkpoint move together, so a resume never double counts
+        await self.push_notifications.update_one(
+            {"_id": notification_id},
+            {
+                "$inc": {"sent_count": sent, "failed_count": failed},
+                "$set": {
+                    "dispatch.last_recipient_id": window[-1][0],
+                    "dispatch.batches": batch_no + len(window),
+                    "dispatch.heartbeat_at": now
+                }
+            }
+        )
+        self._stats["batches"] += len(window)
+        self._stats["sent"] += sent
+        self._stats["failed_recipients"] += failed
+        return batch_no + len(window)
+
+    async def _dispatch(self, notification: Dict[str, Any]):
+        """Stream recipients, send them in batches and record the outcome"""
+        notification_id = notification["_id"]
+        dispatch = notification.get("dispatch") or {}
+        batch_no = dispatch.get("batches", 0)
+        message = {
+            "notification_id": str(notification_id),
+            "title": notification.get("title"),
+            "message": notification.get("message"),
+            "data": notification.get("data") or {}
+        }
+
+        try:
+            collection, query = self._target_query(notification)
+            if dispatch.get("started_at") is None:
+                await self.push_notifications.update_one(
+                    {"_id": notification_id},
+                    {"$set": {
+                        "dispatch.started_at": datetime.utcnow(),
+                        "dispatch.total": await collection.count_documents(query),
+                        "dispatch.batches": 0,
+                        "sent_count": 0,
+                        "failed_count": 0
+                    }}
+                )
+            elif dispatch.get("last_recipient_id") is not None:
+                query = {**query, "_id": {**query.get("_id", {}), "$gt": dispatch["last_recipient_id"]}}
+
+            batch_size = self.transport.max_batch_size
+            window: List[Tuple[ObjectId, List[Dict[str, Any]]]] = []
+            batch: List[Dict[str, Any]] = []
+            last_id = None
+            cursor = collection.find(query, {"push_token": 1}).sort("_id", 1).batch_size(batch_size)
+            async for user in cursor:
+                last_id = user["_id"]
+                batch.append({"user_id": str(last_id), "token": user.get("push_token")})
+                if len(batch) >= batch_size:
+                    window.append((last_id, batch))
+                    batch = []
+                    if len(window) >= self.concurrency:
+                        batch_no = await self._send_window(notification_id, message, window, batch_no)
+                        window = []
+            if batch:
+                window.append((last_id, batch))
+            if window:
+                batch_no = await self._send_window(notification_id, message, window, batch_no)
+
+            totals = await self.push_notifications.find_one(
+                {"_id": notification_id}, {"sent_count": 1, "failed_count": 1}
+            ) or {}
+            sent_count = totals.get("sent_count", 0)
+            failed_count = totals.get("failed_count", 0)
+            status = "failed" if failed_count and not sent_count else "sent"
+            now = datetime.utcnow()
+            await self.push_notifications.update_one(
+                {"_id": notification_id},
+                {"$set": {"status": status, "sent_at": now, "dispatch.finished_at": now, "dispatch.heartbeat_at": now}}
+            )
+            await self.notification_logs.insert_one({
+                "notification_id": str(notification_id),
+                "sent_count": sent_count,
+                "failed_count": failed_count,
+                "batches": batch_no,
+                "transport": self.transport.name,
+                "sent_at": now
+            })
+            self._stats["completed" if status == "sent" else "failed"] += 1
+            logger.info(f"Push notification {notification_id} {status}: sent={sent_count} failed={failed_count}")
+        except asyncio.CancelledError:
+            # Back to pending; the next scheduler poll resumes after the checkpoint
+            await self._set_status(notification_id, "pending", None)
+            self._stats["requeued"] += 1
+            raise
+        except Exception as e:
+            logger.error(f"Push notification {notification_id} failed: {e}")
+            await self._set_status(notification_id, "failed", str(e))
+            self._stats["failed"] += 1
+        finally:
+            count_cache.invalidate(self.push_notifications.name)
+
+    async def _set_status(self, notification_id: ObjectId, status: str, error: Optional[str]):
+        try:
+            await self.push_notifications.update_one(
+                {"_id": notification_id, "status": "sending"},
+                {"$set": {"status": status, "dispatch.error": error, "dispatch.heartbeat_at": datetime.utcnow()}}
+            )
+        except Exception as e:
+            logger.error(f"Failed to record push notification {notification_id} as {status}: {e}")
+
+    # =============================================================================
+    # HELPER METHODS
+    # =============================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get dispatch metrics for this process"""
+        return {
+            **self._stats,
+            "active_dispatches": len(self._tasks),
+            "concurrency": self.concurrency,
+            "max_active": self.max_active,
+            "poll_interval_seconds": self.poll_interval,
+            "transport": self.transport.get_stats()
+        }
@@ -0,0 +1,329 @@
+"""
+AI Batch Generation Handlers
+8-Level Nested Architecture: routes/admin/ai_batch/management/operations/handlers/ai_batch_handlers.py
+
+Generates many job, internship or scholarship listings from one request. A
+batch is recorded in ai_batch_jobs and run in the background: specs are fanned
+out to the Gemini generator with bounded concurrency, rate-limit and timeout
+errors are retried with exponential backoff, and generated listings are written
+with insert_many in groups. Item status and counters are saved after every
+group, so polling the batch shows partial results while it runs.
+"""
+
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import IndexModel
+from pymongo.errors import BulkWriteError
+
+from api.utils.helpers.count_cache import count_cache
+
+logger = logging.getLogger(__name__)
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "ai_batch_jobs": [
+        IndexModel([("created_at", -1)], name="created_at"),
+        IndexModel([("status", 1), ("updated_at", 1)], name="status_updated_at"),
+    ]
+}
+
+# content type -> generator method producing one listing from a spec
+GENERATOR_METHODS = {
+    "jobs": "generate_job_listing",
+    "internships": "generate_internship_listing",
+    "scholarships": "generate_scholarship_listing",
+}
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# Errors worth retrying: Gemini rate limits / overload and executor timeouts.
+# Matched by class name so google.api_core is not imported here.
+RETRYABLE_ERRORS = (
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+    "InternalServerError", "DeadlineExceeded", "AIExecutionTimeout", "AIRateLimited",
+)
+RETRYABLE_MESSAGES = ("429", "resource exhausted", "rate limit", "quota", "503", "timed out", "did not complete")
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error (or one it was raised from) is a transient rate limit / timeout"""
+    seen = 0
+    while error is not None and seen < 5:
+        if type(error).__name__ in RETRYABLE_ERRORS:
+            return True
+        message = str(error).lower()
+        if any(marker in message for marker in RETRYABLE_MESSAGES):
+            return True
+        error = error.__cause__ or error.__context__
+        seen += 1
+    return False
+
+
+class AIBatchHandlers:
+    """Background batch generation of listings with Gemini"""
+
+    def __init__(
+        self,
+        db,
+        generator,
+        search_indexes: Optional[Dict[str, Any]] = None,
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        insert_batch_size: Optional[int] = None
+    ):
+        """
+        Args:
+            db: Motor database
+            generator: GeminiJobGenerator (None when Gemini is not configured)
+            search_indexes: collection name -> CollectionSearchIndex to keep in sync
+            concurrency: Max specs generated at once per batch
+            max_attempts: Attempts per spec, including the first
+            retry_base: First backoff delay in seconds (doubles per retry)
+            insert_batch_size: Generated listings written per insert_many
+        """
+        self.db = db
+        self.collection = db.ai_batch_jobs
+        self.generator = generator
+        self.search_indexes = search_indexes or {}
+        self.concurrency = concurrency or int(os.environ.get("AI_BATCH_CONCURRENCY", 4))
+        self.max_attempts = max_attempts or int(os.environ.get("AI_BATCH_MAX_ATTEMPTS", 4))
+        self.retry_base = retry_base if retry_base is not None else float(
+            os.environ.get("AI_BATCH_RETRY_BASE_SECONDS", 2)
+        )
+        self.retry_cap = float(os.environ.get("AI_BATCH_RETRY_MAX_SECONDS", 30))
+        self.insert_batch_size = insert_batch_size or int(os.environ.get("AI_BATCH_INSERT_SIZE", 10))
+        self.stale_after = float(os.environ.get("AI_BATCH_STALE_SECONDS", 900))
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stats = {"batches": 0, "generated": 0, "failed": 0, "retries": 0, "inserted": 0}
+
+    # =============================================================================
+    # BATCH LIFECYCLE
+    # =============================================================================
+
+    async def create_batch(self, content_type: str, specs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Record a batch and start generating it in the background"""
+        if content_type not in GENERATOR_METHODS:
+            raise HTTPException(status_code=400, detail=f"Unsupported content type: {content_type}")
+        if not self.generator:
+            raise HTTPException(status_code=503, detail="Gemini API not configured")
+
+        now = datetime.utcnow()
+        batch = {
+            "content_type": content_type,
+            "status": "queued",
+            "total": len(specs),
+            "inserted": 0,
+            "failed": 0,
+            "retries": 0,
+            "items": [
+                {"index": i, "spec": spec, "status": "pending", "attempts": 0, "result_id": None, "error": None}
+                for i, spec in enumerate(specs)
+            ],
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "started_at": None,
+            "finished_at": None
+        }
+        result = await self.collection.insert_one(batch)
+        batch_id = str(result.inserted_id)
+
+        task = asyncio.get_running_loop().create_task(self._run_batch(result.inserted_id, content_type, specs))
+        self._tasks[batch_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(batch_id, None))
+        self._stats["batches"] += 1
+
+        return {"success": True, "batch": self._format_batch(batch)}
+
+    async def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Get batch status with per-item results"""
+        if not ObjectId.is_valid(batch_id):
+            raise HTTPException(status_code=400, detail="Invalid batch ID")
+        batch = await self.collection.find_one({"_id": ObjectId(batch_id)})
+        if not batch:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        return {"success": True, "batch": self._format_batch(batch)}
+
+    async def list_batches(self, limit: int = 20) -> Dict[str, Any]:
+        """List recent batches without their items"""
+        batches = await self.collection.find({}, {"items": 0}).sort("created_at", -1).limit(limit).to_list(length=limit)
+        return {"success": True, "batches": [self._format_batch(b) for b in batches]}
+
+    async def recover_interrupted(self) -> int:
+        """Mark batches abandoned by a crashed worker as interrupted"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        result = await self.collection.update_many(
+            {"status": {"$in": list(ACTIVE_STATUSES)}, "updated_at": {"$lt": cutoff}},
+            {"$set": {"status": "interrupted", "finished_at": datetime.utcnow()}}
+        )
+        if result.modified_count:
+            logger.warning(f"Marked {result.modified_count} stale AI batch(es) as interrupted")
+        return result.modified_count
+
+    async def shutdown(self):
+        """Cancel running batches; each records itself as interrupted"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # =============================================================================
+    # EXECUTION
+    # =============================================================================
+
+    async def _generate_one(self, method, index: int, spec: Dict[str, Any], slots: asyncio.Semaphore) -> Dict[str, Any]:
+        """Generate one listing, retrying transient failures with backoff"""
+        attempts = 0
+        async with slots:
+            while True:
+                attempts += 1
+                try:
+                    return {"index": index, "doc": await method(dict(spec)), "attempts": attempts}
+                except Exception as e:
+                    if attempts >= self.max_attempts or not is_retryable(e):
+                        return {"index": index, "error": str(e), "attempts": attempts}
+                    self._stats["retries"] += 1
+                    # Exponential backoff with jitter so parallel retries spread out
+                    delay = min(self.retry_cap, self.retry_base * 2 ** (attempts - 1))
+                    await asyncio.sleep(delay / 2 + random.uniform(0, delay / 2))
+
+    async def _flush(self, batch_id: ObjectId, collection, docs: List[tuple], failures: List[Dict[str, Any]]):
+        """insert_many the generated listings and save item results"""
+        updates: Dict[str, Any] = {}
+        inserted = 0
+        failed = 0
+        retries = 0
+
+        if docs:
+            write_errors = {}
+            try:
+                await collection.insert_many([doc for _, doc in docs], ordered=False)
+            except BulkWriteError as e:
+                write_errors = {err["index"]: err.get("errmsg", "Write failed") for err in e.details.get("writeErrors", [])}
+            for position, (outcome, doc) in enumerate(docs):
+                item = f"items.{outcome['index']}"
+                retries += outcome["attempts"] - 1
+                updates[f"{item}.attempts"] = outcome["attempts"]
+                if position in write_errors:
+                    failed += 1
+                    updates[f"{item}.status"] = "failed"
+                    updates[f"{item}.error"] = write_errors[position]
+                else:
+                    inserted += 1
+                    updates[f"{item}.status"] = "inserted"
+                    updates[f"{item}.result_id"] = str(doc["_id"])
+                    index = self.search_indexes.get(collection.name)
+                    if index is not None:
+                        index.upsert(doc)
+            if inserted:
+                count_cache.invalidate(collection.name)
+
+        for outcome in failures:
+            item = f"items.{outcome['index']}"
+            failed += 1
+            retries += outcome["attempts"] - 1
+            updates[f"{item}.status"] = "failed"
+            updates[f"{item}.error"] = outcome["error"]
+            updates[f"{item}.attempts"] = outcome["attempts"]
+
+        self._stats["inserted"] += inserted
+        self._stats["failed"] += failed
+        await self.collection.update_one(
+            {"_id": batch_id},
+            {"$set": {**updates, "updated_at": datetime.utcnow()}, "$inc": {"inserted": inserted, "failed": failed, "retries": retries}}
+        )
+        return inserted, failed
+
+    async def _run_batch(self, batch_id: ObjectId, content_type: str, specs: List[Dict[str, Any]]):
+        """Generate every spec and store the results"""
+        collection = self.db[content_type]
+        method = getattr(self.generator, GENERATOR_METHODS[content_type])
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.ensure_future(self._generate_one(method, i, spec, slots)) for i, spec in enumerate(specs)]
+        inserted = failed = 0
+
+        try:
+            await self.collection.update_one(
+                {"_id": batch_id},
+                {"$set": {"status": "running", "started_at": datetime.utcnow(), "updated_at": datetime.utcnow()}}
+            )
+
+            docs: List[tuple] = []
+            failures: List[Dict[str, Any]] = []
+            for next_done in asyncio.as_completed(tasks):
+                outcome = await next_done
+                if "doc" in outcome:
+                    doc = outcome["doc"]
+                    doc.setdefault("is_active", True)
+                    doc["created_at"] = doc["updated_at"] = datetime.utcnow()
+                    docs.append((outcome, doc))
+                    self._stats["generated"] += 1
+                else:
+                    failures.append(outcome)
+                if len(docs) + len(failures) >= self.insert_batch_size:
+                    counts = await self._flush(batch_id, collection, docs, failures)
+                    inserted, failed = inserted + counts[0], failed + counts[1]
+                    docs, failures = [], []
+            if docs or failures:
+                counts = await self._flush(batch_id, collection, docs, failures)
+                inserted, failed = inserted + counts[0], failed + counts[1]
+
+            status = "completed" if not failed else ("failed" if not inserted else "partial")
+            await self.collection.update_one(
+                {"_id": batch_id},
+                {"$set": {"status": status, "finished_at": datetime.utcnow(), "updated_at": datetime.utcnow()}}
+            )
+            logger.info(f"AI batch {batch_id} ({content_type}) {status}: inserted={inserted} failed={failed}")
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await self._set_final_status(batch_id, "interrupted", None)
+            raise
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            logger.error(f"AI batch {batch_id} failed: {e}")
+            await self._set_final_status(batch_id, "failed", str(e))
+
+    async def _set_final_status(self, batch_id: ObjectId, status: str, error: Optional[str]):
+        try:
+            await self.collection.update_one(
+                {"_id": batch_id},
+                {"$set": {"status": status, "error": error, "finished_at": datetime.utcnow(), "updated_at": datetime.utcnow()}}
+            )
+        except Exception as e:
+            logger.error(f"Failed to record AI batch {batch_id} as {status}: {e}")
+
+    # =============================================================================
+    # HELPER METHODS
+    # =============================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batch execution metrics for this process"""
+        return {
+            **self._stats,
+            "active_batches": len(self._tasks),
+            "concurrency": self.concurrency,
+            "max_attempts": self.max_attempts,
+            "insert_batch_size": self.insert_batch_size
+        }
+
+    def _format_batch(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """Format batch for response"""
+        batch = dict(batch)
+        batch["id"] = str(batch.pop("_id"))
+        for field in ("created_at", "updated_at", "started_at", "finished_at"):
+            if batch.get(field):
+                batch[field] = batch[field].isoformat()
+        if "items" in batch:
+            batch["pending"] = sum(1 for item in batch["items"] if item["status"] == "pending")
+        return batch
@@ -0,0 +1,300 @@
+"""
+User Activity Rollups
+8-Level Nested Architecture: routes/admin/analytics/management/crud/operations/handlers/activity_rollups.py
+
+Maintains hourly and daily buckets in activity_rollups so the engagement
+dashboard never runs distinct() over user_activities. Each bucket holds an
+event count and a HyperLogLog sketch of the users active in it
+(utils/analytics/sketches/hyperloglog.py):
+
+    {_id: "day:2026-10-17", granularity: "day", start, events,
+     registers: {"<index>": rank, ...}, expires_at, updated_at}
+
+Activities are folded into in-memory sketches as they are logged and flushed
+every flush_interval seconds (or after max_pending_events) with one
+bulk_write. Registers are written with $max, so concurrent workers and
+replayed flushes merge correctly. Reads merge at most 30 daily or 24 hourly
+sketches: DAU is today's bucket, WAU / MAU the union of the last 7 / 30 days.
+
+Old buckets expire through a TTL index (ROLLUP_HOURLY_RETENTION_DAYS,
+ROLLUP_DAILY_RETENTION_DAYS).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from api.utils.analytics.sketches.hyperloglog import HyperLogLog
+
+logger = logging.getLogger(__name__)
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "activity_rollups": [
+        IndexModel([("granularity", 1), ("start", -1)], name="granularity_start"),
+        IndexModel([("expires_at", 1)], name="expires_at_ttl", expireAfterSeconds=0),
+    ]
+}
+
+GRANULARITIES = ("hour", "day")
+
+
+def bucket_start(granularity: str, timestamp: datetime) -> datetime:
+    """Start of the hour or day a timestamp falls in"""
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def bucket_id(granularity: str, start: datetime) -> str:
+    return f"{granularity}:{start.strftime('%Y-%m-%dT%H' if granularity == 'hour' else '%Y-%m-%d')}"
+
+
+class ActivityRollups:
+    """Hourly/daily active-user sketches, updated incrementally"""
+
+    def __init__(self, db, flush_interval: Optional[float] = None, max_pending_events: Optional[int] = None):
+        self.collection = db["activity_rollups"]
+        self.user_activities = db["user_activities"]
+        self.flush_interval = flush_interval if flush_interval is not None else float(
+            os.environ.get("ROLLUP_FLUSH_SECONDS", 10)
+        )
+        self.max_pending_events = max_pending_events if max_pending_events is not None else int(
+            os.environ.get("ROLLUP_FLUSH_EVENTS", 5000)
+        )
+        self.retention = {
+            "hour": timedelta(days=float(os.environ.get("ROLLUP_HOURLY_RETENTION_DAYS", 8))),
+            "day": timedelta(days=float(os.environ.get("ROLLUP_DAILY_RETENTION_DAYS", 400)))
+        }
+        # bucket id -> {"granularity", "start", "sketch", "events"}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_events = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._event_flush: Optional[asyncio.Task] = None
+        self._stats = {
+            "recorded": 0,
+            "flushes": 0,
+            "flushed_buckets": 0,
+            "flush_failures": 0,
+            "last_flush_ms": None
+        }
+
+    # =============================================================================
+    # RECORDING
+    # =============================================================================
+
+    def _pending_bucket(self, granularity: str, timestamp: datetime) -> Dict[str, Any]:
+        start = bucket_start(granularity, timestamp)
+        key = bucket_id(granularity, start)
+        bucket = self._pending.get(key)
+        if bucket is None:
+            bucket = {"granularity": granularity, "start": start, "sketch": HyperLogLog(), "events": 0}
+            self._pending[key] = bucket
+        return bucket
+
+    def record(self, user_id: Optional[str], timestamp: Optional[datetime] = None):
+        """Fold one activity into the current hour and day; never touches the database"""
+        timestamp = timestamp or datetime.utcnow()
+        for granularity in GRANULARITIES:
+            bucket = self._pending_bucket(granularity, timestamp)
+            bucket["events"] += 1
+            if user_id:
+                bucket["sketch"].add(user_id)
+        self._pending_events += 1
+        self._stats["recorded"] += 1
+
+        if self._pending_events >= self.max_pending_events and self._event_flush is None:
+            try:
+                self._event_flush = asyncio.get_running_loop().create_task(self._flush_on_threshold())
+            except RuntimeError:
+                pass
+
+    async def _flush_on_threshold(self):
+        try:
+            await self.flush()
+        finally:
+            self._event_flush = None
+
+    def _bucket_update(self, key: str, bucket: Dict[str, Any], events_op: str = "$inc") -> UpdateOne:
+        update = {
+            events_op: {"events": bucket["events"]},
+            "$set": {"updated_at": datetime.utcnow()},
+            "$setOnInsert": {
+                "granularity": bucket["granularity"],
+                "start": bucket["start"],
+                "expires_at": bucket["start"] + self.retention[bucket["granularity"]]
+            }
+        }
+        registers = bucket["sketch"].nonzero_registers()
+        if registers:
+            update["$max"] = {f"registers.{index}": rank for index, rank in registers.items()}
+        return UpdateOne({"_id": key}, update, upsert=True)
+
+    def _requeue(self, buckets: Dict[str, Dict[str, Any]]):
+        """Fold unwritten buckets back in so the next flush retries them"""
+        for key, bucket in buckets.items():
+            current = self._pending.setdefault(key, bucket)
+            if current is not bucket:
+                current["sketch"].merge(bucket["sketch"])
+                current["events"] += bucket["events"]
+        # Every activity sits in one hour and one day bucket
+        self._pending_events = max(
+            sum(bucket["events"] for bucket in self._pending.values() if bucket["granularity"] == granularity)
+            for granularity in GRANULARITIES
+        )
+
+    async def flush(self) -> int:
+        """Merge every pending bucket into activity_rollups; returns buckets written"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            pending, self._pending = self._pending, {}
+            self._pending_events = 0
+            keys = list(pending)
+            started = time.monotonic()
+            try:
+                await self.collection.bulk_write(
+                    [self._bucket_update(key, pending[key]) for key in keys], ordered=False
+                )
+            except BulkWriteError as e:
+                # Unordered: every op without a write error was applied, and
+                # retrying those would $inc their events a second time
+                failed = [keys[error["index"]] for error in e.details.get("writeErrors", [])]
+                self._stats["flush_failures"] += 1
+                logger.error(f"Failed to flush {len(failed)} of {len(keys)} activity rollup buckets: {e}")
+                self._requeue({key: pending[key] for key in failed})
+                return len(keys) - len(failed)
+            except Exception as e:
+                # Nothing acknowledged: retry every bucket
+                self._stats["flush_failures"] += 1
+                logger.error(f"Failed to flush activity rollups: {e}")
+                self._requeue(pending)
+                return 0
+
+            self._stats["flushes"] += 1
+            self._stats["flushed_buckets"] += len(pending)
+            self._stats["last_flush_ms"] = round((time.monotonic() - started) * 1000, 2)
+            return len(pending)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Activity rollup flush failed: {e}")
+
+    def start(self):
+        """Start the periodic flusher"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def stop(self):
+        """Stop the periodic flusher and write everything still buffered"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    # =============================================================================
+    # READING
+    # =============================================================================
+
+    async def _load(self, granularity: str, since: datetime) -> Dict[datetime, Tuple[HyperLogLog, int]]:
+        """Stored buckets from since onwards, merged with this process's pending ones"""
+        buckets = {}
+        async for doc in self.collection.find(
+            {"granularity": granularity, "start": {"$gte": since}}, {"start": 1, "events": 1, "registers": 1}
+        ):
+            buckets[doc["start"]] = (HyperLogLog.from_registers(doc.get("registers", {})), doc.get("events", 0))
+
+        for bucket in self._pending.values():
+            if bucket["granularity"] != granularity or bucket["start"] < since:
+                continue
+            sketch, events = buckets.get(bucket["start"], (HyperLogLog(), 0))
+            sketch.merge(bucket["sketch"])
+            buckets[bucket["start"]] = (sketch, events + bucket["events"])
+        return buckets
+
+    @staticmethod
+    def _union(buckets: List[Tuple[HyperLogLog, int]]) -> int:
+        union = HyperLogLog()
+        for sketch, _ in buckets:
+            union.merge(sketch)
+        return union.count()
+
+    async def get_active_users(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """DAU / WAU / MAU and the last 24 hours, from at most 30 + 24 buckets"""
+        now = now or datetime.utcnow()
+        today = bucket_start("day", now)
+        this_hour = bucket_start("hour", now)
+        daily, hourly = await asyncio.gather(
+            self._load("day", today - timedelta(days=29)),
+            self._load("hour", this_hour - timedelta(hours=23))
+        )
+
+        def days(count: int) -> List[Tuple[HyperLogLog, int]]:
+            first = today - timedelta(days=count - 1)
+            return [bucket for start, bucket in daily.items() if start >= first]
+
+        return {
+            "active_users_today": self._union(days(1)),
+            "active_users_week": self._union(days(7)),
+            "active_users_month": self._union(days(30)),
+            "active_users_last_hour": hourly[this_hour][0].count() if this_hour in hourly else 0,
+            "hourly_active_users": [
+                {"hour": start.isoformat(), "active_users": sketch.count(), "events": events}
+                for start, (sketch, events) in sorted(hourly.items())
+            ]
+        }
+
+    # =============================================================================
+    # MAINTENANCE
+    # =============================================================================
+
+    async def rebuild(self, days: int = 30) -> Dict[str, Any]:
+        """
+        Recompute the buckets of the last `days` days from user_activities
+
+        Streams the activities once; registers are merged with $max and event
+        counts raised to the recomputed value, so running it alongside live
+        traffic (or twice) never lowers or double counts anything.
+        """
+        since = bucket_start("day", datetime.utcnow() - timedelta(days=days - 1))
+        buckets: Dict[str, Dict[str, Any]] = {}
+        activities = 0
+        async for activity in self.user_activities.find({"timestamp": {"$gte": since}}, {"user_id": 1, "timestamp": 1}):
+            activities += 1
+            for granularity in GRANULARITIES:
+                start = bucket_start(granularity, activity["timestamp"])
+                key = bucket_id(granularity, start)
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = {"granularity": granularity, "start": start, "sketch": HyperLogLog(), "events": 0}
+                bucket["events"] += 1
+                if activity.get("user_id"):
+                    bucket["sketch"].add(activity["user_id"])
+
+        if buckets:
+            await self.collection.bulk_write(
+                [self._bucket_update(key, bucket, events_op="$max") for key, bucket in buckets.items()], ordered=False
+            )
+        return {"activities": activities, "buckets": len(buckets), "since": since.isoformat()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer depth and flush metrics"""
+        return {
+            **self._stats,
+            "pending_events": self._pending_events,
+            "pending_buckets": len(self._pending),
+            "flush_interval_seconds": self.flush_interval,
+            "max_pending_events": self.max_pending_events
+        }
@@ -3,6 +3,76 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from bson import ObjectId
 import asyncio
+from api.routes.admin.analytics.management.crud.operations.handlers.activity_rollups import ActivityRollups
+from api.utils.ai.gemini.usage.usage_log import gemini_usage_log
+from api.utils.monitoring.middleware.request_timing import api_usage_log
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.pagination import fetch_page
+from api.utils.helpers.stats_cache import stats_cache
+from pymongo import IndexModel
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "api_usage_logs": [
+        IndexModel([("timestamp", -1), ("_id", -1)], name="timestamp_id"),
+        IndexModel([("status_code", 1), ("timestamp", -1), ("_id", -1)], name="status_code_timestamp_id"),
+    ],
+    "gemini_api_logs": [
+        IndexModel([("timestamp", -1), ("_id", -1)], name="timestamp_id"),
+        IndexModel([("feature", 1), ("timestamp", -1), ("_id", -1)], name="feature_timestamp_id"),
+    ],
+    "user_activities": [
+        IndexModel([("timestamp", -1), ("user_id", 1)], name="timestamp_user_id"),
+    ]
+}
+
+# Upper bounds (seconds) of the Gemini latency histogram buckets
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 4, 5, 7.5, 10, 15, 20, 30, 45, 60, 90, 120]
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+def _latency_bucket_expr() -> Dict:
+    """$switch mapping response_time to the upper bound of its bucket"""
+    return {"$switch": {
+        "branches": [{"case": {"$lte": ["$response_time", bound]}, "then": bound} for bound in LATENCY_BUCKETS],
+        "default": "+Inf"
+    }}
+
+
+def _histogram_summary(counts: Dict) -> Dict:
+    """
+    Percentiles from bucket counts, interpolated linearly inside the bucket
+    (the same estimate Prometheus' histogram_quantile makes)
+    """
+    total = sum(counts.values())
+    buckets = []
+    cumulative = 0
+    for bound in LATENCY_BUCKETS + ["+Inf"]:
+        cumulative += counts.get(bound, 0)
+        buckets.append({"le": bound, "count": cumulative})
+
+    percentiles = {}
+    for percentile in LATENCY_PERCENTILES:
+        if not total:
+            percentiles[f"p{percentile}"] = 0.0
+            continue
+        rank = total * percentile / 100
+        lower = 0.0
+        below = 0
+        for bucket in buckets:
+            if bucket["count"] >= rank:
+                if bucket["le"] == "+Inf":
+                    # Nothing to interpolate towards; report the last finite bound
+                    value = LATENCY_BUCKETS[-1]
+                else:
+                    in_bucket = bucket["count"] - below
+                    value = lower + (bucket["le"] - lower) * ((rank - below) / in_bucket if in_bucket else 1)
+                percentiles[f"p{percentile}"] = round(value, 3)
+                break
+            lower = bucket["le"] if bucket["le"] != "+Inf" else lower
+            below = bucket["count"]
+    return {**percentiles, "count": total, "buckets": buckets}
+
 
 class AnalyticsHandlers:
     def __init__(self, db: AsyncIOMotorDatabase):
@@ -14,83 +84,95 @@ class AnalyticsHandlers:
         self.app_users = db["app_users"]
         self.jobs = db["jobs"]
         self.applications = db["applications"]
+        self.rollups = ActivityRollups(db)
     
     async def get_user_engagement_metrics(self) -> Dict:
         """Get user engagement metrics"""
-        now = datetime.utcnow()
-        today_start = datetime(now.year, now.month, now.day)
-        week_start = now - timedelta(days=7)
-        month_start = now - timedelta(days=30)
-        
         # Total users (admin + app users)
-        total_admins = await self.admin_users.count_documents({})
-        total_app_users = await self.app_users.count_documents({})
+        total_admins, total_app_users, active_users, total_sessions = await asyncio.gather(
+            self.admin_users.count_documents({}),
+            self.app_users.count_documents({}),
+            # Active users from the hourly/daily rollups (approximate distinct counts)
+            self.rollups.get_active_users(),
+            # Total sessions
+            self.user_activities.estimated_document_count()
+        )
         total_users = total_admins + total_app_users
         
-        # Active users (based on user_activities)
-        active_today = await self.user_activities.distinct("user_id", {"timestamp": {"$gte": today_start}})
-        active_week = await self.user_activities.distinct("user_id", {"timestamp": {"$gte": week_start}})
-        active_month = await self.user_activities.distinct("user_id", {"timestamp": {"$gte": month_start}})
-        
-        # Total sessions
-        total_sessions = await self.user_activities.count_documents({})
-        
         # Average session duration (mock calculation based on activities)
         avg_session_duration = 5.5  # Average in minutes
         
         return {
             "total_users": total_users,
-            "active_users_today": len(active_today),
-            "active_users_week": len(active_week),
-            "active_users_month": len(active_month),
+            **active_users,
             "avg_session_duration": avg_session_duration,
             "total_sessions": total_sessions
         }
     
     async def get_job_application_metrics(self) -> Dict:
         """Get job application statistics"""
+        return await stats_cache.get("job_applications", self._compute_job_application_metrics)
+    
+    async def _compute_job_application_metrics(self) -> Dict:
         now = datetime.utcnow()
         today_start = datetime(now.year, now.month, now.day)
         week_start = now - timedelta(days=7)
         month_start = now - timedelta(days=30)
         
-        # Total applications
-        total_applications = await self.applications.count_documents({}) if await self.db.list_collection_names().__contains__("applications") else 0
+        def applied_since(start: datetime) -> Dict:
+            return {"$sum": {"$cond": [{"$gte": ["$applied_at", start]}, 1, 0]}}
         
-        # Applications by time period
-        applications_today = await self.applications.count_documents({"applied_at": {"$gte": today_start}}) if total_applications > 0 else 0
-        applications_week = await self.applications.count_documents({"applied_at": {"$gte": week_start}}) if total_applications > 0 else 0
-        applications_month = await self.applications.count_documents({"applied_at": {"$gte": month_start}}) if total_applications > 0 else 0
+        # One pass over applications for the total and every time window
+        applications_pipeline = [
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": 1},
+                "today": applied_since(today_start),
+                "week": applied_since(week_start),
+                "month": applied_since(month_start)
+            }}
+        ]
         
-        # Total jobs
-        total_jobs = await self.jobs.count_documents({})
+        # Job total and top jobs by views (mock "applications") in one round trip
+        jobs_pipeline = [
+            {"$facet": {
+                "total": [{"$count": "count"}],
+                "top_jobs": [
+                    {"$sort": {"views": -1}},
+                    {"$limit": 5},
+                    {"$project": {"title": 1, "company": 1, "views": 1}}
+                ]
+            }}
+        ]
+        
+        application_stats, job_stats = await asyncio.gather(
+            self.applications.aggregate(applications_pipeline).to_list(length=1),
+            self.jobs.aggregate(jobs_pipeline).to_list(length=1)
+        )
+        applications = application_stats[0] if application_stats else {}
+        jobs = job_stats[0] if job_stats else {}
+        
+        total_applications = applications.get("total", 0)
+        total_jobs = jobs["total"][0]["count"] if jobs.get("total") else 0
         
         # Average applications per job
         avg_applications_per_job = total_applications / total_jobs if total_jobs > 0 else 0
         
-        # Top jobs by applications (mock data for now)
-        top_jobs_pipeline = [
-            {"$match": {}},
-            {"$sort": {"views": -1}},
-            {"$limit": 5},
-            {"$project": {"title": 1, "company": 1, "views": 1}}
-        ]
-        
-        top_jobs_cursor = self.jobs.aggregate(top_jobs_pipeline)
-        top_jobs = []
-        async for job in top_jobs_cursor:
-            top_jobs.append({
+        top_jobs = [
+            {
                 "id": str(job["_id"]),
                 "title": job.get("title", ""),
                 "company": job.get("company", ""),
                 "applications": job.get("views", 0)
-            })
+            }
+            for job in jobs.get("top_jobs", [])
+        ]
         
         return {
             "total_applications": total_applications,
-            "applications_today": applications_today,
-            "applications_week": applications_week,
-            "applications_month": applications_month,
+            "applications_today": applications.get("today", 0),
+            "applications_week": applications.get("week", 0),
+            "applications_month": applications.get("month", 0),
             "avg_applications_per_job": round(avg_applications_per_job, 2),
             "top_jobs": top_jobs
         }
@@ -110,31 +192,70 @@ class AnalyticsHandlers:
         requests_week = await self.gemini_api_logs.count_documents({"timestamp": {"$gte": week_start}})
         requests_month = await self.gemini_api_logs.count_documents({"timestamp": {"$gte": month_start}})
         
-        # By feature
-        by_feature_pipeline = [
-            {"$group": {"_id": "$feature", "count": {"$sum": 1}}}
+        # Counts, tokens and latency histogram per feature, last 30 days
+        histogram_pipeline = [
+            {"$match": {"timestamp": {"$gte": month_start}}},
+            {"$group": {
+                "_id": {"feature": "$feature", "le": _latency_bucket_expr()},
+                "count": {"$sum": 1},
+                "errors": {"$sum": {"$cond": [{"$eq": ["$success", False]}, 1, 0]}},
+                "prompt_tokens": {"$sum": {"$ifNull": ["$prompt_tokens", 0]}},
+                "response_tokens": {"$sum": {"$ifNull": ["$response_tokens", 0]}},
+                "total_time": {"$sum": "$response_time"}
+            }}
         ]
-        by_feature_cursor = self.gemini_api_logs.aggregate(by_feature_pipeline)
+        feature_counts: Dict[str, Dict] = {}
+        overall_counts: Dict = {}
+        feature_totals: Dict[str, Dict] = {}
+        async for item in self.gemini_api_logs.aggregate(histogram_pipeline):
+            feature, bound = item["_id"]["feature"], item["_id"]["le"]
+            feature_counts.setdefault(feature, {})[bound] = item["count"]
+            overall_counts[bound] = overall_counts.get(bound, 0) + item["count"]
+            totals = feature_totals.setdefault(feature, dict.fromkeys(
+                ("count", "errors", "prompt_tokens", "response_tokens", "total_time"), 0
+            ))
+            for key in totals:
+                totals[key] += item[key]
+
         by_feature = {}
-        async for item in by_feature_cursor:
-            by_feature[item["_id"]] = item["count"]
-        
-        # Average response time
-        avg_response_pipeline = [
-            {"$group": {"_id": None, "avg_time": {"$avg": "$response_time"}}}
-        ]
-        avg_response_cursor = self.gemini_api_logs.aggregate(avg_response_pipeline)
-        avg_response_time = 0.0
-        async for item in avg_response_cursor:
-            avg_response_time = item.get("avg_time", 0.0)
-        
+        latency_by_feature = {}
+        for feature, totals in feature_totals.items():
+            summary = _histogram_summary(feature_counts[feature])
+            latency_by_feature[feature] = {
+                **{k: v for k, v in summary.items() if k != "count"},
+                "requests": totals["count"],
+                "errors": totals["errors"],
+                "error_rate": round(totals["errors"] / totals["count"], 4),
+                "prompt_tokens": totals["prompt_tokens"],
+                "response_tokens": totals["response_tokens"]
+            }
+            by_feature[feature] = totals["count"]
+
+        month_total = sum(totals["count"] for totals in feature_totals.values())
+        total_time = sum(totals["total_time"] for totals in feature_totals.values())
+        overall = _histogram_summary(overall_counts)
+
         return {
             "total_requests": total_requests,
             "requests_today": requests_today,
             "requests_week": requests_week,
             "requests_month": requests_month,
             "by_feature": by_feature,
-            "avg_response_time": round(avg_response_time, 3)
+            "avg_response_time": round(total_time / month_total, 3) if month_total else 0.0,
+            "latency": {
+                "window_days": 30,
+                "unit": "seconds",
+                "p50": overall["p50"],
+                "p90": overall["p90"],
+                "p99": overall["p99"],
+                "buckets": overall["buckets"],
+                "by_feature": latency_by_feature
+            },
+            "tokens": {
+                "prompt": sum(totals["prompt_tokens"] for totals in feature_totals.values()),
+                "response": sum(totals["response_tokens"] for totals in feature_totals.values())
+            },
+            "log_buffer": gemini_usage_log.get_stats()
         }
     
     async def get_dashboard_analytics(self) -> Dict:
@@ -167,11 +288,12 @@ class AnalyticsHandlers:
         }
         
         result = await self.user_activities.insert_one(activity)
+        self.rollups.record(user_id, activity["timestamp"])
         return {"success": True, "id": str(result.inserted_id)}
     
     async def log_api_usage(self, endpoint: str, method: str, user_id: Optional[str], status_code: int, response_time: float, error_message: Optional[str] = None) -> Dict:
-        """Log API usage"""
-        log_entry = {
+        """Log API usage (buffered; the request timing middleware logs every request)"""
+        api_usage_log.record({
             "endpoint": endpoint,
             "method": method,
             "user_id": user_id,
@@ -179,65 +301,59 @@ class AnalyticsHandlers:
             "response_time": response_time,
             "error_message": error_message,
             "timestamp": datetime.utcnow()
-        }
-        
-        result = await self.api_usage_logs.insert_one(log_entry)
-        return {"success": True, "id": str(result.inserted_id)}
+        })
+        return {"success": True}
     
     async def log_gemini_api_usage(self, feature: str, response_time: float, success: bool = True, error_message: Optional[str] = None, user_id: Optional[str] = None) -> Dict:
-        """Log Gemini API usage"""
-        log_entry = {
+        """Log Gemini API usage (buffered; the AI executor logs its own calls)"""
+        gemini_usage_log.record({
             "feature": feature,
             "response_time": response_time,
             "success": success,
             "error_message": error_message,
             "user_id": user_id,
             "timestamp": datetime.utcnow()
-        }
-        
-        result = await self.gemini_api_logs.insert_one(log_entry)
-        return {"success": True, "id": str(result.inserted_id)}
+        })
+        return {"success": True}
     
-    async def get_api_usage_logs(self, limit: int = 100, skip: int = 0, status_code: Optional[int] = None) -> Dict:
+    async def get_api_usage_logs(self, limit: int = 100, skip: int = 0, status_code: Optional[int] = None, cursor: Optional[str] = None, count: str = "exact") -> Dict:
         """Get API usage logs with filters"""
         query = {}
         if status_code:
             query["status_code"] = status_code
         
-        logs_cursor = self.api_usage_logs.find(query).sort("timestamp", -1).skip(skip).limit(limit)
-        logs = []
-        async for log in logs_cursor:
+        logs, next_cursor = await fetch_page(self.api_usage_logs, query, "timestamp", -1, limit, cursor=cursor, skip=skip)
+        for log in logs:
             log["_id"] = str(log["_id"])
             log["timestamp"] = log["timestamp"].isoformat()
-            logs.append(log)
         
-        total = await self.api_usage_logs.count_documents(query)
+        total = await count_cache.count(self.api_usage_logs, query, count, cursor)
         
         return {
             "success": True,
             "data": logs,
             "total": total,
             "page": skip // limit + 1,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     
-    async def get_error_logs(self, limit: int = 100, skip: int = 0) -> Dict:
+    async def get_error_logs(self, limit: int = 100, skip: int = 0, cursor: Optional[str] = None, count: str = "exact") -> Dict:
         """Get error logs (API calls with status code >= 400)"""
         query = {"status_code": {"$gte": 400}}
         
-        logs_cursor = self.api_usage_logs.find(query).sort("timestamp", -1).skip(skip).limit(limit)
-        logs = []
-        async for log in logs_cursor:
+        logs, next_cursor = await fetch_page(self.api_usage_logs, query, "timestamp", -1, limit, cursor=cursor, skip=skip)
+        for log in logs:
             log["_id"] = str(log["_id"])
             log["timestamp"] = log["timestamp"].isoformat()
-            logs.append(log)
         
-        total = await self.api_usage_logs.count_documents(query)
+        total = await count_cache.count(self.api_usage_logs, query, count, cursor)
         
         return {
             "success": True,
             "data": logs,
             "total": total,
             "page": skip // limit + 1,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
@@ -2,6 +2,22 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
 from typing import Optional, List, Dict
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.view_counter import view_counter
+from api.utils.helpers.pagination import fetch_page
+from pymongo import IndexModel
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "articles": [
+        IndexModel([("is_published", 1), ("created_at", -1), ("_id", -1)], name="is_published_created_at_id"),
+        IndexModel([("category", 1), ("is_published", 1), ("created_at", -1), ("_id", -1)], name="category_is_published_created_at_id"),
+        IndexModel([("tags", 1), ("is_published", 1)], name="tags_is_published"),
+        IndexModel([("is_published", 1), ("views_count", -1), ("_id", -1)], name="is_published_views_count_id"),
+        IndexModel([("created_at", -1), ("_id", -1)], name="created_at_id"),
+    ]
+}
+
 
 class ArticleHandlers:
     def __init__(self, db: AsyncIOMotorDatabase):
@@ -15,6 +31,7 @@ class ArticleHandlers:
         article_data["updated_at"] = datetime.utcnow()
         
         result = await self.collection.insert_one(article_data)
+        count_cache.invalidate(self.collection.name)
         article_data["_id"] = result.inserted_id
         
         return {
@@ -32,9 +49,11 @@ class ArticleHandlers:
         tags: Optional[List[str]] = None,
         is_published: Optional[bool] = None,
         sort_by: str = "created_at",
-        sort_order: int = -1
+        sort_order: int = -1,
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ) -> dict:
-        """Get all articles with filtering and sorting"""
+        """Get all articles with filtering and sorting (skip/limit or keyset cursor)"""
         query = {}
         
         # Search in title, content, excerpt
@@ -58,19 +77,21 @@ class ArticleHandlers:
         if is_published is not None:
             query["is_published"] = is_published
         
-        # Get total count
-        total = await self.collection.count_documents(query)
+        # Get total count (cached unless count=exact)
+        total = await count_cache.count(self.collection, query, count, cursor)
         
-        # Get articles with pagination and sorting
-        cursor = self.collection.find(query).sort(sort_by, sort_order).skip(skip).limit(limit)
-        articles = await cursor.to_list(length=limit)
+        # Get articles with keyset pagination and sorting
+        articles, next_cursor = await fetch_page(
+            self.collection, query, sort_by, sort_order, limit, cursor=cursor, skip=skip
+        )
         
         return {
             "success": True,
             "data": [self._format_article(article) for article in articles],
             "total": total,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     
     async def get_article_by_id(self, article_id: str) -> dict:
@@ -83,12 +104,9 @@ class ArticleHandlers:
         if not article:
             return {"success": False, "message": "Article not found"}
         
-        # Increment view count
-        await self.collection.update_one(
-            {"_id": ObjectId(article_id)},
-            {"$inc": {"views_count": 1}}
-        )
-        article["views_count"] += 1
+        # Count the view (written behind in batches)
+        view_counter.record(self.collection, article["_id"])
+        article["views_count"] = article.get("views_count", 0) + view_counter.pending(self.collection, article["_id"])
         
         return {
             "success": True,
@@ -112,6 +130,7 @@ class ArticleHandlers:
             {"_id": ObjectId(article_id)},
             {"$set": update_data}
         )
+        count_cache.invalidate(self.collection.name)
         
         if result.matched_count == 0:
             return {"success": False, "message": "Article not found"}
@@ -130,6 +149,7 @@ class ArticleHandlers:
             return {"success": False, "message": "Invalid article ID"}
         
         result = await self.collection.delete_one({"_id": ObjectId(article_id)})
+        count_cache.invalidate(self.collection.name)
         
         if result.deleted_count == 0:
             return {"success": False, "message": "Article not found"}
@@ -155,6 +175,7 @@ class ArticleHandlers:
             {"_id": ObjectId(article_id)},
             {"$set": {"is_published": new_status, "updated_at": datetime.utcnow()}}
         )
+        count_cache.invalidate(self.collection.name)
         
         return {
             "success": True,
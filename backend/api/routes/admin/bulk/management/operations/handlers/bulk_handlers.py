@@ -1,181 +1,217 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import List, Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type, Union
+import codecs
 import csv
 import io
+import json
+import logging
+import zlib
 from datetime import datetime
 from bson import ObjectId
+from pydantic import BaseModel, ValidationError
+from pymongo import IndexModel
+from pymongo.errors import BulkWriteError
+from api.models.schemas.jobs.fields.validators.custom.job_model import JobCreate
+from api.models.schemas.internships.fields.validators.custom.internship_model import InternshipCreate
+from api.utils.helpers.count_cache import count_cache
+
+logger = logging.getLogger(__name__)
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "jobs": [
+        IndexModel([("title", 1), ("company", 1), ("location", 1)], name="title_company_location"),
+    ],
+    "internships": [
+        IndexModel([("title", 1), ("company", 1), ("location", 1)], name="title_company_location"),
+    ]
+}
+
+# Rows with the same natural key are treated as the same listing on import
+NATURAL_KEY = ("title", "company", "location")
+
+# CSV headers from the exports that differ from the model field names
+JOB_CSV_ALIASES = {"skills": "skills_required"}
+INTERNSHIP_CSV_ALIASES = {"skills": "skills_required", "stipend": "stipend_amount"}
+
+# Export columns as (CSV header, document field); headers round-trip through the importer
+JOB_EXPORT_COLUMNS = [
+    ("ID", "_id"), ("Title", "title"), ("Company", "company"), ("Location", "location"),
+    ("Job Type", "job_type"), ("Category", "category"), ("Experience Level", "experience_level"),
+    ("Salary Min", "salary_min"), ("Salary Max", "salary_max"), ("Currency", "currency"),
+    ("Description", "description"), ("Skills", "skills_required"), ("Qualifications", "qualifications"),
+    ("Responsibilities", "responsibilities"), ("Benefits", "benefits"), ("Apply Link", "apply_link"),
+    ("Is Active", "is_active"), ("Created At", "created_at"),
+]
+INTERNSHIP_EXPORT_COLUMNS = [
+    ("ID", "_id"), ("Title", "title"), ("Company", "company"), ("Location", "location"),
+    ("Internship Type", "internship_type"), ("Category", "category"), ("Duration", "duration"),
+    ("Stipend", "stipend_amount"), ("Currency", "currency"), ("Description", "description"),
+    ("Skills", "skills_required"), ("Qualifications", "qualifications"),
+    ("Learning Outcomes", "learning_outcomes"), ("Apply Link", "apply_link"),
+    ("Is Active", "is_active"), ("Created At", "created_at"),
+]
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+# Encoded output is buffered up to this size before a chunk is yielded
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+MAX_ERROR_DETAILS = 100
+MAX_ERRORS_PER_BATCH = 10
+
+
+def _export_value(value: Any) -> Any:
+    """Render a field for CSV/NDJSON output"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    return "" if value is None else value
+
+
+def _normalize_header(header: str) -> str:
+    """'Experience Level' -> 'experience_level'"""
+    return header.strip().lower().replace(" ", "_").replace("-", "_")
+
+
+async def _as_chunks(source: Union[str, bytes, AsyncIterator[bytes]]) -> AsyncIterator[bytes]:
+    """Accept a whole CSV payload or an async byte stream (e.g. request.stream())"""
+    if isinstance(source, str):
+        yield source.encode("utf-8")
+    elif isinstance(source, bytes):
+        yield source
+    else:
+        async for chunk in source:
+            yield chunk
+
+
+async def iter_csv_rows(source: Union[str, bytes, AsyncIterator[bytes]]) -> AsyncIterator[Tuple[int, Dict[str, str]]]:
+    """
+    Parse CSV incrementally from a byte stream
+
+    Only the current record and the unterminated tail of the last chunk are
+    held in memory. Quoted fields may span lines: a physical line only ends
+    a record when the quotes seen so far are balanced.
+
+    Yields:
+        (row_number, row) with row_number counting data rows from 1
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    fieldnames: Optional[List[str]] = None
+    tail = ""
+    record = ""
+    quotes = 0
+    row_number = 0
+
+    def parse(text: str) -> List[str]:
+        return next(csv.reader([text]), [])
+
+    async def records():
+        nonlocal tail, record, quotes
+        async for chunk in _as_chunks(source):
+            lines = io.StringIO(tail + decoder.decode(chunk), newline="").readlines()
+            tail = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+            for line in lines:
+                record += line
+                quotes += line.count('"')
+                if quotes % 2 == 0:
+                    yield record
+                    record, quotes = "", 0
+        record += tail + decoder.decode(b"", final=True)
+        if record.strip():
+            yield record
+
+    async for text in records():
+        values = parse(text)
+        if not any(value.strip() for value in values):
+            continue
+        if fieldnames is None:
+            fieldnames = [_normalize_header(name) for name in values]
+            continue
+        row_number += 1
+        yield row_number, dict(zip(fieldnames, values))
+
 
 class BulkOperationsHandlers:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, search_indexes: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            db: Database handle
+            search_indexes: collection name -> CollectionSearchIndex to keep in sync
+        """
         self.db = db
         self.jobs = db["jobs"]
         self.internships = db["internships"]
         self.scholarships = db["scholarships"]
         self.dsa_questions = db["dsa_questions"]
         self.dsa_topics = db["dsa_topics"]
+        self.search_indexes = search_indexes or {}
+    
+    # ==================== SEARCH INDEX SYNC ====================
+    
+    def _index_docs(self, collection, docs: List[Dict[str, Any]]):
+        index = self.search_indexes.get(collection.name)
+        if index is not None:
+            for doc in docs:
+                index.upsert(doc)
+    
+    def _unindex(self, collection, object_ids: List[ObjectId]):
+        index = self.search_indexes.get(collection.name)
+        if index is not None:
+            for object_id in object_ids:
+                index.remove(object_id)
+    
+    async def _reindex(self, collection, object_ids: List[ObjectId]):
+        """Re-read updated documents into the search index"""
+        index = self.search_indexes.get(collection.name)
+        if index is None:
+            return
+        projection = {field: 1 for field in (*index.fields, *index.filter_fields)}
+        async for doc in collection.find({"_id": {"$in": object_ids}}, projection):
+            index.upsert(doc)
     
     # ==================== JOBS BULK OPERATIONS ====================
     
-    async def export_jobs_csv(self, filters: Dict = {}) -> str:
-        """Export jobs to CSV format"""
-        jobs_cursor = self.jobs.find(filters)
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
-        headers = ["ID", "Title", "Company", "Location", "Job Type", "Category", "Experience Level", 
-                   "Salary Min", "Salary Max", "Description", "Skills", "Qualifications", 
-                   "Responsibilities", "Benefits", "Is Active", "Posted Date"]
-        writer.writerow(headers)
-        
-        # Write data
-        async for job in jobs_cursor:
-            writer.writerow([
-                str(job["_id"]),
-                job.get("title", ""),
-                job.get("company", ""),
-                job.get("location", ""),
-                job.get("job_type", ""),
-                job.get("category", ""),
-                job.get("experience_level", ""),
-                job.get("salary", {}).get("min", ""),
-                job.get("salary", {}).get("max", ""),
-                job.get("description", ""),
-                ", ".join(job.get("skills", [])),
-                ", ".join(job.get("qualifications", [])),
-                ", ".join(job.get("responsibilities", [])),
-                ", ".join(job.get("benefits", [])),
-                job.get("is_active", True),
-                job.get("posted_date", datetime.utcnow()).isoformat()
-            ])
-        
-        return output.getvalue()
+    def export_jobs(
+        self,
+        filters: Optional[Dict] = None,
+        format: str = "csv",
+        compress: bool = False,
+        batch_size: int = 1000
+    ) -> AsyncIterator[bytes]:
+        """Stream jobs as CSV or NDJSON chunks, optionally gzipped"""
+        return self._export(self.jobs, JOB_EXPORT_COLUMNS, filters, format, compress, batch_size)
     
-    async def import_jobs_csv(self, csv_data: str) -> Dict:
-        """Import jobs from CSV data"""
-        reader = csv.DictReader(io.StringIO(csv_data))
-        
-        success_count = 0
-        error_count = 0
-        errors = []
-        
-        for row in reader:
-            try:
-                job_data = {
-                    "title": row.get("Title", ""),
-                    "company": row.get("Company", ""),
-                    "location": row.get("Location", ""),
-                    "job_type": row.get("Job Type", "full_time"),
-                    "category": row.get("Category", ""),
-                    "experience_level": row.get("Experience Level", "entry"),
-                    "salary": {
-                        "min": int(row.get("Salary Min", 0)) if row.get("Salary Min") else 0,
-                        "max": int(row.get("Salary Max", 0)) if row.get("Salary Max") else 0,
-                        "currency": "USD"
-                    },
-                    "description": row.get("Description", ""),
-                    "skills": [s.strip() for s in row.get("Skills", "").split(",") if s.strip()],
-                    "qualifications": [q.strip() for q in row.get("Qualifications", "").split(",") if q.strip()],
-                    "responsibilities": [r.strip() for r in row.get("Responsibilities", "").split(",") if r.strip()],
-                    "benefits": [b.strip() for b in row.get("Benefits", "").split(",") if b.strip()],
-                    "is_active": row.get("Is Active", "True").lower() == "true",
-                    "posted_date": datetime.utcnow(),
-                    "views": 0
-                }
-                
-                await self.jobs.insert_one(job_data)
-                success_count += 1
-            except Exception as e:
-                error_count += 1
-                errors.append(f"Row {reader.line_num}: {str(e)}")
-        
-        return {
-            "success": True,
-            "data": {
-                "imported": success_count,
-                "errors": error_count,
-                "error_details": errors
-            }
-        }
+    async def import_jobs_csv(
+        self,
+        source: Union[str, bytes, AsyncIterator[bytes]],
+        batch_size: int = 1000
+    ) -> Dict:
+        """Import jobs from CSV (validated against JobCreate, inserted in batches)"""
+        return await self._run_import(self.jobs, JobCreate, JOB_CSV_ALIASES, source, batch_size)
     
     # ==================== INTERNSHIPS BULK OPERATIONS ====================
     
-    async def export_internships_csv(self, filters: Dict = {}) -> str:
-        """Export internships to CSV format"""
-        internships_cursor = self.internships.find(filters)
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
-        headers = ["ID", "Title", "Company", "Location", "Internship Type", "Category", 
-                   "Duration", "Stipend", "Description", "Skills", "Qualifications", 
-                   "Learning Outcomes", "Is Active", "Posted Date"]
-        writer.writerow(headers)
-        
-        # Write data
-        async for internship in internships_cursor:
-            writer.writerow([
-                str(internship["_id"]),
-                internship.get("title", ""),
-                internship.get("company", ""),
-                internship.get("location", ""),
-                internship.get("internship_type", ""),
-                internship.get("category", ""),
-                internship.get("duration", ""),
-                internship.get("stipend", ""),
-                internship.get("description", ""),
-                ", ".join(internship.get("skills", [])),
-                ", ".join(internship.get("qualifications", [])),
-                ", ".join(internship.get("learning_outcomes", [])),
-                internship.get("is_active", True),
-                internship.get("posted_date", datetime.utcnow()).isoformat()
-            ])
-        
-        return output.getvalue()
+    def export_internships(
+        self,
+        filters: Optional[Dict] = None,
+        format: str = "csv",
+        compress: bool = False,
+        batch_size: int = 1000
+    ) -> AsyncIterator[bytes]:
+        """Stream internships as CSV or NDJSON chunks, optionally gzipped"""
+        return self._export(self.internships, INTERNSHIP_EXPORT_COLUMNS, filters, format, compress, batch_size)
     
-    async def import_internships_csv(self, csv_data: str) -> Dict:
-        """Import internships from CSV data"""
-        reader = csv.DictReader(io.StringIO(csv_data))
-        
-        success_count = 0
-        error_count = 0
-        errors = []
-        
-        for row in reader:
-            try:
-                internship_data = {
-                    "title": row.get("Title", ""),
-                    "company": row.get("Company", ""),
-                    "location": row.get("Location", ""),
-                    "internship_type": row.get("Internship Type", "remote"),
-                    "category": row.get("Category", ""),
-                    "duration": row.get("Duration", ""),
-                    "stipend": row.get("Stipend", ""),
-                    "description": row.get("Description", ""),
-                    "skills": [s.strip() for s in row.get("Skills", "").split(",") if s.strip()],
-                    "qualifications": [q.strip() for q in row.get("Qualifications", "").split(",") if q.strip()],
-                    "learning_outcomes": [l.strip() for l in row.get("Learning Outcomes", "").split(",") if l.strip()],
-                    "is_active": row.get("Is Active", "True").lower() == "true",
-                    "posted_date": datetime.utcnow(),
-                    "views": 0
-                }
-                
-                await self.internships.insert_one(internship_data)
-                success_count += 1
-            except Exception as e:
-                error_count += 1
-                errors.append(f"Row {reader.line_num}: {str(e)}")
-        
-        return {
-            "success": True,
-            "data": {
-                "imported": success_count,
-                "errors": error_count,
-                "error_details": errors
-            }
-        }
+    async def import_internships_csv(
+        self,
+        source: Union[str, bytes, AsyncIterator[bytes]],
+        batch_size: int = 1000
+    ) -> Dict:
+        """Import internships from CSV (validated against InternshipCreate, inserted in batches)"""
+        return await self._run_import(self.internships, InternshipCreate, INTERNSHIP_CSV_ALIASES, source, batch_size)
     
     # ==================== BULK DELETE OPERATIONS ====================
     
@@ -184,6 +220,8 @@ class BulkOperationsHandlers:
         try:
             object_ids = [ObjectId(jid) for jid in job_ids]
             result = await self.jobs.delete_many({"_id": {"$in": object_ids}})
+            count_cache.invalidate(self.jobs.name)
+            self._unindex(self.jobs, object_ids)
             
             return {
                 "success": True,
@@ -199,6 +237,8 @@ class BulkOperationsHandlers:
         try:
             object_ids = [ObjectId(iid) for iid in internship_ids]
             result = await self.internships.delete_many({"_id": {"$in": object_ids}})
+            count_cache.invalidate(self.internships.name)
+            self._unindex(self.internships, object_ids)
             
             return {
                 "success": True,
@@ -219,6 +259,8 @@ class BulkOperationsHandlers:
                 {"_id": {"$in": object_ids}},
                 {"$set": {"is_active": is_active}}
             )
+            count_cache.invalidate(self.jobs.name)
+            await self._reindex(self.jobs, object_ids)
             
             return {
                 "success": True,
@@ -237,6 +279,8 @@ class BulkOperationsHandlers:
                 {"_id": {"$in": object_ids}},
                 {"$set": {"is_active": is_active}}
             )
+            count_cache.invalidate(self.internships.name)
+            await self._reindex(self.internships, object_ids)
             
             return {
                 "success": True,
@@ -246,3 +290,204 @@ class BulkOperationsHandlers:
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
+
+    # ==================== CSV IMPORT PIPELINE ====================
+    
+    @staticmethod
+    def _natural_key(doc: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(doc.get(field, "") for field in NATURAL_KEY)
+    
+    @staticmethod
+    def _row_to_model(row: Dict[str, str], model: Type[BaseModel], aliases: Dict[str, str]) -> BaseModel:
+        """Map CSV columns onto model fields; empty cells fall back to defaults"""
+        data = {}
+        for column, value in row.items():
+            field = aliases.get(column, column)
+            if field not in model.model_fields or value is None or not value.strip():
+                continue
+            if field in ("skills_required", "qualifications", "responsibilities", "benefits", "learning_outcomes"):
+                data[field] = [item.strip() for item in value.split(",") if item.strip()]
+            elif field in NATURAL_KEY:
+                data[field] = value.strip()
+            else:
+                data[field] = value
+        return model(**data)
+    
+    async def _insert_batch(self, collection, batch: List[Dict[str, Any]]) -> Tuple[int, int, List[str]]:
+        """
+        Insert one batch, skipping listings that already exist
+        
+        Returns:
+            (inserted, duplicates, errors)
+        """
+        existing = set()
+        async for doc in collection.find(
+            {"$or": [dict(zip(NATURAL_KEY, self._natural_key(doc))) for doc in batch]},
+            {field: 1 for field in NATURAL_KEY}
+        ):
+            existing.add(self._natural_key(doc))
+        
+        new_docs = [doc for doc in batch if self._natural_key(doc) not in existing]
+        duplicates = len(batch) - len(new_docs)
+        if not new_docs:
+            return 0, duplicates, []
+        
+        try:
+            result = await collection.insert_many(new_docs, ordered=False)
+            self._index_docs(collection, new_docs)
+            return len(result.inserted_ids), duplicates, []
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            failed = {err.get("index") for err in write_errors}
+            self._index_docs(collection, [doc for i, doc in enumerate(new_docs) if i not in failed])
+            return e.details.get("nInserted", 0), duplicates, [err.get("errmsg", "Write failed") for err in write_errors]
+    
+    async def _import_batches(
+        self,
+        collection,
+        model: Type[BaseModel],
+        aliases: Dict[str, str],
+        source: Union[str, bytes, AsyncIterator[bytes]],
+        batch_size: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Parse, validate and insert rows; yields progress after every batch"""
+        seen = set()
+        batch: List[Dict[str, Any]] = []
+        batch_errors: List[str] = []
+        batch_invalid = 0
+        batch_duplicates = 0
+        batch_number = 0
+        rows = 0
+        
+        async def flush():
+            nonlocal batch, batch_errors, batch_invalid, batch_duplicates, batch_number
+            batch_number += 1
+            inserted, duplicates, write_errors = await self._insert_batch(collection, batch) if batch else (0, 0, [])
+            if inserted:
+                count_cache.invalidate(collection.name)
+            progress = {
+                "batch": batch_number,
+                "rows": rows,
+                "inserted": inserted,
+                "duplicates": duplicates + batch_duplicates,
+                "invalid": batch_invalid + len(write_errors),
+                "errors": (batch_errors + write_errors)[:MAX_ERRORS_PER_BATCH]
+            }
+            logger.info(
+                f"CSV import into {collection.name}: batch {batch_number} ({rows} rows read) "
+                f"inserted={inserted} duplicates={progress['duplicates']} invalid={progress['invalid']}"
+            )
+            batch, batch_errors, batch_invalid, batch_duplicates = [], [], 0, 0
+            return progress
+        
+        async for row_number, row in iter_csv_rows(source):
+            rows = row_number
+            try:
+                doc = self._row_to_model(row, model, aliases).model_dump()
+            except ValidationError as e:
+                batch_invalid += 1
+                details = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                batch_errors.append(f"Row {row_number}: {details}")
+                continue
+            
+            key = self._natural_key(doc)
+            if key in seen:
+                # Repeated within the file; only the first occurrence is imported
+                batch_duplicates += 1
+                continue
+            seen.add(key)
+            
+            now = datetime.utcnow()
+            doc["created_at"] = now
+            doc["updated_at"] = now
+            batch.append(doc)
+            
+            if len(batch) >= batch_size:
+                yield await flush()
+        
+        if batch or batch_invalid or batch_duplicates or batch_number == 0:
+            yield await flush()
+    
+    async def _run_import(
+        self,
+        collection,
+        model: Type[BaseModel],
+        aliases: Dict[str, str],
+        source: Union[str, bytes, AsyncIterator[bytes]],
+        batch_size: int
+    ) -> Dict:
+        """Run an import to completion and summarize the per-batch progress"""
+        batches = []
+        imported = duplicates = invalid = rows = 0
+        error_details: List[str] = []
+        
+        async for progress in self._import_batches(collection, model, aliases, source, max(1, batch_size)):
+            batches.append({k: v for k, v in progress.items() if k != "errors"})
+            rows = progress["rows"]
+            imported += progress["inserted"]
+            duplicates += progress["duplicates"]
+            invalid += progress["invalid"]
+            error_details.extend(progress["errors"][:MAX_ERROR_DETAILS - len(error_details)])
+        
+        return {
+            "success": True,
+            "data": {
+                "rows": rows,
+                "imported": imported,
+                "duplicates": duplicates,
+                "errors": invalid,
+                "error_details": error_details,
+                "batches": batches
+            }
+        }
+    
+    # ==================== STREAMING EXPORT ====================
+    
+    async def _export(
+        self,
+        collection,
+        columns: List[Tuple[str, str]],
+        filters: Optional[Dict],
+        format: str,
+        compress: bool,
+        batch_size: int
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield encoded export chunks straight from the cursor
+        
+        Only the projected columns are fetched, batch_size documents at a
+        time, and at most EXPORT_CHUNK_BYTES of output is buffered.
+        """
+        projection = {field: 1 for _, field in columns}
+        cursor = collection.find(filters or {}, projection).batch_size(max(1, batch_size))
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if format == "csv" else None
+        
+        def drain() -> bytes:
+            data = buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            return compressor.compress(data) if compressor else data
+        
+        if writer:
+            writer.writerow([header for header, _ in columns])
+        
+        async for doc in cursor:
+            if writer:
+                writer.writerow([_export_value(doc.get(field)) for _, field in columns])
+            else:
+                row = {field: doc.get(field) for _, field in columns if field in doc}
+                row["_id"] = str(doc["_id"])
+                buffer.write(json.dumps(row, default=_export_value, ensure_ascii=False))
+                buffer.write("\n")
+            if buffer.tell() >= EXPORT_CHUNK_BYTES:
+                chunk = drain()
+                if chunk:
+                    yield chunk
+        
+        chunk = drain()
+        if compressor:
+            chunk += compressor.flush()
+        if chunk:
+            yield chunk
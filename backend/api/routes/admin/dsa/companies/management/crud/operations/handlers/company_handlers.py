@@ -7,6 +7,21 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.snapshot_cache import dsa_dashboard_snapshot
+from api.utils.helpers.pagination import fetch_page
+from pymongo import IndexModel
+
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "dsa_companies": [
+        IndexModel([("is_active", 1), ("problem_count", -1), ("_id", -1)], name="is_active_problem_count_id"),
+        IndexModel([("is_active", 1), ("job_count", -1), ("_id", -1)], name="is_active_job_count_id"),
+        IndexModel([("industry", 1), ("name", 1), ("_id", 1)], name="industry_name_id"),
+        IndexModel([("name", 1), ("_id", 1)], name="name_id"),
+    ]
+}
 
 
 class CompanyHandlers:
@@ -24,6 +39,8 @@ class CompanyHandlers:
         company_data["job_count"] = 0
         
         result = await self.collection.insert_one(company_data)
+        count_cache.invalidate(self.collection.name)
+        dsa_dashboard_snapshot.mark_dirty()
         company_data["_id"] = result.inserted_id
         return self._format_company(company_data)
     
@@ -35,7 +52,9 @@ class CompanyHandlers:
         industry: Optional[str] = None,
         is_active: Optional[bool] = None,
         sort_by: str = "name",
-        sort_order: str = "asc"
+        sort_order: str = "asc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ) -> Dict[str, Any]:
         """Get list of companies with filters"""
         query = {}
@@ -51,19 +70,21 @@ class CompanyHandlers:
         # Sort
         sort_direction = 1 if sort_order == "asc" else -1
         
-        # Get total count
-        total = await self.collection.count_documents(query)
+        # Get total count (cached unless count=exact)
+        total = await count_cache.count(self.collection, query, count, cursor)
         
         # Get companies
-        cursor = self.collection.find(query).sort(sort_by, sort_direction).skip(skip).limit(limit)
-        companies = await cursor.to_list(length=limit)
+        companies, next_cursor = await fetch_page(
+            self.collection, query, sort_by, sort_direction, limit, cursor=cursor, skip=skip
+        )
         
         return {
             "success": True,
             "companies": [self._format_company(c) for c in companies],
             "total": total,
             "page": (skip // limit) + 1,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     
     async def get_company_by_id(self, company_id: str) -> Optional[Dict[str, Any]]:
@@ -84,6 +105,8 @@ class CompanyHandlers:
                 {"$set": update_data},
                 return_document=True
             )
+            count_cache.invalidate(self.collection.name)
+            dsa_dashboard_snapshot.mark_dirty()
             return self._format_company(result) if result else None
         except Exception:
             return None
@@ -92,6 +115,8 @@ class CompanyHandlers:
         """Delete company"""
         try:
             result = await self.collection.delete_one({"_id": ObjectId(company_id)})
+            count_cache.invalidate(self.collection.name)
+            dsa_dashboard_snapshot.mark_dirty()
             return result.deleted_count > 0
         except Exception:
             return False
@@ -148,6 +173,7 @@ class CompanyHandlers:
                 {"_id": ObjectId(company_id)},
                 {"$inc": {"problem_count": 1}}
             )
+            dsa_dashboard_snapshot.mark_dirty()
             return True
         except Exception:
             return False
@@ -159,6 +185,7 @@ class CompanyHandlers:
                 {"_id": ObjectId(company_id)},
                 {"$inc": {"problem_count": -1}}
             )
+            dsa_dashboard_snapshot.mark_dirty()
             return True
         except Exception:
             return False
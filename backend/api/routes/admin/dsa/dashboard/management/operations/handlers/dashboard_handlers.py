@@ -0,0 +1,80 @@
+"""
+DSA Dashboard Handlers
+8-Level Nested Architecture: routes/admin/dsa/dashboard/management/operations/handlers/dashboard_handlers.py
+
+Builds the public DSA dashboard as a materialized snapshot. The snapshot is
+kept in memory (utils/helpers/snapshot_cache.py) and persisted to the
+materialized_views collection so a freshly started worker can serve it with a
+single read instead of recomputing it.
+"""
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from datetime import datetime
+from typing import Any, Dict, Optional
+from api.utils.helpers.snapshot_cache import dsa_dashboard_snapshot
+
+SNAPSHOT_ID = "dsa_dashboard"
+TOP_LIMIT = 5
+
+
+class DSADashboardHandlers:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.topics = db['dsa_topics']
+        self.questions = db['dsa_questions']
+        self.sheets = db['dsa_sheets']
+        self.companies = db['dsa_companies']
+        self.materialized_views = db['materialized_views']
+        self.snapshot = dsa_dashboard_snapshot
+        self.snapshot.bind(self.build_dashboard, self.load_dashboard)
+
+    async def build_dashboard(self) -> Dict[str, Any]:
+        """Recompute the dashboard from the DSA collections and persist it"""
+        topics_count = await self.topics.count_documents({"is_active": True})
+        questions_count = await self.questions.estimated_document_count()
+        sheets_count = await self.sheets.count_documents({"is_published": True})
+        companies_count = await self.companies.count_documents({"is_active": True})
+
+        top_topics = await self.topics.find({"is_active": True}).sort(
+            [("question_count", -1), ("_id", -1)]
+        ).limit(TOP_LIMIT).to_list(length=TOP_LIMIT)
+        top_companies = await self.companies.find({"is_active": True}).sort(
+            [("problem_count", -1), ("_id", -1)]
+        ).limit(TOP_LIMIT).to_list(length=TOP_LIMIT)
+
+        for topic in top_topics:
+            topic["_id"] = str(topic["_id"])
+
+        for company in top_companies:
+            company["_id"] = str(company["_id"])
+
+        data = {
+            "stats": {
+                "total_topics": topics_count,
+                "total_questions": questions_count,
+                "total_sheets": sheets_count,
+                "total_companies": companies_count
+            },
+            "top_topics": top_topics,
+            "top_companies": top_companies,
+            "generated_at": datetime.utcnow()
+        }
+
+        await self.materialized_views.replace_one(
+            {"_id": SNAPSHOT_ID},
+            {"_id": SNAPSHOT_ID, "data": data},
+            upsert=True
+        )
+        return data
+
+    async def load_dashboard(self) -> Optional[Dict[str, Any]]:
+        """Read the last persisted snapshot, if any"""
+        doc = await self.materialized_views.find_one({"_id": SNAPSHOT_ID})
+        return doc["data"] if doc else None
+
+    async def get_dashboard(self) -> Dict[str, Any]:
+        """Get the dashboard from memory (no database round trip once warm)"""
+        return {"success": True, "data": await self.snapshot.get()}
+
+    async def rebuild_dashboard(self) -> Dict[str, Any]:
+        """Force a synchronous rebuild"""
+        return {"success": True, "data": await self.snapshot.refresh()}
@@ -2,18 +2,46 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
 from typing import Optional, List
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.snapshot_cache import dsa_dashboard_snapshot
+from api.utils.helpers.pagination import fetch_page
+from pymongo import IndexModel, ReturnDocument
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "dsa_questions": [
+        IndexModel([("topics", 1), ("difficulty", 1)], name="topics_difficulty"),
+        IndexModel([("difficulty", 1), ("created_at", -1), ("_id", -1)], name="difficulty_created_at_id"),
+        IndexModel([("is_active", 1), ("created_at", -1), ("_id", -1)], name="is_active_created_at_id"),
+        IndexModel([("companies", 1)], name="companies"),
+        IndexModel([("created_at", -1), ("_id", -1)], name="created_at_id"),
+    ]
+}
+
 
 class DSAQuestionHandlers:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.collection = db['dsa_questions']
         self.topics_collection = db['dsa_topics']
     
+    async def _adjust_topic_counts(self, topic_ids: List[str], delta: int):
+        """Keep the denormalized dsa_topics.question_count in step with question writes"""
+        object_ids = [ObjectId(t) for t in set(topic_ids or []) if ObjectId.is_valid(t)]
+        if object_ids:
+            await self.topics_collection.update_many(
+                {"_id": {"$in": object_ids}},
+                {"$inc": {"question_count": delta}}
+            )
+    
     async def create_question(self, question_data: dict):
         """Create a new DSA question"""
         question_data['created_at'] = datetime.utcnow()
         question_data['updated_at'] = datetime.utcnow()
         
         result = await self.collection.insert_one(question_data)
+        count_cache.invalidate(self.collection.name)
+        dsa_dashboard_snapshot.mark_dirty()
+        await self._adjust_topic_counts(question_data.get('topics', []), 1)
         created_question = await self.collection.find_one({"_id": result.inserted_id})
         
         created_question['id'] = str(created_question.pop('_id'))
@@ -30,7 +58,9 @@ class DSAQuestionHandlers:
         is_active: Optional[bool] = None,
         is_premium: Optional[bool] = None,
         sort_by: str = "created_at",
-        sort_order: int = -1
+        sort_order: int = -1,
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ):
         """Get all questions with filtering and sorting"""
         query = {}
@@ -57,20 +87,22 @@ class DSAQuestionHandlers:
         if is_premium is not None:
             query['is_premium'] = is_premium
         
-        cursor = self.collection.find(query).sort(sort_by, sort_order).skip(skip).limit(limit)
-        questions = await cursor.to_list(length=limit)
+        questions, next_cursor = await fetch_page(
+            self.collection, query, sort_by, sort_order, limit, cursor=cursor, skip=skip
+        )
         
         for question in questions:
             question['id'] = str(question.pop('_id'))
         
-        total = await self.collection.count_documents(query)
+        total = await count_cache.count(self.collection, query, count, cursor)
         
         return {
             "success": True,
             "data": questions,
             "total": total,
             "page": skip // limit + 1 if limit > 0 else 1,
-            "pages": (total + limit - 1) // limit if limit > 0 else 1
+            "pages": ((total + limit - 1) // limit if limit > 0 else 1) if total is not None else None,
+            "next_cursor": next_cursor
         }
     
     async def get_question(self, question_id: str):
@@ -99,14 +131,25 @@ class DSAQuestionHandlers:
         
         update_data['updated_at'] = datetime.utcnow()
         
-        result = await self.collection.update_one(
+        # Read the previous topics atomically with the update to diff counters
+        previous = await self.collection.find_one_and_update(
             {"_id": ObjectId(question_id)},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection={"topics": 1},
+            return_document=ReturnDocument.BEFORE
         )
+        count_cache.invalidate(self.collection.name)
+        dsa_dashboard_snapshot.mark_dirty()
         
-        if result.matched_count == 0:
+        if previous is None:
             return {"success": False, "error": "Question not found"}
         
+        if 'topics' in update_data:
+            old_topics = set(previous.get('topics') or [])
+            new_topics = set(update_data['topics'])
+            await self._adjust_topic_counts(list(new_topics - old_topics), 1)
+            await self._adjust_topic_counts(list(old_topics - new_topics), -1)
+        
         updated_question = await self.collection.find_one({"_id": ObjectId(question_id)})
         updated_question['id'] = str(updated_question.pop('_id'))
         
@@ -117,11 +160,18 @@ class DSAQuestionHandlers:
         if not ObjectId.is_valid(question_id):
             return {"success": False, "error": "Invalid question ID"}
         
-        result = await self.collection.delete_one({"_id": ObjectId(question_id)})
+        deleted = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(question_id)},
+            projection={"topics": 1}
+        )
+        count_cache.invalidate(self.collection.name)
+        dsa_dashboard_snapshot.mark_dirty()
         
-        if result.deleted_count == 0:
+        if deleted is None:
             return {"success": False, "error": "Question not found"}
         
+        await self._adjust_topic_counts(deleted.get('topics', []), -1)
+        
         return {"success": True, "message": "Question deleted successfully"}
     
     async def get_questions_by_difficulty(self):
@@ -147,24 +197,17 @@ class DSAQuestionHandlers:
         return {"success": True, "data": difficulty_stats}
     
     async def get_questions_by_topic(self):
-        """Get question count grouped by topic"""
-        # Get all topics
-        topics = await self.topics_collection.find().to_list(length=None)
+        """Get question count grouped by topic (from the maintained counters)"""
+        cursor = self.topics_collection.find({}, {"name": 1, "question_count": 1}).sort("question_count", -1)
         
         topic_stats = []
-        for topic in topics:
-            topic_id = str(topic['_id'])
-            count = await self.collection.count_documents({"topics": topic_id})
-            
+        async for topic in cursor:
             topic_stats.append({
-                "topic_id": topic_id,
+                "topic_id": str(topic['_id']),
                 "topic_name": topic.get('name', 'Unknown'),
-                "count": count
+                "count": topic.get('question_count', 0)
             })
         
-        # Sort by count
-        topic_stats.sort(key=lambda x: x['count'], reverse=True)
-        
         return {"success": True, "data": topic_stats}
     
     async def increment_submission(self, question_id: str, is_accepted: bool = False):
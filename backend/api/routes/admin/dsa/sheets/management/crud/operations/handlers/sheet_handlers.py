@@ -2,6 +2,23 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
 from typing import Optional, List
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.snapshot_cache import dsa_dashboard_snapshot
+from api.utils.helpers.pagination import fetch_page
+from api.utils.helpers.stats_cache import stats_cache
+from pymongo import IndexModel
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "dsa_sheets": [
+        IndexModel([("is_published", 1), ("created_at", -1), ("_id", -1)], name="is_published_created_at_id"),
+        IndexModel([("is_featured", 1), ("created_at", -1), ("_id", -1)], name="is_featured_created_at_id"),
+        IndexModel([("level", 1), ("created_at", -1), ("_id", -1)], name="level_created_at_id"),
+        IndexModel([("tags", 1)], name="tags"),
+        IndexModel([("created_at", -1), ("_id", -1)], name="created_at_id"),
+    ]
+}
+
 
 class DSASheetHandlers:
     def __init__(self, db: AsyncIOMotorDatabase):
@@ -18,6 +35,8 @@ class DSASheetHandlers:
             sheet_data['total_questions'] = len(sheet_data['questions'])
         
         result = await self.collection.insert_one(sheet_data)
+        count_cache.invalidate(self.collection.name)
+        dsa_dashboard_snapshot.mark_dirty()
         created_sheet = await self.collection.find_one({"_id": result.inserted_id})
         
         created_sheet['id'] = str(created_sheet.pop('_id'))
@@ -34,7 +53,9 @@ class DSASheetHandlers:
         is_featured: Optional[bool] = None,
         is_premium: Optional[bool] = None,
         sort_by: str = "created_at",
-        sort_order: int = -1
+        sort_order: int = -1,
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ):
         """Get all sheets with filtering and sorting"""
         query = {}
@@ -61,20 +82,22 @@ class DSASheetHandlers:
         if is_premium is not None:
             query['is_premium'] = is_premium
         
-        cursor = self.collection.find(query).sort(sort_by, sort_order).skip(skip).limit(limit)
-        sheets = await cursor.to_list(length=limit)
+        sheets, next_cursor = await fetch_page(
+            self.collection, query, sort_by, sort_order, limit, cursor=cursor, skip=skip
+        )
         
         for sheet in sheets:
             sheet['id'] = str(sheet.pop('_id'))
         
-        total = await self.collection.count_documents(query)
+        total = await count_cache.count(self.collection, query, count, cursor)
         
         return {
             "success": True,
             "data": sheets,
             "total": total,
             "page": skip // limit + 1 if limit > 0 else 1,
-            "pages": (total + limit - 1) // limit if limit > 0 else 1
+            "pages": ((total + limit - 1) // limit if limit > 0 else 1) if total is not None else None,
+            "next_cursor": next_cursor
         }
     
     async def get_sheet(self, sheet_id: str):
@@ -111,6 +134,8 @@ class DSASheetHandlers:
             {"_id": ObjectId(sheet_id)},
             {"$set": update_data}
         )
+        count_cache.invalidate(self.collection.name)
+        dsa_dashboard_snapshot.mark_dirty()
         
         if result.matched_count == 0:
             return {"success": False, "error": "Sheet not found"}
@@ -126,6 +151,8 @@ class DSASheetHandlers:
             return {"success": False, "error": "Invalid sheet ID"}
         
         result = await self.collection.delete_one({"_id": ObjectId(sheet_id)})
+        count_cache.invalidate(self.collection.name)
+        dsa_dashboard_snapshot.mark_dirty()
         
         if result.deleted_count == 0:
             return {"success": False, "error": "Sheet not found"}
@@ -205,6 +232,8 @@ class DSASheetHandlers:
                 }
             }
         )
+        count_cache.invalidate(self.collection.name)
+        dsa_dashboard_snapshot.mark_dirty()
         
         return {
             "success": True,
@@ -214,26 +243,24 @@ class DSASheetHandlers:
     
     async def get_sheet_stats(self):
         """Get statistics for sheets"""
-        total_sheets = await self.collection.count_documents({})
-        published_sheets = await self.collection.count_documents({"is_published": True})
-        featured_sheets = await self.collection.count_documents({"is_featured": True})
-        
-        # Get sheets by level
+        return {"success": True, "data": await stats_cache.get("dsa_sheets", self._compute_sheet_stats)}
+    
+    async def _compute_sheet_stats(self):
+        # One pass: per-level counts with the published/featured flags summed alongside
         pipeline = [
             {"$group": {
                 "_id": "$level",
-                "count": {"$sum": 1}
+                "count": {"$sum": 1},
+                "published": {"$sum": {"$cond": [{"$eq": ["$is_published", True]}, 1, 0]}},
+                "featured": {"$sum": {"$cond": [{"$eq": ["$is_featured", True]}, 1, 0]}}
             }}
         ]
         
         level_stats = await self.collection.aggregate(pipeline).to_list(length=None)
         
         return {
-            "success": True,
-            "data": {
-                "total_sheets": total_sheets,
-                "published_sheets": published_sheets,
-                "featured_sheets": featured_sheets,
-                "by_level": {item['_id']: item['count'] for item in level_stats}
-            }
+            "total_sheets": sum(item['count'] for item in level_stats),
+            "published_sheets": sum(item['published'] for item in level_stats),
+            "featured_sheets": sum(item['featured'] for item in level_stats),
+            "by_level": {item['_id']: item['count'] for item in level_stats}
         }
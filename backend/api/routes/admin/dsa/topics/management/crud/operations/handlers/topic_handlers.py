@@ -2,6 +2,21 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
 from typing import Optional, List
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.snapshot_cache import dsa_dashboard_snapshot
+from api.utils.helpers.pagination import fetch_page
+from pymongo import IndexModel, UpdateOne
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "dsa_topics": [
+        IndexModel([("is_active", 1), ("name", 1), ("_id", 1)], name="is_active_name_id"),
+        IndexModel([("parent_topic", 1), ("name", 1), ("_id", 1)], name="parent_topic_name_id"),
+        IndexModel([("name", 1), ("_id", 1)], name="name_id"),
+        IndexModel([("question_count", -1), ("_id", -1)], name="question_count_id"),
+    ]
+}
+
 
 class DSATopicHandlers:
     def __init__(self, db: AsyncIOMotorDatabase):
@@ -15,6 +30,8 @@ class DSATopicHandlers:
         topic_data['question_count'] = 0
         
         result = await self.collection.insert_one(topic_data)
+        count_cache.invalidate(self.collection.name)
+        dsa_dashboard_snapshot.mark_dirty()
         created_topic = await self.collection.find_one({"_id": result.inserted_id})
         
         created_topic['id'] = str(created_topic.pop('_id'))
@@ -28,7 +45,9 @@ class DSATopicHandlers:
         is_active: Optional[bool] = None,
         parent_topic: Optional[str] = None,
         sort_by: str = "name",
-        sort_order: int = 1
+        sort_order: int = 1,
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ):
         """Get all topics with filtering and sorting"""
         query = {}
@@ -45,25 +64,24 @@ class DSATopicHandlers:
             else:
                 query['parent_topic'] = parent_topic
         
-        # Count questions for each topic
-        cursor = self.collection.find(query).sort(sort_by, sort_order).skip(skip).limit(limit)
-        topics = await cursor.to_list(length=limit)
+        topics, next_cursor = await fetch_page(
+            self.collection, query, sort_by, sort_order, limit, cursor=cursor, skip=skip
+        )
         
+        # question_count is maintained by the question handlers
         for topic in topics:
             topic['id'] = str(topic.pop('_id'))
-            # Count questions with this topic
-            topic['question_count'] = await self.questions_collection.count_documents(
-                {"topics": topic['id']}
-            )
+            topic.setdefault('question_count', 0)
         
-        total = await self.collection.count_documents(query)
+        total = await count_cache.count(self.collection, query, count, cursor)
         
         return {
             "success": True,
             "data": topics,
             "total": total,
             "page": skip // limit + 1 if limit > 0 else 1,
-            "pages": (total + limit - 1) // limit if limit > 0 else 1
+            "pages": ((total + limit - 1) // limit if limit > 0 else 1) if total is not None else None,
+            "next_cursor": next_cursor
         }
     
     async def get_topic(self, topic_id: str):
@@ -77,11 +95,7 @@ class DSATopicHandlers:
             return {"success": False, "error": "Topic not found"}
         
         topic['id'] = str(topic.pop('_id'))
-        
-        # Count questions with this topic
-        topic['question_count'] = await self.questions_collection.count_documents(
-            {"topics": topic['id']}
-        )
+        topic.setdefault('question_count', 0)
         
         return {"success": True, "data": topic}
     
@@ -102,17 +116,15 @@ class DSATopicHandlers:
             {"_id": ObjectId(topic_id)},
             {"$set": update_data}
         )
+        count_cache.invalidate(self.collection.name)
+        dsa_dashboard_snapshot.mark_dirty()
         
         if result.matched_count == 0:
             return {"success": False, "error": "Topic not found"}
         
         updated_topic = await self.collection.find_one({"_id": ObjectId(topic_id)})
         updated_topic['id'] = str(updated_topic.pop('_id'))
-        
-        # Count questions
-        updated_topic['question_count'] = await self.questions_collection.count_documents(
-            {"topics": updated_topic['id']}
-        )
+        updated_topic.setdefault('question_count', 0)
         
         return {"success": True, "data": updated_topic}
     
@@ -122,6 +134,8 @@ class DSATopicHandlers:
             return {"success": False, "error": "Invalid topic ID"}
         
         result = await self.collection.delete_one({"_id": ObjectId(topic_id)})
+        count_cache.invalidate(self.collection.name)
+        dsa_dashboard_snapshot.mark_dirty()
         
         if result.deleted_count == 0:
             return {"success": False, "error": "Topic not found"}
@@ -130,28 +144,46 @@ class DSATopicHandlers:
     
     async def get_topic_stats(self):
         """Get statistics for all topics"""
-        pipeline = [
-            {
-                "$lookup": {
-                    "from": "dsa_questions",
-                    "localField": "_id",
-                    "foreignField": "topics",
-                    "as": "questions"
-                }
-            },
-            {
-                "$project": {
-                    "name": 1,
-                    "question_count": {"$size": "$questions"},
-                    "is_active": 1
-                }
-            },
-            {"$sort": {"question_count": -1}}
-        ]
-        
-        topics = await self.collection.aggregate(pipeline).to_list(length=None)
+        cursor = self.collection.find(
+            {}, {"name": 1, "question_count": 1, "is_active": 1}
+        ).sort("question_count", -1)
+        topics = await cursor.to_list(length=None)
         
         for topic in topics:
             topic['id'] = str(topic.pop('_id'))
+            topic.setdefault('question_count', 0)
         
         return {"success": True, "data": topics}
+    
+    async def repair_question_counts(self):
+        """
+        Recompute question_count for every topic and fix any drift
+        
+        Run on startup (REPAIR_TOPIC_COUNTS_ON_STARTUP) so topics created
+        before the counter was maintained get their real counts. A topic
+        listed twice on one question counts once, as in _adjust_topic_counts.
+        """
+        pipeline = [
+            {"$project": {"topics": {
+                "$cond": [{"$isArray": "$topics"}, {"$setUnion": ["$topics", []]}, []]
+            }}},
+            {"$unwind": "$topics"},
+            {"$group": {"_id": "$topics", "count": {"$sum": 1}}}
+        ]
+        actual = {}
+        async for row in self.questions_collection.aggregate(pipeline, allowDiskUse=True):
+            actual[str(row['_id'])] = row['count']
+        
+        operations = []
+        checked = 0
+        async for topic in self.collection.find({}, {"question_count": 1}):
+            checked += 1
+            expected = actual.get(str(topic['_id']), 0)
+            if topic.get('question_count') != expected:
+                operations.append(UpdateOne({"_id": topic['_id']}, {"$set": {"question_count": expected}}))
+        
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+            dsa_dashboard_snapshot.mark_dirty()
+        
+        return {"success": True, "data": {"checked": checked, "repaired": len(operations)}}
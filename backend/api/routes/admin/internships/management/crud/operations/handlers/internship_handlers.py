@@ -3,13 +3,33 @@ from typing import Optional
 from datetime import datetime
 from bson import ObjectId
 import logging
+from api.utils.search.inverted_index import CollectionSearchIndex
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.pagination import fetch_page, encode_offset_cursor, decode_offset_cursor
+from pymongo import IndexModel
 
 logger = logging.getLogger(__name__)
 
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "internships": [
+        IndexModel([("is_active", 1), ("created_at", -1), ("_id", -1)], name="is_active_created_at_id"),
+        IndexModel([("category", 1), ("is_active", 1), ("created_at", -1), ("_id", -1)], name="category_is_active_created_at_id"),
+        IndexModel([("internship_type", 1), ("is_active", 1), ("created_at", -1), ("_id", -1)], name="internship_type_is_active_created_at_id"),
+        IndexModel([("created_at", -1), ("_id", -1)], name="created_at_id"),
+    ]
+}
+
+
 class InternshipHandlers:
     def __init__(self, db):
         self.db = db
         self.collection = db.internships
+        self.search_index = CollectionSearchIndex(
+            self.collection,
+            fields={"title": 3.0, "company": 2.0, "skills_required": 1.5, "description": 1.0},
+            filter_fields=("is_active", "category", "internship_type")
+        )
     
     async def create_internship(self, internship_data: dict) -> dict:
         try:
@@ -17,9 +37,11 @@ class InternshipHandlers:
             internship_data['updated_at'] = datetime.utcnow()
             
             result = await self.collection.insert_one(internship_data)
+            count_cache.invalidate(self.collection.name)
             
             if result.inserted_id:
                 created = await self.collection.find_one({"_id": result.inserted_id})
+                self.search_index.upsert(created)
                 created['_id'] = str(created['_id'])
                 return created
             else:
@@ -37,12 +59,18 @@ class InternshipHandlers:
         internship_type: Optional[str] = None,
         is_active: Optional[bool] = None,
         sort_by: str = "created_at",
-        sort_order: int = -1
+        sort_order: int = -1,
+        search_mode: str = "index",
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ) -> dict:
         try:
             filter_query = {}
+            # Until the search index has finished its first build, search
+            # uses the regex path rather than waiting for it
+            use_index = bool(search) and search_mode != "regex" and self.search_index.ready
             
-            if search:
+            if search and not use_index:
                 filter_query['$or'] = [
                     {"title": {"$regex": search, "$options": "i"}},
                     {"company": {"$regex": search, "$options": "i"}}
@@ -57,11 +85,15 @@ class InternshipHandlers:
             if is_active is not None:
                 filter_query['is_active'] = is_active
             
-            total = await self.collection.count_documents(filter_query)
-            cursor = self.collection.find(filter_query)
-            cursor = cursor.sort(sort_by, sort_order).skip(skip).limit(limit)
-            
-            internships = await cursor.to_list(length=limit)
+            if use_index:
+                offset = decode_offset_cursor(cursor, skip)
+                total, internships = await self.search_index.search_documents(search, filter_query, offset, limit)
+                next_cursor = encode_offset_cursor(offset + limit) if offset + limit < total else None
+            else:
+                total = await count_cache.count(self.collection, filter_query, count, cursor)
+                internships, next_cursor = await fetch_page(
+                    self.collection, filter_query, sort_by, sort_order, limit, cursor=cursor, skip=skip
+                )
             
             for internship in internships:
                 internship['_id'] = str(internship['_id'])
@@ -70,8 +102,11 @@ class InternshipHandlers:
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": next_cursor,
                 "internships": internships
             }
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error fetching internships: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -110,11 +145,13 @@ class InternshipHandlers:
                 {"_id": ObjectId(internship_id)},
                 {"$set": update_data}
             )
+            count_cache.invalidate(self.collection.name)
             
             if result.matched_count == 0:
                 raise HTTPException(status_code=404, detail="Internship not found")
             
             updated = await self.collection.find_one({"_id": ObjectId(internship_id)})
+            self.search_index.upsert(updated)
             updated['_id'] = str(updated['_id'])
             
             return updated
@@ -130,10 +167,13 @@ class InternshipHandlers:
                 raise HTTPException(status_code=400, detail="Invalid internship ID")
             
             result = await self.collection.delete_one({"_id": ObjectId(internship_id)})
+            count_cache.invalidate(self.collection.name)
             
             if result.deleted_count == 0:
                 raise HTTPException(status_code=404, detail="Internship not found")
             
+            self.search_index.remove(ObjectId(internship_id))
+            
             return {"message": "Internship deleted successfully", "id": internship_id}
         except HTTPException:
             raise
@@ -3,13 +3,34 @@ from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
 import logging
+from api.utils.search.inverted_index import CollectionSearchIndex
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.pagination import fetch_page, encode_offset_cursor, decode_offset_cursor
+from pymongo import IndexModel
 
 logger = logging.getLogger(__name__)
 
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "jobs": [
+        IndexModel([("is_active", 1), ("created_at", -1), ("_id", -1)], name="is_active_created_at_id"),
+        IndexModel([("category", 1), ("is_active", 1), ("created_at", -1), ("_id", -1)], name="category_is_active_created_at_id"),
+        IndexModel([("job_type", 1), ("is_active", 1), ("created_at", -1), ("_id", -1)], name="job_type_is_active_created_at_id"),
+        IndexModel([("experience_level", 1), ("is_active", 1), ("created_at", -1), ("_id", -1)], name="experience_level_is_active_created_at_id"),
+        IndexModel([("created_at", -1), ("_id", -1)], name="created_at_id"),
+    ]
+}
+
+
 class JobHandlers:
     def __init__(self, db):
         self.db = db
         self.collection = db.jobs
+        self.search_index = CollectionSearchIndex(
+            self.collection,
+            fields={"title": 3.0, "company": 2.0, "skills_required": 1.5, "description": 1.0},
+            filter_fields=("is_active", "category", "job_type", "experience_level")
+        )
     
     async def create_job(self, job_data: dict) -> dict:
         """
@@ -26,9 +47,11 @@ class JobHandlers:
             logger.info(f"Creating job: {job_data.get('title', 'Unknown')} at {job_data.get('company', 'Unknown')}")
             
             result = await self.collection.insert_one(job_data)
+            count_cache.invalidate(self.collection.name)
             
             if result.inserted_id:
                 created_job = await self.collection.find_one({"_id": result.inserted_id})
+                self.search_index.upsert(created_job)
                 created_job['_id'] = str(created_job['_id'])
                 
                 logger.info(f"Job created successfully with ID: {created_job['_id']}, is_active: {created_job.get('is_active')}")
@@ -78,16 +101,27 @@ class JobHandlers:
         experience_level: Optional[str] = None,
         is_active: Optional[bool] = None,
         sort_by: str = "created_at",
-        sort_order: int = -1
+        sort_order: int = -1,
+        search_mode: str = "index",
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ) -> dict:
         """
         Get all jobs with filtering, searching, and sorting
+
+        search_mode "index" ranks by relevance using the in-process search
+        index; "regex" keeps the legacy substring match and sort order.
+        Pass the returned next_cursor as cursor to fetch the following page.
+        count selects how total is computed: exact, estimated (cached) or none.
         """
         try:
             # Build filter query
             filter_query = {}
+            # Until the search index has finished its first build, search
+            # uses the regex path rather than waiting for it
+            use_index = bool(search) and search_mode != "regex" and self.search_index.ready
             
-            if search:
+            if search and not use_index:
                 filter_query['$or'] = [
                     {"title": {"$regex": search, "$options": "i"}},
                     {"company": {"$regex": search, "$options": "i"}},
@@ -108,17 +142,21 @@ class JobHandlers:
             
             logger.info(f"Fetching jobs with filters: {filter_query}, is_active filter: {is_active}")
             
-            # Get total count
-            total = await self.collection.count_documents(filter_query)
+            if use_index:
+                offset = decode_offset_cursor(cursor, skip)
+                total, jobs = await self.search_index.search_documents(search, filter_query, offset, limit)
+                next_cursor = encode_offset_cursor(offset + limit) if offset + limit < total else None
+            else:
+                # Get total count (cached unless count=exact)
+                total = await count_cache.count(self.collection, filter_query, count, cursor)
+                
+                # Get jobs with keyset pagination and sorting
+                jobs, next_cursor = await fetch_page(
+                    self.collection, filter_query, sort_by, sort_order, limit, cursor=cursor, skip=skip
+                )
             
             logger.info(f"Total jobs matching filters: {total}")
             
-            # Get jobs with pagination and sorting
-            cursor = self.collection.find(filter_query)
-            cursor = cursor.sort(sort_by, sort_order).skip(skip).limit(limit)
-            
-            jobs = await cursor.to_list(length=limit)
-            
             # Convert ObjectId to string
             for job in jobs:
                 job['_id'] = str(job['_id'])
@@ -130,9 +168,12 @@ class JobHandlers:
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": next_cursor,
                 "data": jobs,
                 "jobs": jobs  # Keep backward compatibility
             }
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error fetching jobs: {str(e)}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to fetch jobs: {str(e)}")
@@ -157,11 +198,13 @@ class JobHandlers:
                 {"_id": ObjectId(job_id)},
                 {"$set": update_data}
             )
+            count_cache.invalidate(self.collection.name)
             
             if result.matched_count == 0:
                 raise HTTPException(status_code=404, detail="Job not found")
             
             updated_job = await self.collection.find_one({"_id": ObjectId(job_id)})
+            self.search_index.upsert(updated_job)
             updated_job['_id'] = str(updated_job['_id'])
             
             return updated_job
@@ -180,10 +223,13 @@ class JobHandlers:
                 raise HTTPException(status_code=400, detail="Invalid job ID")
             
             result = await self.collection.delete_one({"_id": ObjectId(job_id)})
+            count_cache.invalidate(self.collection.name)
             
             if result.deleted_count == 0:
                 raise HTTPException(status_code=404, detail="Job not found")
             
+            self.search_index.remove(ObjectId(job_id))
+            
             return {"message": "Job deleted successfully", "id": job_id}
         except HTTPException:
             raise
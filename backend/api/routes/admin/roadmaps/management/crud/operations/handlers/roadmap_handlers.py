@@ -7,7 +7,23 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.view_counter import view_counter
+from api.utils.helpers.pagination import fetch_page
 import re
+from pymongo import IndexModel
+
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "roadmaps": [
+        IndexModel([("is_published", 1), ("created_at", -1), ("_id", -1)], name="is_published_created_at_id"),
+        IndexModel([("category", 1), ("is_published", 1), ("created_at", -1), ("_id", -1)], name="category_is_published_created_at_id"),
+        IndexModel([("difficulty_level", 1), ("is_published", 1)], name="difficulty_level_is_published"),
+        IndexModel([("is_published", 1), ("views_count", -1), ("_id", -1)], name="is_published_views_count_id"),
+        IndexModel([("created_at", -1), ("_id", -1)], name="created_at_id"),
+    ]
+}
 
 
 class RoadmapHandlers:
@@ -69,6 +85,7 @@ class RoadmapHandlers:
             roadmap_data["reading_time"] = self._calculate_reading_time(nodes)
         
         result = await self.collection.insert_one(roadmap_data)
+        count_cache.invalidate(self.collection.name)
         roadmap_data["_id"] = result.inserted_id
         return self._format_roadmap(roadmap_data)
     
@@ -83,7 +100,9 @@ class RoadmapHandlers:
         is_published: Optional[bool] = None,
         is_active: Optional[bool] = None,
         sort_by: str = "created_at",
-        sort_order: str = "desc"
+        sort_order: str = "desc",
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ) -> Dict[str, Any]:
         """Get list of roadmaps with filters"""
         query = {}
@@ -109,19 +128,21 @@ class RoadmapHandlers:
         # Sort
         sort_direction = 1 if sort_order == "asc" else -1
         
-        # Get total count
-        total = await self.collection.count_documents(query)
+        # Get total count (cached unless count=exact)
+        total = await count_cache.count(self.collection, query, count, cursor)
         
         # Get roadmaps
-        cursor = self.collection.find(query).sort(sort_by, sort_direction).skip(skip).limit(limit)
-        roadmaps = await cursor.to_list(length=limit)
+        roadmaps, next_cursor = await fetch_page(
+            self.collection, query, sort_by, sort_direction, limit, cursor=cursor, skip=skip
+        )
         
         return {
             "success": True,
             "roadmaps": [self._format_roadmap(r) for r in roadmaps],
             "total": total,
             "page": (skip // limit) + 1,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     
     async def get_roadmap_by_id(self, roadmap_id: str) -> Optional[Dict[str, Any]]:
@@ -146,6 +167,7 @@ class RoadmapHandlers:
                 {"$set": update_data},
                 return_document=True
             )
+            count_cache.invalidate(self.collection.name)
             return self._format_roadmap(result) if result else None
         except Exception:
             return None
@@ -154,6 +176,7 @@ class RoadmapHandlers:
         """Delete roadmap"""
         try:
             result = await self.collection.delete_one({"_id": ObjectId(roadmap_id)})
+            count_cache.invalidate(self.collection.name)
             return result.deleted_count > 0
         except Exception:
             return False
@@ -172,6 +195,7 @@ class RoadmapHandlers:
                 {"$set": {"is_published": new_status, "updated_at": datetime.utcnow()}},
                 return_document=True
             )
+            count_cache.invalidate(self.collection.name)
             
             return {
                 "success": True,
@@ -182,12 +206,9 @@ class RoadmapHandlers:
             return {"success": False, "message": str(e)}
     
     async def increment_views(self, roadmap_id: str) -> bool:
-        """Increment view count"""
+        """Increment view count (buffered, see utils/helpers/view_counter.py)"""
         try:
-            await self.collection.update_one(
-                {"_id": ObjectId(roadmap_id)},
-                {"$inc": {"views_count": 1}}
-            )
+            view_counter.record(self.collection, ObjectId(roadmap_id))
             return True
         except Exception:
             return False
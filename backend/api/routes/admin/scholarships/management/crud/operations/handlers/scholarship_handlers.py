@@ -3,13 +3,34 @@ from typing import Optional
 from datetime import datetime
 from bson import ObjectId
 import logging
+from api.utils.search.inverted_index import CollectionSearchIndex
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.pagination import fetch_page, encode_offset_cursor, decode_offset_cursor
+from pymongo import IndexModel
 
 logger = logging.getLogger(__name__)
 
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "scholarships": [
+        IndexModel([("is_active", 1), ("created_at", -1), ("_id", -1)], name="is_active_created_at_id"),
+        IndexModel([("scholarship_type", 1), ("is_active", 1), ("created_at", -1), ("_id", -1)], name="scholarship_type_is_active_created_at_id"),
+        IndexModel([("education_level", 1), ("is_active", 1), ("created_at", -1), ("_id", -1)], name="education_level_is_active_created_at_id"),
+        IndexModel([("country", 1), ("is_active", 1), ("created_at", -1), ("_id", -1)], name="country_is_active_created_at_id"),
+        IndexModel([("created_at", -1), ("_id", -1)], name="created_at_id"),
+    ]
+}
+
+
 class ScholarshipHandlers:
     def __init__(self, db):
         self.db = db
         self.collection = db.scholarships
+        self.search_index = CollectionSearchIndex(
+            self.collection,
+            fields={"title": 3.0, "provider": 2.0, "field_of_study": 1.5, "description": 1.0},
+            filter_fields=("is_active", "scholarship_type", "education_level", "country")
+        )
     
     async def create_scholarship(self, scholarship_data: dict) -> dict:
         try:
@@ -17,9 +38,11 @@ class ScholarshipHandlers:
             scholarship_data['updated_at'] = datetime.utcnow()
             
             result = await self.collection.insert_one(scholarship_data)
+            count_cache.invalidate(self.collection.name)
             
             if result.inserted_id:
                 created = await self.collection.find_one({"_id": result.inserted_id})
+                self.search_index.upsert(created)
                 created['_id'] = str(created['_id'])
                 return created
             else:
@@ -38,12 +61,18 @@ class ScholarshipHandlers:
         country: Optional[str] = None,
         is_active: Optional[bool] = None,
         sort_by: str = "created_at",
-        sort_order: int = -1
+        sort_order: int = -1,
+        search_mode: str = "index",
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ) -> dict:
         try:
             filter_query = {}
+            # Until the search index has finished its first build, search
+            # uses the regex path rather than waiting for it
+            use_index = bool(search) and search_mode != "regex" and self.search_index.ready
             
-            if search:
+            if search and not use_index:
                 filter_query['$or'] = [
                     {"title": {"$regex": search, "$options": "i"}},
                     {"provider": {"$regex": search, "$options": "i"}}
@@ -61,11 +90,15 @@ class ScholarshipHandlers:
             if is_active is not None:
                 filter_query['is_active'] = is_active
             
-            total = await self.collection.count_documents(filter_query)
-            cursor = self.collection.find(filter_query)
-            cursor = cursor.sort(sort_by, sort_order).skip(skip).limit(limit)
-            
-            scholarships = await cursor.to_list(length=limit)
+            if use_index:
+                offset = decode_offset_cursor(cursor, skip)
+                total, scholarships = await self.search_index.search_documents(search, filter_query, offset, limit)
+                next_cursor = encode_offset_cursor(offset + limit) if offset + limit < total else None
+            else:
+                total = await count_cache.count(self.collection, filter_query, count, cursor)
+                scholarships, next_cursor = await fetch_page(
+                    self.collection, filter_query, sort_by, sort_order, limit, cursor=cursor, skip=skip
+                )
             
             for scholarship in scholarships:
                 scholarship['_id'] = str(scholarship['_id'])
@@ -74,8 +107,11 @@ class ScholarshipHandlers:
                 "total": total,
                 "skip": skip,
                 "limit": limit,
+                "next_cursor": next_cursor,
                 "scholarships": scholarships
             }
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error fetching scholarships: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -114,11 +150,13 @@ class ScholarshipHandlers:
                 {"_id": ObjectId(scholarship_id)},
                 {"$set": update_data}
             )
+            count_cache.invalidate(self.collection.name)
             
             if result.matched_count == 0:
                 raise HTTPException(status_code=404, detail="Scholarship not found")
             
             updated = await self.collection.find_one({"_id": ObjectId(scholarship_id)})
+            self.search_index.upsert(updated)
             updated['_id'] = str(updated['_id'])
             
             return updated
@@ -134,10 +172,13 @@ class ScholarshipHandlers:
                 raise HTTPException(status_code=400, detail="Invalid scholarship ID")
             
             result = await self.collection.delete_one({"_id": ObjectId(scholarship_id)})
+            count_cache.invalidate(self.collection.name)
             
             if result.deleted_count == 0:
                 raise HTTPException(status_code=404, detail="Scholarship not found")
             
+            self.search_index.remove(ObjectId(scholarship_id))
+            
             return {"message": "Scholarship deleted successfully", "id": scholarship_id}
         except HTTPException:
             raise
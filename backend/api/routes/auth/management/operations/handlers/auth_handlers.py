@@ -8,11 +8,12 @@ from bson import ObjectId
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import jwt
-from passlib.context import CryptContext
 import os
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.pagination import fetch_page
+from api.utils.helpers.principal_cache import PrincipalCache
+from api.utils.helpers.password_hasher import password_hasher
+from pymongo import IndexModel
 
 # JWT settings
 SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "your-secret-key-change-this-in-production")
@@ -20,6 +21,19 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
 
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "admin_users": [
+        IndexModel([("email", 1)], name="email", unique=True),
+        IndexModel([("username", 1)], name="username", unique=True),
+        IndexModel([("created_at", -1), ("_id", -1)], name="created_at_id"),
+    ],
+    "app_users": [
+        IndexModel([("email", 1)], name="email", unique=True),
+    ]
+}
+
+
 class AuthHandlers:
     """Handlers for Authentication operations"""
     
@@ -27,18 +41,19 @@ class AuthHandlers:
         self.db = db
         self.admin_collection = db.admin_users
         self.user_collection = db.app_users
+        self.principal_cache = PrincipalCache()
     
     # =============================================================================
     # PASSWORD UTILITIES
     # =============================================================================
     
-    def hash_password(self, password: str) -> str:
-        """Hash a password"""
-        return pwd_context.hash(password)
+    async def hash_password(self, password: str) -> str:
+        """Hash a password (on the password hasher pool)"""
+        return await password_hasher.hash(password)
     
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash"""
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash (on the password hasher pool)"""
+        return await password_hasher.verify(plain_password, hashed_password)
     
     def create_access_token(self, data: Dict[str, Any]) -> str:
         """Create JWT access token"""
@@ -75,7 +90,7 @@ class AuthHandlers:
         
         # Hash password
         password = admin_data.pop("password")
-        admin_data["password_hash"] = self.hash_password(password)
+        admin_data["password_hash"] = await self.hash_password(password)
         
         # Set timestamps
         admin_data["created_at"] = datetime.utcnow()
@@ -85,6 +100,7 @@ class AuthHandlers:
         
         # Insert admin
         result = await self.admin_collection.insert_one(admin_data)
+        count_cache.invalidate(self.admin_collection.name)
         admin_data["_id"] = result.inserted_id
         
         # Create token
@@ -117,13 +133,17 @@ class AuthHandlers:
         if not admin.get("is_active", True):
             return {"success": False, "message": "Account is deactivated"}
         
-        if not self.verify_password(password, admin["password_hash"]):
+        valid, new_hash = await password_hasher.verify_and_update(password, admin["password_hash"])
+        if not valid:
             return {"success": False, "message": "Invalid email or password"}
         
-        # Update last login
+        # Update last login (and the hash, if it was made with an outdated cost)
+        login_update = {"last_login": datetime.utcnow()}
+        if new_hash:
+            login_update["password_hash"] = new_hash
         await self.admin_collection.update_one(
             {"_id": admin["_id"]},
-            {"$set": {"last_login": datetime.utcnow()}}
+            {"$set": login_update}
         )
         
         # Create token
@@ -159,7 +179,7 @@ class AuthHandlers:
         
         # Hash password
         password = user_data.pop("password")
-        user_data["password_hash"] = self.hash_password(password)
+        user_data["password_hash"] = await self.hash_password(password)
         
         # Set default values
         user_data["created_at"] = datetime.utcnow()
@@ -203,13 +223,17 @@ class AuthHandlers:
         if not user.get("is_active", True):
             return {"success": False, "message": "Account is deactivated"}
         
-        if not self.verify_password(password, user["password_hash"]):
+        valid, new_hash = await password_hasher.verify_and_update(password, user["password_hash"])
+        if not valid:
             return {"success": False, "message": "Invalid email or password"}
         
-        # Update last login
+        # Update last login (and the hash, if it was made with an outdated cost)
+        login_update = {"last_login": datetime.utcnow()}
+        if new_hash:
+            login_update["password_hash"] = new_hash
         await self.user_collection.update_one(
             {"_id": user["_id"]},
-            {"$set": {"last_login": datetime.utcnow()}}
+            {"$set": login_update}
         )
         
         # Create token
@@ -235,7 +259,11 @@ class AuthHandlers:
     # =============================================================================
     
     async def get_current_user(self, token: str) -> Optional[Dict[str, Any]]:
-        """Get current user from token"""
+        """Get current user from token (cached per token, see principal_cache.py)"""
+        cached = self.principal_cache.get(token)
+        if cached is not None:
+            return cached
+        
         payload = self.verify_token(token)
         if not payload:
             return None
@@ -255,6 +283,8 @@ class AuthHandlers:
             if user:
                 user["id"] = str(user.pop("_id"))
                 user["user_type"] = user_type
+                user.pop("password_hash", None)
+                self.principal_cache.set(token, user, payload.get("exp"))
                 return user
             
             return None
@@ -276,6 +306,8 @@ class AuthHandlers:
                 return_document=True
             )
             
+            self.principal_cache.invalidate_user("user", user_id)
+            
             if result:
                 result["id"] = str(result.pop("_id"))
                 result.pop("password_hash", None)  # Remove password hash from response
@@ -294,15 +326,16 @@ class AuthHandlers:
             if not user:
                 return {"success": False, "message": "User not found"}
             
-            if not self.verify_password(old_password, user["password_hash"]):
+            if not await self.verify_password(old_password, user["password_hash"]):
                 return {"success": False, "message": "Invalid old password"}
             
-            new_hash = self.hash_password(new_password)
+            new_hash = await self.hash_password(new_password)
             
             await collection.update_one(
                 {"_id": ObjectId(user_id)},
                 {"$set": {"password_hash": new_hash, "updated_at": datetime.utcnow()}}
             )
+            self.principal_cache.invalidate_user(user_type if user_type == "admin" else "user", user_id)
             
             return {"success": True, "message": "Password changed successfully"}
         except Exception as e:
@@ -332,7 +365,7 @@ class AuthHandlers:
         
         # Hash password
         password = admin_data.pop("password")
-        admin_data["password_hash"] = self.hash_password(password)
+        admin_data["password_hash"] = await self.hash_password(password)
         
         # Set timestamps and defaults
         admin_data["created_at"] = datetime.utcnow()
@@ -343,6 +376,7 @@ class AuthHandlers:
         
         # Insert admin
         result = await self.admin_collection.insert_one(admin_data)
+        count_cache.invalidate(self.admin_collection.name)
         
         return {
             "success": True,
@@ -357,16 +391,17 @@ class AuthHandlers:
         self,
         skip: int = 0,
         limit: int = 50,
-        role: Optional[str] = None
+        role: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ) -> Dict[str, Any]:
         """Get list of all admins"""
         query = {}
         if role:
             query["role"] = role
         
-        total = await self.admin_collection.count_documents(query)
-        cursor = self.admin_collection.find(query).skip(skip).limit(limit).sort("created_at", -1)
-        admins = await cursor.to_list(length=limit)
+        total = await count_cache.count(self.admin_collection, query, count, cursor)
+        admins, next_cursor = await fetch_page(self.admin_collection, query, "created_at", -1, limit, cursor=cursor, skip=skip)
         
         # Format admins
         formatted_admins = []
@@ -386,7 +421,8 @@ class AuthHandlers:
             "admins": formatted_admins,
             "total": total,
             "page": (skip // limit) + 1,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
     
     async def get_admin_by_id(self, admin_id: str) -> Optional[Dict[str, Any]]:
@@ -424,6 +460,8 @@ class AuthHandlers:
                 {"$set": update_data},
                 return_document=True
             )
+            count_cache.invalidate(self.admin_collection.name)
+            self.principal_cache.invalidate_user("admin", admin_id)
             
             if result:
                 result["id"] = str(result.pop("_id"))
@@ -449,6 +487,8 @@ class AuthHandlers:
                 return {"success": False, "message": "Cannot delete super admin"}
             
             result = await self.admin_collection.delete_one({"_id": ObjectId(admin_id)})
+            count_cache.invalidate(self.admin_collection.name)
+            self.principal_cache.invalidate_user("admin", admin_id)
             return {
                 "success": result.deleted_count > 0,
                 "message": "Admin deleted successfully" if result.deleted_count > 0 else "Admin not found"
@@ -475,6 +515,8 @@ class AuthHandlers:
                 {"_id": ObjectId(admin_id)},
                 {"$set": {"is_active": new_status, "updated_at": datetime.utcnow()}}
             )
+            count_cache.invalidate(self.admin_collection.name)
+            self.principal_cache.invalidate_user("admin", admin_id)
             
             return {
                 "success": True,
@@ -4,24 +4,52 @@ Career Tools Gemini Generator & Handlers
 """
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import HTTPException
 from bson import ObjectId
 from datetime import datetime
-from typing import Dict, Any, Optional
-import google.generativeai as genai
+import os
+import time
+from typing import Dict, Any, AsyncIterator, Optional
+
+from api.utils.ai.gemini.clients.model_registry import gemini_models
+from api.utils.ai.gemini.executor.ai_executor import ai_executor
+from api.utils.ai.gemini.cache.response_cache import AIResponseCache
+from api.utils.helpers.prompt_templates import CompiledTemplate, PromptTemplateCache
+from pymongo import IndexModel
+
+
+# Declared indexes (applied by utils/database/indexes/index_registry.py)
+INDEXES = {
+    "career_tool_usage": [
+        IndexModel([("user_id", 1), ("created_at", -1), ("_id", -1)], name="user_id_created_at_id"),
+        IndexModel([("tool_type", 1), ("created_at", -1), ("_id", -1)], name="tool_type_created_at_id"),
+    ],
+    "career_tool_templates": [
+        IndexModel([("tool_type", 1)], name="tool_type"),
+    ],
+    "ai_response_cache": [
+        IndexModel([("expires_at", 1)], name="expires_at", expireAfterSeconds=0),
+    ]
+}
+
+
+# Response field holding each tool's generated text
+TOOL_OUTPUT_FIELDS = {
+    "resume_review": "feedback",
+    "cover_letter": "cover_letter",
+    "ats_hack": "optimization",
+    "cold_email": "email"
+}
 
 
 class CareerToolsHandlers:
     """Handlers for Career Tools with Gemini AI"""
     
-    def __init__(self, db: AsyncIOMotorDatabase, gemini_api_key: str):
+    def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.usage_collection = db.career_tool_usage
         self.templates_collection = db.career_tool_templates
         
-        # Initialize Gemini
-        genai.configure(api_key=gemini_api_key)
-        self.model = genai.GenerativeModel('gemini-flash-latest')
-        
         # Initialize default templates
         self.default_templates = {
             "resume_review": """
@@ -184,158 +212,118 @@ Requirements:
 - Avoid sounding desperate or overly salesy
 """
         }
+        
+        # Active templates, precompiled and kept in memory
+        self.template_cache = PromptTemplateCache(self.templates_collection, self.default_templates)
+        
+        # Results keyed by (tool, template digest, normalized inputs)
+        self.response_cache = AIResponseCache(db.ai_response_cache)
+        
+        # Lifetime uses allowed per app user, checked against career_tools_used
+        self.usage_quota = int(os.environ.get("CAREER_TOOLS_QUOTA", 0))
     
     # =============================================================================
-    # RESUME REVIEW
+    # CAREER TOOLS
     # =============================================================================
     
     async def review_resume(self, user_id: str, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Review resume using Gemini AI"""
-        try:
-            # Get template
-            template = await self._get_template("resume_review")
-            
-            # Format prompt
-            prompt = template.format(
-                resume_text=request_data.get("resume_text", ""),
-                target_role=request_data.get("target_role", "Not specified"),
-                industry=request_data.get("industry", "Not specified")
-            )
-            
-            # Generate feedback
-            response = self.model.generate_content(prompt)
-            feedback = response.text.strip()
-            
-            # Log usage
-            await self._log_usage(user_id, "resume_review", request_data, feedback)
-            
-            # Increment user counter
-            await self._increment_user_counter(user_id)
-            
-            return {
-                "success": True,
-                "feedback": feedback,
-                "tool_type": "resume_review"
-            }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    # =============================================================================
-    # COVER LETTER GENERATOR
-    # =============================================================================
+        return await self._run_tool(user_id, "resume_review", request_data)
     
     async def generate_cover_letter(self, user_id: str, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate cover letter using Gemini AI"""
-        try:
-            # Get template
-            template = await self._get_template("cover_letter")
-            
-            # Format prompt
-            skills = request_data.get("user_skills", [])
-            skills_str = ", ".join(skills) if skills else "Not specified"
-            
-            prompt = template.format(
-                job_title=request_data.get("job_title", ""),
-                company_name=request_data.get("company_name", ""),
-                job_description=request_data.get("job_description", "Not provided"),
-                user_experience=request_data.get("user_experience", "Not specified"),
-                user_skills=skills_str,
-                tone=request_data.get("tone", "professional")
-            )
-            
-            # Generate cover letter
-            response = self.model.generate_content(prompt)
-            cover_letter = response.text.strip()
-            
-            # Log usage
-            await self._log_usage(user_id, "cover_letter", request_data, cover_letter)
-            
-            # Increment user counter
-            await self._increment_user_counter(user_id)
-            
-            return {
-                "success": True,
-                "cover_letter": cover_letter,
-                "tool_type": "cover_letter"
-            }
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    # =============================================================================
-    # ATS HACK
-    # =============================================================================
+        return await self._run_tool(user_id, "cover_letter", request_data)
     
     async def optimize_for_ats(self, user_id: str, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """Optimize resume for ATS using Gemini AI"""
+        return await self._run_tool(user_id, "ats_hack", request_data)
+    
+    async def generate_cold_email(self, user_id: str, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate cold email using Gemini AI"""
+        return await self._run_tool(user_id, "cold_email", request_data)
+    
+    async def _run_tool(self, user_id: str, tool_type: str, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the tool's prompt, generate (or reuse a cached result), log and count the use"""
         try:
-            # Get template
-            template = await self._get_template("ats_hack")
-            
-            # Format prompt
-            keywords = request_data.get("keywords", [])
-            keywords_str = ", ".join(keywords) if keywords else "None specified"
+            # Get template and format prompt
+            template = await self._get_template(tool_type)
+            prompt = template.format(**self._prompt_values(tool_type, request_data))
             
-            prompt = template.format(
-                resume_text=request_data.get("resume_text", ""),
-                job_description=request_data.get("job_description", ""),
-                keywords=keywords_str
+            # Generate (identical requests are served from the response cache)
+            output, cached = await self.response_cache.get_or_generate(
+                tool_type, template.digest, request_data,
+                lambda: self._generate(tool_type, prompt)
             )
             
-            # Generate optimization advice
-            response = self.model.generate_content(prompt)
-            optimization = response.text.strip()
-            
             # Log usage
-            await self._log_usage(user_id, "ats_hack", request_data, optimization)
+            await self._log_usage(user_id, tool_type, request_data, output)
             
             # Increment user counter
             await self._increment_user_counter(user_id)
             
             return {
                 "success": True,
-                "optimization": optimization,
-                "tool_type": "ats_hack"
+                TOOL_OUTPUT_FIELDS[tool_type]: output,
+                "tool_type": tool_type,
+                "cached": cached
             }
+        except HTTPException:
+            # Rate limiting (429) must reach the client as a status, not a payload
+            raise
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def check_quota(self, user_id: str):
+        """Reject with 429 once a user has used CAREER_TOOLS_QUOTA tools (0 = unlimited)"""
+        if not self.usage_quota or not ObjectId.is_valid(user_id):
+            return
+        user = await self.db.app_users.find_one({"_id": ObjectId(user_id)}, {"career_tools_used": 1})
+        if user and user.get("career_tools_used", 0) >= self.usage_quota:
+            raise HTTPException(status_code=429, detail="Career tools quota exceeded")
+    
     # =============================================================================
-    # COLD EMAIL GENERATOR
+    # STREAMING
     # =============================================================================
     
-    async def generate_cold_email(self, user_id: str, request_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate cold email using Gemini AI"""
+    async def stream_tool(self, user_id: str, tool_type: str, request_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a career tool, yielding SSE events as Gemini produces text
+        
+        Yields {"event": "delta", "data": {"text": ...}} per chunk, then a
+        "done" event carrying the same payload as the non-streaming call.
+        """
+        output_field = TOOL_OUTPUT_FIELDS[tool_type]
         try:
-            # Get template
-            template = await self._get_template("cold_email")
+            template = await self._get_template(tool_type)
+            prompt = template.format(**self._prompt_values(tool_type, request_data))
             
-            # Format prompt
-            prompt = template.format(
-                recipient_name=request_data.get("recipient_name", "there"),
-                recipient_title=request_data.get("recipient_title", ""),
-                company_name=request_data.get("company_name", ""),
-                purpose=request_data.get("purpose", "networking"),
-                sender_background=request_data.get("sender_background", "Not specified"),
-                tone=request_data.get("tone", "professional")
-            )
-            
-            # Generate email
-            response = self.model.generate_content(prompt)
-            email = response.text.strip()
-            
-            # Log usage
-            await self._log_usage(user_id, "cold_email", request_data, email)
+            output = await self.response_cache.get(tool_type, template.digest, request_data)
+            cached = output is not None
+            if cached:
+                yield {"event": "delta", "data": {"text": output}}
+            else:
+                started = time.monotonic()
+                parts = []
+                async for text in ai_executor.stream_text(tool_type, gemini_models.get_model(tool_type), prompt):
+                    parts.append(text)
+                    yield {"event": "delta", "data": {"text": text}}
+                output = "".join(parts).strip()
+                await self.response_cache.put(
+                    tool_type, template.digest, request_data, output,
+                    (time.monotonic() - started) * 1000
+                )
             
-            # Increment user counter
+            await self._log_usage(user_id, tool_type, request_data, output)
             await self._increment_user_counter(user_id)
             
-            return {
+            yield {"event": "done", "data": {
                 "success": True,
-                "email": email,
-                "tool_type": "cold_email"
-            }
+                output_field: output,
+                "tool_type": tool_type,
+                "cached": cached
+            }}
         except Exception as e:
-            return {"success": False, "error": str(e)}
+            yield {"event": "error", "data": {"success": False, "error": str(e)}}
     
     # =============================================================================
     # PROMPT TEMPLATE MANAGEMENT
@@ -348,6 +336,7 @@ Requirements:
         
         result = await self.templates_collection.insert_one(template_data)
         template_data["_id"] = result.inserted_id
+        await self.template_cache.invalidate()
         
         return {"success": True, "template": self._format_template(template_data)}
     
@@ -369,6 +358,7 @@ Requirements:
                 {"$set": update_data},
                 return_document=True
             )
+            await self.template_cache.invalidate()
             
             return {"success": True, "template": self._format_template(result)} if result else {"success": False}
         except Exception as e:
@@ -378,6 +368,7 @@ Requirements:
         """Delete prompt template"""
         try:
             result = await self.templates_collection.delete_one({"_id": ObjectId(template_id)})
+            await self.template_cache.invalidate()
             return result.deleted_count > 0
         except Exception:
             return False
@@ -412,24 +403,58 @@ Requirements:
         return {
             "success": True,
             "stats": stats,
-            "total_uses": sum(s["count"] for s in stats)
+            "total_uses": sum(s["count"] for s in stats),
+            "response_cache": self.response_cache.get_stats()
         }
     
     # =============================================================================
     # HELPER METHODS
     # =============================================================================
     
-    async def _get_template(self, tool_type: str) -> str:
-        """Get prompt template for tool type"""
-        template = await self.templates_collection.find_one({
-            "tool_type": tool_type,
-            "is_active": True
-        })
-        
-        if template:
-            return template["prompt_template"]
-        
-        return self.default_templates.get(tool_type, "")
+    async def _get_template(self, tool_type: str) -> CompiledTemplate:
+        """Get the compiled prompt template for tool type (served from memory)"""
+        return await self.template_cache.get(tool_type) or CompiledTemplate("")
+    
+    def _prompt_values(self, tool_type: str, request_data: Dict[str, Any]) -> Dict[str, str]:
+        """Template placeholders for a tool request, with defaults for missing fields"""
+        if tool_type == "resume_review":
+            return {
+                "resume_text": request_data.get("resume_text", ""),
+                "target_role": request_data.get("target_role", "Not specified"),
+                "industry": request_data.get("industry", "Not specified")
+            }
+        if tool_type == "cover_letter":
+            skills = request_data.get("user_skills", [])
+            return {
+                "job_title": request_data.get("job_title", ""),
+                "company_name": request_data.get("company_name", ""),
+                "job_description": request_data.get("job_description", "Not provided"),
+                "user_experience": request_data.get("user_experience", "Not specified"),
+                "user_skills": ", ".join(skills) if skills else "Not specified",
+                "tone": request_data.get("tone", "professional")
+            }
+        if tool_type == "ats_hack":
+            keywords = request_data.get("keywords", [])
+            return {
+                "resume_text": request_data.get("resume_text", ""),
+                "job_description": request_data.get("job_description", ""),
+                "keywords": ", ".join(keywords) if keywords else "None specified"
+            }
+        if tool_type == "cold_email":
+            return {
+                "recipient_name": request_data.get("recipient_name", "there"),
+                "recipient_title": request_data.get("recipient_title", ""),
+                "company_name": request_data.get("company_name", ""),
+                "purpose": request_data.get("purpose", "networking"),
+                "sender_background": request_data.get("sender_background", "Not specified"),
+                "tone": request_data.get("tone", "professional")
+            }
+        raise ValueError(f"Unknown career tool: {tool_type}")
+    
+    async def _generate(self, tool_type: str, prompt: str) -> str:
+        """Run one Gemini call for a career tool"""
+        response = await ai_executor.run(tool_type, gemini_models.get_model(tool_type).generate_content, prompt)
+        return response.text.strip()
     
     async def _log_usage(self, user_id: str, tool_type: str, input_data: Dict, output_data: str):
         """Log career tool usage"""
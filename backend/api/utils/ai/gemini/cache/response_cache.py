@@ -0,0 +1,237 @@
+"""
+Gemini Response Cache
+8-Level Nested Architecture: utils/ai/gemini/cache/response_cache.py
+
+Content-addressed cache for deterministic-enough AI results (career tools).
+The key is a SHA-256 of (tool type, template digest, normalized inputs), so
+editing a template naturally misses the old entries.
+
+Tiers:
+    memory      - LRU bounded by entry count and total response size
+    persistent  - optional Mongo collection (AI_RESPONSE_CACHE_PERSIST=true)
+                  whose expires_at TTL index purges old entries
+
+Both tiers honour the same TTL. Concurrent identical misses share a single
+generation.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(value: Any) -> Any:
+    """Collapse whitespace so trivially different inputs share an entry"""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items() if item is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def make_cache_key(tool_type: str, template_digest: str, inputs: Dict[str, Any]) -> str:
+    """Content address of one AI request"""
+    payload = json.dumps(
+        {"tool": tool_type, "template": template_digest, "inputs": _normalize(inputs)},
+        sort_keys=True, default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AIResponseCache:
+    """Two-tier (memory LRU + optional Mongo) AI response cache"""
+
+    def __init__(
+        self,
+        collection=None,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        persist: Optional[bool] = None
+    ):
+        self.ttl = ttl if ttl is not None else float(os.environ.get("AI_RESPONSE_CACHE_TTL_SECONDS", 24 * 3600))
+        self.max_entries = max_entries or int(os.environ.get("AI_RESPONSE_CACHE_MAX_ENTRIES", 1000))
+        self.max_bytes = max_bytes or int(os.environ.get("AI_RESPONSE_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+        if persist is None:
+            persist = os.environ.get("AI_RESPONSE_CACHE_PERSIST", "false").lower() == "true"
+        self.collection = collection if persist else None
+
+        # key -> (response, expires_at monotonic, size, generation latency ms)
+        self._entries: "OrderedDict[str, Tuple[str, float, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._stats = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stores": 0,
+            "evictions": 0,
+            "latency_saved_ms": 0.0
+        }
+
+    def _get_memory(self, key: str) -> Optional[Tuple[str, float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0], entry[3]
+
+    def _evict(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _put_memory(self, key: str, response: str, latency_ms: float, ttl: float):
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        self._evict(key)
+        self._entries[key] = (response, time.monotonic() + ttl, size, latency_ms)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._evict(next(iter(self._entries)))
+            self._stats["evictions"] += 1
+
+    async def _get_persistent(self, key: str) -> Optional[Tuple[str, float, float]]:
+        if self.collection is None:
+            return None
+        try:
+            doc = await self.collection.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+        except Exception as e:
+            logger.warning(f"AI response cache read failed: {e}")
+            return None
+        if not doc:
+            return None
+        remaining = (doc["expires_at"] - datetime.utcnow()).total_seconds()
+        return doc["response"], doc.get("latency_ms", 0.0), remaining
+
+    async def _put_persistent(self, key: str, tool_type: str, response: str, latency_ms: float):
+        if self.collection is None:
+            return
+        now = datetime.utcnow()
+        try:
+            await self.collection.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "tool_type": tool_type,
+                    "response": response,
+                    "latency_ms": latency_ms,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl)
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"AI response cache write failed: {e}")
+
+    async def _lookup(self, key: str) -> Optional[str]:
+        cached = self._get_memory(key)
+        if cached is not None:
+            self._stats["memory_hits"] += 1
+            self._stats["latency_saved_ms"] += cached[1]
+            return cached[0]
+
+        persisted = await self._get_persistent(key)
+        if persisted is not None:
+            response, latency_ms, remaining = persisted
+            self._stats["persistent_hits"] += 1
+            self._stats["latency_saved_ms"] += latency_ms
+            self._put_memory(key, response, latency_ms, min(self.ttl, remaining))
+            return response
+        return None
+
+    async def get(self, tool_type: str, template_digest: str, inputs: Dict[str, Any]) -> Optional[str]:
+        """Look up a response without generating one (counts a miss)"""
+        response = await self._lookup(make_cache_key(tool_type, template_digest, inputs))
+        if response is None:
+            self._stats["misses"] += 1
+        return response
+
+    async def put(self, tool_type: str, template_digest: str, inputs: Dict[str, Any], response: str, latency_ms: float):
+        """Store a response produced outside get_or_generate (e.g. streamed)"""
+        await self._store(make_cache_key(tool_type, template_digest, inputs), tool_type, response, latency_ms)
+
+    async def _store(self, key: str, tool_type: str, response: str, latency_ms: float):
+        if not response:
+            return
+        self._stats["stores"] += 1
+        self._put_memory(key, response, latency_ms, self.ttl)
+        await self._put_persistent(key, tool_type, response, latency_ms)
+
+    async def get_or_generate(
+        self,
+        tool_type: str,
+        template_digest: str,
+        inputs: Dict[str, Any],
+        generate: Callable[[], Awaitable[str]]
+    ) -> Tuple[str, bool]:
+        """
+        Return a cached response or generate (and cache) a new one
+
+        Returns:
+            (response, cached)
+        """
+        key = make_cache_key(tool_type, template_digest, inputs)
+        response = await self._lookup(key)
+        if response is not None:
+            return response, True
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(future), True
+
+        self._stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            started = time.monotonic()
+            response = await generate()
+            latency_ms = round((time.monotonic() - started) * 1000, 2)
+            future.set_result(response)
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged as a warning
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+        await self._store(key, tool_type, response, latency_ms)
+        return response, False
+
+    def clear(self):
+        """Drop the memory tier"""
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate, latency saved and tier sizes"""
+        hits = self._stats["memory_hits"] + self._stats["persistent_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "latency_saved_ms": round(self._stats["latency_saved_ms"], 2),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "persistent": self.collection is not None
+        }
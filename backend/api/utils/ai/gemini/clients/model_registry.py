@@ -0,0 +1,122 @@
+"""
+Gemini Model Registry
+8-Level Nested Architecture: utils/ai/gemini/clients/model_registry.py
+
+One place that configures the google-generativeai SDK and hands out
+GenerativeModel instances. The API key is set once, so every feature shares
+the SDK's single generative service client (and its transport / connection
+pool). Models are built lazily on first use and shared by every feature with
+the same model name, temperature and output token limit.
+
+Per-feature settings use the same "feature=value,feature=value" format as
+AI_FEATURE_LIMITS; the "default" key applies to every feature not listed:
+    GEMINI_MODELS              model name
+    GEMINI_TEMPERATURES        sampling temperature
+    GEMINI_MAX_OUTPUT_TOKENS   output token limit
+"""
+
+import logging
+import os
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+import google.generativeai as genai
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = "gemini-flash-latest"
+
+# Features pinned to a different model by default
+DEFAULT_FEATURE_MODELS = {
+    "dsa_question_generation": "gemini-2.5-flash",
+    "dsa_sheet_generation": "gemini-2.5-flash",
+}
+
+
+class ModelConfig(NamedTuple):
+    model_name: str
+    temperature: Optional[float] = None
+    max_output_tokens: Optional[int] = None
+
+
+def _parse_feature_values(raw: str, cast: Callable[[str], Any]) -> Dict[str, Any]:
+    """Parse "feature=value,feature=value" into a dict"""
+    values = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        feature, value = item.split("=", 1)
+        try:
+            values[feature.strip()] = cast(value.strip())
+        except ValueError:
+            logger.warning(f"Ignoring invalid Gemini model setting: {item}")
+    return values
+
+
+class GeminiModelRegistry:
+    """Lazily configured, shared GenerativeModel instances per feature"""
+
+    def __init__(self):
+        self._api_key: Optional[str] = None
+        self._configured = False
+        self._models: Dict[ModelConfig, Any] = {}
+        self._model_names = {"default": DEFAULT_MODEL_NAME, **DEFAULT_FEATURE_MODELS}
+        self._model_names.update(_parse_feature_values(os.environ.get("GEMINI_MODELS", ""), str))
+        self._temperatures = _parse_feature_values(os.environ.get("GEMINI_TEMPERATURES", ""), float)
+        self._max_tokens = _parse_feature_values(os.environ.get("GEMINI_MAX_OUTPUT_TOKENS", ""), int)
+        self._uses: Dict[str, int] = {}
+
+    def configure(self, api_key: str):
+        """Set the API key; the SDK itself is configured on first use"""
+        if api_key != self._api_key:
+            self._api_key = api_key
+            self._configured = False
+            self._models.clear()
+
+    @property
+    def is_configured(self) -> bool:
+        return bool(self._api_key)
+
+    def get_config(self, feature: str) -> ModelConfig:
+        """Resolve the model settings for a feature"""
+        return ModelConfig(
+            self._model_names.get(feature, self._model_names["default"]),
+            self._temperatures.get(feature, self._temperatures.get("default")),
+            self._max_tokens.get(feature, self._max_tokens.get("default"))
+        )
+
+    def get_model(self, feature: str):
+        """Get the shared GenerativeModel for a feature, building it on first use"""
+        if not self._api_key:
+            raise RuntimeError("Gemini API not configured")
+        if not self._configured:
+            genai.configure(api_key=self._api_key, transport=os.environ.get("GEMINI_TRANSPORT") or None)
+            self._configured = True
+
+        config = self.get_config(feature)
+        model = self._models.get(config)
+        if model is None:
+            generation_config = {}
+            if config.temperature is not None:
+                generation_config["temperature"] = config.temperature
+            if config.max_output_tokens is not None:
+                generation_config["max_output_tokens"] = config.max_output_tokens
+            model = genai.GenerativeModel(config.model_name, generation_config=generation_config or None)
+            self._models[config] = model
+            logger.info(f"Built Gemini model {config.model_name} for {feature}")
+        self._uses[feature] = self._uses.get(feature, 0) + 1
+        return model
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the models built so far and which features use them"""
+        return {
+            "configured": self.is_configured,
+            "models_built": len(self._models),
+            "features": {
+                feature: {**self.get_config(feature)._asdict(), "calls": calls}
+                for feature, calls in self._uses.items()
+            }
+        }
+
+
+# Shared registry; server.py sets the API key at startup
+gemini_models = GeminiModelRegistry()
@@ -0,0 +1,332 @@
+"""
+Gemini AI Executor
+8-Level Nested Architecture: utils/ai/gemini/executor/ai_executor.py
+
+The google-generativeai SDK is synchronous, so every generate_content call is
+dispatched to a dedicated, bounded thread pool instead of running on the event
+loop. Each feature gets its own concurrency limit so a burst of one kind of AI
+traffic cannot starve the others (or the CRUD routes sharing the worker).
+Every call is first admitted by the global Gemini rate limiter, and every
+call that reaches the SDK is recorded in gemini_api_logs (buffered).
+
+A timeout only ends the caller's wait: the SDK call cannot be interrupted, so
+its feature slot stays taken (and is counted as abandoned) until the pool
+thread actually returns. A feature limit therefore also caps how many hung
+calls can tie up pool threads.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from api.utils.ai.gemini.limits.rate_limiter import ai_rate_limiter
+from api.utils.ai.gemini.usage.usage_log import gemini_usage_log, model_name
+
+logger = logging.getLogger(__name__)
+
+# Max concurrent Gemini calls per feature (overridable via AI_FEATURE_LIMITS)
+DEFAULT_FEATURE_LIMITS = {
+    "resume_review": 4,
+    "cover_letter": 4,
+    "ats_hack": 4,
+    "cold_email": 4,
+    "job_generation": 2,
+    "internship_generation": 2,
+    "scholarship_generation": 2,
+    "article_generation": 2,
+    "dsa_question_generation": 2,
+    "dsa_sheet_generation": 1,
+    "roadmap_generation": 1,
+}
+
+
+class AIExecutionTimeout(Exception):
+    """Raised when an AI call does not complete within its timeout"""
+
+
+def _parse_feature_limits(raw: str) -> Dict[str, int]:
+    """Parse "feature=limit,feature=limit" into a dict"""
+    limits = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        feature, limit = item.split("=", 1)
+        try:
+            limits[feature.strip()] = max(1, int(limit))
+        except ValueError:
+            logger.warning(f"Ignoring invalid AI feature limit: {item}")
+    return limits
+
+
+class AIExecutor:
+    """Runs blocking AI SDK calls on a bounded thread pool with per-feature limits"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        feature_limits: Optional[Dict[str, int]] = None,
+        default_limit: int = 2,
+        timeout: Optional[float] = None
+    ):
+        self.max_workers = max_workers or int(os.environ.get("AI_EXECUTOR_MAX_WORKERS", 16))
+        self.timeout = timeout or float(os.environ.get("AI_EXECUTOR_TIMEOUT_SECONDS", 90))
+        self.default_limit = default_limit
+
+        self.feature_limits = dict(DEFAULT_FEATURE_LIMITS)
+        self.feature_limits.update(_parse_feature_limits(os.environ.get("AI_FEATURE_LIMITS", "")))
+        if feature_limits:
+            self.feature_limits.update(feature_limits)
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gemini")
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _get_feature(self, feature: str):
+        """Get (or lazily create) the semaphore and counters for a feature"""
+        if feature not in self._semaphores:
+            limit = self.feature_limits.get(feature, self.default_limit)
+            self._semaphores[feature] = asyncio.Semaphore(limit)
+            self._stats[feature] = {
+                "limit": limit,
+                "in_flight": 0,
+                "queued": 0,
+                "max_queued": 0,
+                "completed": 0,
+                "failed": 0,
+                "timeouts": 0,
+                "abandoned": 0,
+                "total_wait_ms": 0.0,
+                "total_run_ms": 0.0
+            }
+        return self._semaphores[feature], self._stats[feature]
+
+    async def run(self, feature: str, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a blocking callable on the AI thread pool
+
+        Args:
+            feature: Feature name used for concurrency limits and metrics
+            func: Blocking callable, e.g. model.generate_content
+            timeout: Overall deadline (queue wait + execution) in seconds
+
+        Returns:
+            Whatever func returns
+        """
+        # Global token bucket first: waits briefly or raises AIRateLimited (429)
+        await ai_rate_limiter.admit(feature)
+        semaphore, stats = self._get_feature(feature)
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+
+        queued_at = time.monotonic()
+        stats["queued"] += 1
+        stats["max_queued"] = max(stats["max_queued"], stats["queued"])
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            raise AIExecutionTimeout(f"Timed out waiting for a free {feature} slot")
+        finally:
+            stats["queued"] -= 1
+        stats["total_wait_ms"] += (time.monotonic() - queued_at) * 1000
+
+        stats["in_flight"] += 1
+        started_at = time.monotonic()
+        caller_error: Optional[BaseException] = None
+
+        def finished(future: asyncio.Future):
+            # Runs when the pool thread returns, which may be long after the
+            # caller gave up: only then is the slot free again
+            elapsed = time.monotonic() - started_at
+            stats["in_flight"] -= 1
+            stats["total_run_ms"] += elapsed * 1000
+            if caller_error is not None:
+                stats["abandoned"] -= 1
+            semaphore.release()
+            result = error = None
+            if future.cancelled():
+                error = caller_error or asyncio.CancelledError()
+            elif future.exception() is not None:
+                error = future.exception()
+            else:
+                result = future.result()
+                error = caller_error
+            gemini_usage_log.record_call(
+                feature, elapsed, error is None, model=model_name(func), response=result, error=error
+            )
+
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._pool, functools.partial(func, *args, **kwargs))
+        except BaseException:
+            stats["in_flight"] -= 1
+            semaphore.release()
+            raise
+        future.add_done_callback(finished)
+
+        try:
+            # shield: a timeout or cancellation ends this wait, not the future
+            # whose completion frees the slot
+            result = await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - time.monotonic()))
+            stats["completed"] += 1
+            return result
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            stats["abandoned"] += 1
+            caller_error = AIExecutionTimeout(f"{feature} did not complete within {timeout:g}s")
+            raise caller_error
+        except asyncio.CancelledError as e:
+            if not future.done():
+                stats["abandoned"] += 1
+                caller_error = e
+            raise
+        except Exception:
+            stats["failed"] += 1
+            raise
+
+    async def stream_text(self, feature: str, model, prompt: str, timeout: Optional[float] = None, **kwargs) -> AsyncIterator[str]:
+        """
+        Stream a generate_content call, yielding text pieces as they arrive
+
+        The blocking SDK iterator is drained on the AI thread pool and handed
+        to the event loop through a queue. The feature slot is held until the
+        stream ends; if the consumer stops early (client disconnect) the
+        worker stops reading from the SDK.
+        """
+        await ai_rate_limiter.admit(feature)
+        semaphore, stats = self._get_feature(feature)
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+
+        queued_at = time.monotonic()
+        stats["queued"] += 1
+        stats["max_queued"] = max(stats["max_queued"], stats["queued"])
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            raise AIExecutionTimeout(f"Timed out waiting for a free {feature} slot")
+        finally:
+            stats["queued"] -= 1
+        stats["total_wait_ms"] += (time.monotonic() - queued_at) * 1000
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        last_chunk = None
+
+        def drain():
+            nonlocal last_chunk
+            try:
+                for chunk in model.generate_content(prompt, stream=True, **kwargs):
+                    if cancelled.is_set():
+                        break
+                    last_chunk = chunk
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        # Chunk without text parts (e.g. safety metadata only)
+                        continue
+                    if text:
+                        loop.call_soon_threadsafe(queue.put_nowait, ("text", text))
+                loop.call_soon_threadsafe(queue.put_nowait, ("done", None))
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, ("error", e))
+
+        stats["in_flight"] += 1
+        started_at = time.monotonic()
+        error = None
+        # The slot is released once both the consumer and the drain thread
+        # are done; the thread may still be blocked in the SDK after a
+        # timeout or disconnect
+        open_parties = 2
+        abandoned = False
+
+        def release(_=None):
+            nonlocal open_parties
+            open_parties -= 1
+            if open_parties:
+                return
+            elapsed = time.monotonic() - started_at
+            if abandoned:
+                stats["abandoned"] -= 1
+            stats["in_flight"] -= 1
+            stats["total_run_ms"] += elapsed * 1000
+            semaphore.release()
+            # The last chunk carries the cumulative usage_metadata
+            gemini_usage_log.record_call(
+                feature, elapsed, error is None, model=model_name(model), response=last_chunk,
+                error=error, streamed=True
+            )
+
+        try:
+            loop.run_in_executor(self._pool, drain).add_done_callback(release)
+        except BaseException:
+            stats["in_flight"] -= 1
+            semaphore.release()
+            raise
+
+        try:
+            while True:
+                try:
+                    kind, value = await asyncio.wait_for(queue.get(), max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    stats["timeouts"] += 1
+                    error = AIExecutionTimeout(f"{feature} did not complete within {timeout:g}s")
+                    raise error
+                if kind == "error":
+                    raise value
+                if kind == "done":
+                    break
+                yield value
+            stats["completed"] += 1
+        except AIExecutionTimeout:
+            raise
+        except (GeneratorExit, asyncio.CancelledError) as e:
+            # Consumer went away mid-stream: logged as unsuccessful, not counted as failed
+            error = e
+            raise
+        except Exception as e:
+            stats["failed"] += 1
+            error = e
+            raise
+        finally:
+            cancelled.set()
+            if open_parties == 2:
+                # The drain thread is still inside the SDK
+                abandoned = True
+                stats["abandoned"] += 1
+            release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool and per-feature queue metrics"""
+        features = {}
+        for feature, stats in self._stats.items():
+            finished = stats["completed"] + stats["failed"]
+            started = finished + stats["in_flight"]
+            features[feature] = {
+                **{k: v for k, v in stats.items() if not k.startswith("total_")},
+                "avg_wait_ms": round(stats["total_wait_ms"] / started, 2) if started else 0.0,
+                "avg_run_ms": round(stats["total_run_ms"] / finished, 2) if finished else 0.0
+            }
+
+        return {
+            "max_workers": self.max_workers,
+            "timeout_seconds": self.timeout,
+            "in_flight": sum(s["in_flight"] for s in self._stats.values()),
+            "queued": sum(s["queued"] for s in self._stats.values()),
+            "features": features
+        }
+
+    def shutdown(self):
+        """Stop accepting work and release pool threads"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Shared executor used by every generator and career tool
+ai_executor = AIExecutor()
@@ -1,12 +1,11 @@
-import google.generativeai as genai
-import json
-import re
+from typing import AsyncIterator
+
+from api.models.schemas.ai_outputs.fields.validators.custom.ai_output_model import ArticleAIOutput
+from api.utils.ai.gemini.clients.model_registry import gemini_models
+from api.utils.ai.gemini.executor.ai_executor import ai_executor
+from api.utils.ai.gemini.parsing.json_parser import AIResponseParseError, json_generation_config, parse_json
 
 class GeminiArticleGenerator:
-    def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-flash-latest')
-    
     async def generate_article(self, prompt_data: dict) -> dict:
         """
         Generate a comprehensive article using Gemini AI
@@ -19,6 +18,36 @@ class GeminiArticleGenerator:
                 - target_audience: Target audience description (optional)
                 - key_points: List of key points to cover (optional)
         """
+        prompt = self._build_prompt(prompt_data)
+        
+        try:
+            response = await ai_executor.run(
+                "article_generation", gemini_models.get_model("article_generation").generate_content, prompt,
+                generation_config=json_generation_config(ArticleAIOutput)
+            )
+        except Exception as e:
+            raise Exception(f"Error generating article with Gemini: {str(e)}")
+        return self._parse_article(response.text.strip(), prompt_data)
+    
+    async def stream_article(self, prompt_data: dict) -> AsyncIterator[dict]:
+        """
+        Generate an article, yielding text as Gemini produces it
+        
+        Yields {"event": "delta", "data": {"text": ...}} per chunk, then
+        {"event": "result", "data": article} once the full response is parsed.
+        """
+        prompt = self._build_prompt(prompt_data)
+        parts = []
+        async for text in ai_executor.stream_text(
+            "article_generation", gemini_models.get_model("article_generation"), prompt,
+            generation_config=json_generation_config(ArticleAIOutput)
+        ):
+            parts.append(text)
+            yield {"event": "delta", "data": {"text": text}}
+        yield {"event": "result", "data": self._parse_article("".join(parts).strip(), prompt_data)}
+    
+    def _build_prompt(self, prompt_data: dict) -> str:
+        """Build the article generation prompt"""
         title = prompt_data.get("title", "")
         category = prompt_data.get("category", "technology")
         author = prompt_data.get("author", "Admin")
@@ -61,17 +90,16 @@ Requirements:
 
 Respond ONLY with valid JSON, no additional text.
 """
+        return prompt
+    
+    def _parse_article(self, response_text: str, prompt_data: dict) -> dict:
+        """Parse the model's JSON response into article fields"""
+        title = prompt_data.get("title", "")
+        category = prompt_data.get("category", "technology")
+        author = prompt_data.get("author", "Admin")
         
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                article_data = json.loads(json_match.group())
-            else:
-                article_data = json.loads(response_text)
+            article_data = parse_json(response_text, "article_generation", ArticleAIOutput)
             
             # Ensure all required fields are present
             article_data.setdefault("title", title)
@@ -83,11 +111,9 @@ Respond ONLY with valid JSON, no additional text.
             
             return article_data
             
-        except json.JSONDecodeError as e:
+        except AIResponseParseError:
             # Fallback: create article from raw response
             return self._create_fallback_article(title, response_text, category, author)
-        except Exception as e:
-            raise Exception(f"Error generating article with Gemini: {str(e)}")
     
     def _create_fallback_article(self, title: str, content: str, category: str, author: str) -> dict:
         """Create article from raw content if JSON parsing fails"""
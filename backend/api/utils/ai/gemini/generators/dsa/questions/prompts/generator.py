@@ -1,12 +1,11 @@
-import google.generativeai as genai
 import json
-import re
+
+from api.models.schemas.ai_outputs.fields.validators.custom.ai_output_model import DSAQuestionAIOutput, DSASheetAIOutput
+from api.utils.ai.gemini.clients.model_registry import gemini_models
+from api.utils.ai.gemini.executor.ai_executor import ai_executor
+from api.utils.ai.gemini.parsing.json_parser import AIResponseParseError, json_generation_config, parse_json
 
 class GeminiDSAGenerator:
-    def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
-    
     async def generate_dsa_question(self, prompt_data: dict):
         """Generate a complete DSA question using Gemini AI"""
         
@@ -80,19 +79,16 @@ Make sure the question is:
 Return ONLY the JSON object, no additional text."""
 
         try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
+            response = await ai_executor.run(
+                "dsa_question_generation", gemini_models.get_model("dsa_question_generation").generate_content, prompt,
+                generation_config=json_generation_config(DSAQuestionAIOutput)
+            )
+            result_text = response.text
             
-            # Extract JSON from markdown code blocks if present
-            if '```json' in result_text:
-                result_text = re.search(r'```json\s*(.*?)\s*```', result_text, re.DOTALL).group(1)
-            elif '```' in result_text:
-                result_text = re.search(r'```\s*(.*?)\s*```', result_text, re.DOTALL).group(1)
-            
-            question_data = json.loads(result_text)
+            question_data = parse_json(result_text, "dsa_question_generation", DSAQuestionAIOutput)
             return question_data
             
-        except json.JSONDecodeError as e:
+        except AIResponseParseError as e:
             print(f"JSON parsing error: {e}")
             print(f"Raw response: {result_text}")
             # Return a basic structure if JSON parsing fails
@@ -167,16 +163,12 @@ Make sure:
 Return ONLY the JSON object."""
 
         try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
-            
-            # Extract JSON from markdown code blocks if present
-            if '```json' in result_text:
-                result_text = re.search(r'```json\s*(.*?)\s*```', result_text, re.DOTALL).group(1)
-            elif '```' in result_text:
-                result_text = re.search(r'```\s*(.*?)\s*```', result_text, re.DOTALL).group(1)
+            response = await ai_executor.run(
+                "dsa_sheet_generation", gemini_models.get_model("dsa_sheet_generation").generate_content, prompt,
+                generation_config=json_generation_config(DSASheetAIOutput)
+            )
             
-            sheet_data = json.loads(result_text)
+            sheet_data = parse_json(response.text, "dsa_sheet_generation", DSASheetAIOutput)
             return sheet_data
             
         except Exception as e:
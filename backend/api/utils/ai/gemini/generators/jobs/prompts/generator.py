@@ -1,16 +1,15 @@
-import google.generativeai as genai
 import os
-import json
 from typing import Dict, Any
 import logging
 
+from api.models.schemas.ai_outputs.fields.validators.custom.ai_output_model import JobAIOutput, InternshipAIOutput, ScholarshipAIOutput
+from api.utils.ai.gemini.clients.model_registry import gemini_models
+from api.utils.ai.gemini.executor.ai_executor import ai_executor
+from api.utils.ai.gemini.parsing.json_parser import AIResponseParseError, json_generation_config, parse_json
+
 logger = logging.getLogger(__name__)
 
 class GeminiJobGenerator:
-    def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-flash-latest')
-    
     async def generate_job_listing(self, prompt_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate a complete job listing from minimal inputs using Gemini AI
@@ -61,21 +60,14 @@ class GeminiJobGenerator:
             Important: Return ONLY the JSON object, no additional text or markdown formatting.
             """
             
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Remove markdown code blocks if present
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            response_text = response_text.strip()
+            response = await ai_executor.run(
+                "job_generation", gemini_models.get_model("job_generation").generate_content, prompt,
+                generation_config=json_generation_config(JobAIOutput)
+            )
+            response_text = response.text
             
-            # Parse the JSON response
-            generated_data = json.loads(response_text)
+            # Parse and validate the JSON response
+            generated_data = parse_json(response_text, "job_generation", JobAIOutput)
             
             # Combine with original data
             result = {
@@ -98,7 +90,7 @@ class GeminiJobGenerator:
             
             return result
             
-        except json.JSONDecodeError as e:
+        except AIResponseParseError as e:
             logger.error(f"Failed to parse Gemini response as JSON: {e}")
             logger.error(f"Response text: {response_text}")
             raise Exception(f"Failed to parse AI response: {str(e)}")
@@ -137,18 +129,11 @@ class GeminiJobGenerator:
             }}
             """
             
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            response_text = response_text.strip()
-            generated_data = json.loads(response_text)
+            response = await ai_executor.run(
+                "internship_generation", gemini_models.get_model("internship_generation").generate_content, prompt,
+                generation_config=json_generation_config(InternshipAIOutput)
+            )
+            generated_data = parse_json(response.text, "internship_generation", InternshipAIOutput)
             
             result = {
                 "title": title,
@@ -202,18 +187,11 @@ class GeminiJobGenerator:
             }}
             """
             
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            response_text = response_text.strip()
-            generated_data = json.loads(response_text)
+            response = await ai_executor.run(
+                "scholarship_generation", gemini_models.get_model("scholarship_generation").generate_content, prompt,
+                generation_config=json_generation_config(ScholarshipAIOutput)
+            )
+            generated_data = parse_json(response.text, "scholarship_generation", ScholarshipAIOutput)
             
             result = {
                 "title": title,
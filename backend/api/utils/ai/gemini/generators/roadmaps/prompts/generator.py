@@ -3,19 +3,17 @@ Gemini Roadmap Generator
 8-Level Nested Architecture: utils/ai/gemini/generators/roadmaps/prompts/generator.py
 """
 
-import google.generativeai as genai
-import json
-import re
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator
+
+from api.models.schemas.ai_outputs.fields.validators.custom.ai_output_model import RoadmapAIOutput
+from api.utils.ai.gemini.clients.model_registry import gemini_models
+from api.utils.ai.gemini.executor.ai_executor import ai_executor
+from api.utils.ai.gemini.parsing.json_parser import json_generation_config, parse_json
 
 
 class GeminiRoadmapGenerator:
     """Generate roadmaps using Gemini AI"""
     
-    def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-flash-latest')
-    
     async def generate_roadmap(self, prompt_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate a complete roadmap with node-based structure
@@ -30,6 +28,37 @@ class GeminiRoadmapGenerator:
                 - focus_areas: List of specific topics to focus on (optional)
                 - estimated_duration: Desired duration (optional)
         """
+        prompt = self._build_prompt(prompt_data)
+        
+        try:
+            response = await ai_executor.run(
+                "roadmap_generation", gemini_models.get_model("roadmap_generation").generate_content, prompt,
+                generation_config=json_generation_config(RoadmapAIOutput)
+            )
+        except Exception as e:
+            # Return a basic roadmap structure if AI generation fails
+            return self._fallback_roadmap(prompt_data, e)
+        return self._parse_roadmap(response.text.strip(), prompt_data)
+    
+    async def stream_roadmap(self, prompt_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate a roadmap, yielding text as Gemini produces it
+        
+        Yields {"event": "delta", "data": {"text": ...}} per chunk, then
+        {"event": "result", "data": roadmap} once the full response is parsed.
+        """
+        prompt = self._build_prompt(prompt_data)
+        parts = []
+        async for text in ai_executor.stream_text(
+            "roadmap_generation", gemini_models.get_model("roadmap_generation"), prompt,
+            generation_config=json_generation_config(RoadmapAIOutput)
+        ):
+            parts.append(text)
+            yield {"event": "delta", "data": {"text": text}}
+        yield {"event": "result", "data": self._parse_roadmap("".join(parts).strip(), prompt_data)}
+    
+    def _build_prompt(self, prompt_data: Dict[str, Any]) -> str:
+        """Build the roadmap generation prompt"""
         title = prompt_data.get("title", "")
         category = prompt_data.get("category", "tech_roadmap")
         subcategory = prompt_data.get("subcategory", "full_stack")
@@ -114,20 +143,18 @@ IMPORTANT:
 - Ensure parent_nodes and child_nodes IDs match actual node IDs
 - Create a connected graph where most nodes have both parents and children (except start and end nodes)
 """
+        return prompt
+    
+    def _parse_roadmap(self, response_text: str, prompt_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse the model's JSON response into roadmap fields"""
+        title = prompt_data.get("title", "")
+        category = prompt_data.get("category", "tech_roadmap")
+        subcategory = prompt_data.get("subcategory", "full_stack")
+        difficulty_level = prompt_data.get("difficulty_level", "beginner")
+        estimated_duration = prompt_data.get("estimated_duration", "3-6 months")
         
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Remove markdown code blocks if present
-            response_text = response_text.replace('```json', '').replace('```', '').strip()
-            
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                roadmap_data = json.loads(json_match.group())
-            else:
-                roadmap_data = json.loads(response_text)
+            roadmap_data = parse_json(response_text, "roadmap_generation", RoadmapAIOutput)
             
             # Ensure all required fields are present
             roadmap_data.setdefault("title", title)
@@ -154,18 +181,24 @@ IMPORTANT:
             return roadmap_data
             
         except Exception as e:
-            # Return a basic roadmap structure if AI generation fails
-            return {
-                "title": title,
-                "description": f"A comprehensive roadmap for {title}",
-                "category": category,
-                "subcategory": subcategory,
-                "difficulty_level": difficulty_level,
-                "estimated_duration": estimated_duration,
-                "tags": [subcategory, difficulty_level],
-                "author": "AI Generated",
-                "nodes": [],
-                "is_published": False,
-                "is_active": True,
-                "error": f"AI generation failed: {str(e)}"
-            }
+            return self._fallback_roadmap(prompt_data, e)
+    
+    def _fallback_roadmap(self, prompt_data: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Basic roadmap structure used when generation or parsing fails"""
+        title = prompt_data.get("title", "")
+        subcategory = prompt_data.get("subcategory", "full_stack")
+        difficulty_level = prompt_data.get("difficulty_level", "beginner")
+        return {
+            "title": title,
+            "description": f"A comprehensive roadmap for {title}",
+            "category": prompt_data.get("category", "tech_roadmap"),
+            "subcategory": subcategory,
+            "difficulty_level": difficulty_level,
+            "estimated_duration": prompt_data.get("estimated_duration", "3-6 months"),
+            "tags": [subcategory, difficulty_level],
+            "author": "AI Generated",
+            "nodes": [],
+            "is_published": False,
+            "is_active": True,
+            "error": f"AI generation failed: {str(error)}"
+        }
@@ -0,0 +1,167 @@
+"""
+Gemini Rate Limiter
+8-Level Nested Architecture: utils/ai/gemini/limits/rate_limiter.py
+
+Token buckets in front of every Gemini call so bursts are smoothed or shed
+here instead of turning into provider 429s that fail whole requests.
+
+- Global bucket: taken by the AI executor for every call. When it is empty the
+  caller waits for a token (admission queue) as long as the wait fits within
+  AI_ADMISSION_MAX_WAIT_SECONDS and fewer than AI_ADMISSION_MAX_QUEUE callers
+  are already waiting; otherwise it is rejected straight away with 429.
+- Per-user bucket: checked when a user-facing request is admitted; never
+  queues, an empty bucket is an immediate 429 with Retry-After.
+
+Buckets live in a backend. InMemoryBucketBackend keeps them per process (and
+is what tests use); a shared backend only needs take/peek/get_stats.
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from fastapi import HTTPException
+
+
+class AIRateLimited(HTTPException):
+    """Raised when an AI request is not admitted"""
+
+    def __init__(self, detail: str, retry_after: float):
+        super().__init__(
+            status_code=429,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+
+class InMemoryBucketBackend:
+    """Token buckets in a process-local dict"""
+
+    def __init__(self, max_keys: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        # key -> (tokens, last refill time), least recently used first
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def _refill(self, key: str, capacity: float, per_second: float) -> float:
+        now = self.clock()
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * per_second)
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            # Idle buckets refill to full, so dropping the oldest loses nothing
+            self._buckets.popitem(last=False)
+        return tokens
+
+    def take(self, key: str, capacity: float, per_second: float, cost: float = 1) -> float:
+        """
+        Take cost tokens if available
+
+        Returns:
+            0 when taken, otherwise seconds until enough tokens accumulate
+        """
+        tokens = self._refill(key, capacity, per_second)
+        if tokens >= cost:
+            self._buckets[key] = (tokens - cost, self._buckets[key][1])
+            return 0.0
+        return (cost - tokens) / per_second
+
+    def peek(self, key: str, capacity: float, per_second: float) -> float:
+        """Tokens currently available (refilled, not taken)"""
+        return self._refill(key, capacity, per_second)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "tracked_keys": len(self._buckets)}
+
+
+class AIRateLimiter:
+    """Global admission control plus per-user limits for Gemini traffic"""
+
+    def __init__(self, backend=None):
+        self.backend = backend or InMemoryBucketBackend()
+        self.global_rate = float(os.environ.get("AI_GLOBAL_RATE_PER_MINUTE", 60)) / 60
+        self.global_burst = float(os.environ.get("AI_GLOBAL_BURST", 10))
+        self.user_rate = float(os.environ.get("AI_USER_RATE_PER_MINUTE", 6)) / 60
+        self.user_burst = float(os.environ.get("AI_USER_BURST", 3))
+        self.max_wait = float(os.environ.get("AI_ADMISSION_MAX_WAIT_SECONDS", 10))
+        self.max_queue = int(os.environ.get("AI_ADMISSION_MAX_QUEUE", 100))
+        self._waiting = 0
+        self._stats = {
+            "admitted": 0,
+            "queued": 0,
+            "max_waiting": 0,
+            "rejected_global": 0,
+            "rejected_user": 0,
+            "total_wait_ms": 0.0
+        }
+        self._by_feature: Dict[str, Dict[str, int]] = {}
+
+    def _feature_stats(self, feature: str) -> Dict[str, int]:
+        return self._by_feature.setdefault(feature, {"admitted": 0, "rejected": 0})
+
+    async def admit(self, feature: str):
+        """Take a global token, waiting briefly if allowed (used by the AI executor)"""
+        if self.global_rate <= 0:
+            return
+        stats = self._feature_stats(feature)
+        started = time.monotonic()
+        queued = False
+        try:
+            while True:
+                wait = self.backend.take("global", self.global_burst, self.global_rate)
+                if not wait:
+                    self._stats["admitted"] += 1
+                    stats["admitted"] += 1
+                    return
+                waited = time.monotonic() - started
+                if waited + wait > self.max_wait or (not queued and self._waiting >= self.max_queue):
+                    self._stats["rejected_global"] += 1
+                    stats["rejected"] += 1
+                    raise AIRateLimited("AI service is busy, please retry shortly", wait)
+                if not queued:
+                    queued = True
+                    self._waiting += 1
+                    self._stats["queued"] += 1
+                    self._stats["max_waiting"] = max(self._stats["max_waiting"], self._waiting)
+                await asyncio.sleep(wait)
+        finally:
+            if queued:
+                self._waiting -= 1
+                self._stats["total_wait_ms"] += (time.monotonic() - started) * 1000
+
+    def check_user(self, user_id: str):
+        """Take a token from the user's bucket or reject with 429"""
+        if self.user_rate <= 0 or not user_id:
+            return
+        wait = self.backend.take(f"user:{user_id}", self.user_burst, self.user_rate)
+        if wait:
+            self._stats["rejected_user"] += 1
+            raise AIRateLimited("Too many AI requests, please slow down", wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter configuration, bucket state and admission counters"""
+        queued = self._stats["queued"]
+        return {
+            **{k: v for k, v in self._stats.items() if k != "total_wait_ms"},
+            "avg_queue_wait_ms": round(self._stats["total_wait_ms"] / queued, 2) if queued else 0.0,
+            "waiting": self._waiting,
+            "global_tokens_available": round(
+                self.backend.peek("global", self.global_burst, self.global_rate), 2
+            ) if self.global_rate > 0 else None,
+            "global_rate_per_minute": round(self.global_rate * 60, 2),
+            "global_burst": self.global_burst,
+            "user_rate_per_minute": round(self.user_rate * 60, 2),
+            "user_burst": self.user_burst,
+            "max_wait_seconds": self.max_wait,
+            "max_queue": self.max_queue,
+            "features": self._by_feature,
+            **self.backend.get_stats()
+        }
+
+
+# Shared limiter used by the AI executor and the career tools routes
+ai_rate_limiter = AIRateLimiter()
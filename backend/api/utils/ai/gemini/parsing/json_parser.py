@@ -0,0 +1,246 @@
+"""
+Gemini JSON Response Parsing
+Shared by every generator that asks Gemini for a JSON object.
+
+extract_json() first tries the whole response (what JSON response mode
+returns), then finds the first complete JSON value with one string-aware
+balanced-bracket scan. That replaces the per-generator fence stripping and the
+greedy DOTALL brace regex, which backtracks badly on long outputs. If a
+span does not parse, a light repair (drop // comments and trailing commas) is
+tried, and then the scan moves on to the next span after it (prose such as
+"[see below]" often precedes the real value).
+
+parse_json() adds optional validation into a Pydantic model and records the
+outcome per generator in parse_metrics.
+
+json_generation_config() builds the generation_config that turns on Gemini's
+JSON response mode, optionally constrained by a response schema derived from
+the same Pydantic model.
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+
+class AIResponseParseError(ValueError):
+    """Raised when a model response holds no usable JSON value"""
+
+
+# Structural characters outside strings, and the characters that matter inside
+# one; the regexes skip everything else in C
+_STRUCTURAL = re.compile(r'[{}\[\]"]')
+_IN_STRING = re.compile(r'["\\]')
+_OPENING = re.compile(r"[{\[]")
+_CLOSERS = {"}": "{", "]": "["}
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
+
+def _find_json_span(text: str, start: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    Locate the first balanced {...} or [...] in text at or after start
+
+    One left-to-right pass; brackets inside strings (and escaped quotes) are
+    ignored. A mismatched closing bracket abandons the current candidate and
+    resumes after its opening.
+    """
+    opening_match = _OPENING.search(text, start)
+    while opening_match:
+        opening = opening_match.start()
+        stack = [opening_match.group()]
+        pos = opening + 1
+        in_string = False
+        while True:
+            match = (_IN_STRING if in_string else _STRUCTURAL).search(text, pos)
+            if match is None:
+                return None
+            char = match.group()
+            pos = match.end()
+            if in_string:
+                if char == "\\":
+                    pos += 1
+                else:
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                stack.append(char)
+            elif stack[-1] != _CLOSERS[char]:
+                break
+            else:
+                stack.pop()
+                if not stack:
+                    return opening, pos
+        opening_match = _OPENING.search(text, opening + 1)
+    return None
+
+
+def _repair(candidate: str) -> str:
+    """Drop // line comments and trailing commas outside of strings"""
+    out = []
+    i = 0
+    in_string = False
+    length = len(candidate)
+    while i < length:
+        char = candidate[i]
+        if in_string:
+            out.append(char)
+            if char == "\\" and i + 1 < length:
+                out.append(candidate[i + 1])
+                i += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif char == "/" and candidate.startswith("//", i):
+            newline = candidate.find("\n", i)
+            i = length if newline == -1 else newline
+            continue
+        else:
+            out.append(char)
+        i += 1
+    return _TRAILING_COMMA.sub(r"\1", "".join(out))
+
+
+def extract_json(text: str) -> Tuple[Any, str]:
+    """
+    Pull the first parseable JSON object/array out of a model response
+
+    Returns:
+        (value, method) where method is "direct", "extracted" or "repaired"
+    """
+    text = (text or "").strip()
+    if text[:1] in ("{", "["):
+        try:
+            return json.loads(text), "direct"
+        except json.JSONDecodeError:
+            pass
+
+    first_error = None
+    span = _find_json_span(text)
+    while span is not None:
+        candidate = text[span[0]:span[1]]
+        try:
+            return json.loads(candidate), "extracted"
+        except json.JSONDecodeError:
+            pass
+        try:
+            return json.loads(_repair(candidate)), "repaired"
+        except json.JSONDecodeError as e:
+            first_error = first_error or e
+        span = _find_json_span(text, span[1])
+
+    if first_error is None:
+        raise AIResponseParseError("No JSON object found in AI response")
+    raise AIResponseParseError(f"Invalid JSON in AI response: {first_error}")
+
+
+class ParseMetrics:
+    """Per-generator counts of how responses were parsed"""
+
+    OUTCOMES = ("direct", "extracted", "repaired", "parse_failed", "validation_failed")
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, generator: str, outcome: str):
+        stats = self._stats.setdefault(generator, dict.fromkeys(self.OUTCOMES, 0))
+        stats[outcome] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get parse outcomes and failure rate per generator"""
+        report = {}
+        for generator, stats in self._stats.items():
+            total = sum(stats.values())
+            failed = stats["parse_failed"] + stats["validation_failed"]
+            report[generator] = {**stats, "failure_rate": round(failed / total, 4) if total else 0.0}
+        return report
+
+
+# Shared metrics, reported on /admin/analytics/runtime
+parse_metrics = ParseMetrics()
+
+
+def parse_json(text: str, generator: str, model: Optional[Type[BaseModel]] = None) -> Any:
+    """
+    Extract JSON from a response and optionally validate it
+
+    Args:
+        text: Raw model response text
+        generator: Name the outcome is recorded under (the executor feature)
+        model: Pydantic model to validate into; the result keeps only the
+            fields present in the response, coerced to the model's types
+
+    Raises:
+        AIResponseParseError: No parseable JSON, or it failed validation
+    """
+    try:
+        data, method = extract_json(text)
+    except AIResponseParseError:
+        parse_metrics.record(generator, "parse_failed")
+        raise
+
+    if model is not None:
+        try:
+            data = model.model_validate(data).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            parse_metrics.record(generator, "validation_failed")
+            raise AIResponseParseError(f"AI response failed validation: {e.error_count()} error(s): {e.errors()[0]['msg']}")
+
+    parse_metrics.record(generator, method)
+    return data
+
+
+# Send Pydantic-derived response schemas with JSON mode (GEMINI_RESPONSE_SCHEMA=false
+# falls back to plain JSON mode if a model rejects a schema)
+USE_RESPONSE_SCHEMA = os.environ.get("GEMINI_RESPONSE_SCHEMA", "true").lower() == "true"
+
+# JSON schema types -> Gemini Schema types
+_SCHEMA_TYPES = {
+    "object": "OBJECT", "array": "ARRAY", "string": "STRING",
+    "number": "NUMBER", "integer": "INTEGER", "boolean": "BOOLEAN",
+}
+
+
+def _to_gemini_schema(node: Dict[str, Any], defs: Dict[str, Any]) -> Dict[str, Any]:
+    if "$ref" in node:
+        return _to_gemini_schema(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+    if "anyOf" in node:
+        options = [option for option in node["anyOf"] if option.get("type") != "null"]
+        schema = _to_gemini_schema(options[0], defs) if options else {"type": "STRING"}
+        if len(options) < len(node["anyOf"]):
+            schema["nullable"] = True
+        return schema
+
+    schema: Dict[str, Any] = {"type": _SCHEMA_TYPES.get(node.get("type"), "STRING")}
+    if node.get("description"):
+        schema["description"] = node["description"]
+    if schema["type"] == "OBJECT" and node.get("properties"):
+        schema["properties"] = {name: _to_gemini_schema(prop, defs) for name, prop in node["properties"].items()}
+        if node.get("required"):
+            schema["required"] = node["required"]
+    elif schema["type"] == "ARRAY" and "items" in node:
+        schema["items"] = _to_gemini_schema(node["items"], defs)
+    return schema
+
+
+def gemini_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Convert a Pydantic model into the Schema subset Gemini accepts
+
+    The SDK rejects Pydantic's JSON schema as-is (defaults, titles, $defs).
+    """
+    json_schema = model.model_json_schema()
+    return _to_gemini_schema(json_schema, json_schema.get("$defs", {}))
+
+
+def json_generation_config(model: Optional[Type[BaseModel]] = None) -> Dict[str, Any]:
+    """generation_config for JSON response mode, optionally schema constrained"""
+    config: Dict[str, Any] = {"response_mime_type": "application/json"}
+    if model is not None and USE_RESPONSE_SCHEMA:
+        config["response_schema"] = gemini_schema(model)
+    return config
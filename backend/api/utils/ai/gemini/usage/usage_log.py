@@ -0,0 +1,74 @@
+"""
+Gemini Usage Log
+8-Level Nested Architecture: utils/ai/gemini/usage/usage_log.py
+
+One gemini_api_logs document per Gemini call, recorded by the AI executor so
+every generator and career tool is covered without touching its call site.
+Documents are buffered and written in batches (utils/helpers/log_buffer.py);
+server.py binds the collection and starts the flusher.
+
+Document shape:
+    feature, model, response_time (seconds), success, error_message,
+    prompt_tokens, response_tokens, total_tokens, streamed, timestamp
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from api.utils.helpers.log_buffer import BufferedLogWriter
+
+
+def usage_tokens(response: Any) -> Dict[str, Optional[int]]:
+    """Token counts from a response's usage_metadata (None when absent)"""
+    usage = getattr(response, "usage_metadata", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_token_count", None) if usage else None,
+        "response_tokens": getattr(usage, "candidates_token_count", None) if usage else None,
+        "total_tokens": getattr(usage, "total_token_count", None) if usage else None
+    }
+
+
+def model_name(target: Any) -> Optional[str]:
+    """Model name of a GenerativeModel or one of its bound methods"""
+    model = getattr(target, "__self__", target)
+    name = getattr(model, "model_name", None)
+    return name.replace("models/", "", 1) if isinstance(name, str) else None
+
+
+class GeminiUsageLog(BufferedLogWriter):
+    """Buffered writer for gemini_api_logs"""
+
+    def __init__(self):
+        super().__init__(
+            "gemini_api_logs",
+            flush_interval=float(os.environ.get("GEMINI_LOG_FLUSH_SECONDS", 5)),
+            flush_events=int(os.environ.get("GEMINI_LOG_FLUSH_EVENTS", 200)),
+            max_buffer=int(os.environ.get("GEMINI_LOG_MAX_BUFFER", 10000))
+        )
+
+    def record_call(
+        self,
+        feature: str,
+        response_time: float,
+        success: bool,
+        model: Optional[str] = None,
+        response: Any = None,
+        error: Optional[BaseException] = None,
+        streamed: bool = False
+    ):
+        """Buffer the log document for one Gemini call"""
+        self.record({
+            "feature": feature,
+            "model": model,
+            "response_time": round(response_time, 4),
+            "success": success,
+            "error_message": f"{type(error).__name__}: {error}"[:500] if error is not None else None,
+            **usage_tokens(response),
+            "streamed": streamed,
+            "timestamp": datetime.utcnow()
+        })
+
+
+# Shared log written by the AI executor
+gemini_usage_log = GeminiUsageLog()
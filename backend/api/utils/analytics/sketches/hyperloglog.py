@@ -0,0 +1,81 @@
+"""
+HyperLogLog Sketch
+8-Level Nested Architecture: utils/analytics/sketches/hyperloglog.py
+
+Approximate distinct counting in fixed memory: 2^precision one-byte
+registers (4 KB at the default precision of 12, ~1.6% standard error)
+whatever the number of distinct values added.
+
+Sketches merge by taking the register-wise max, which is also what makes
+them cheap to persist: a stored sketch can absorb another with a single
+$max update per changed register, from any number of workers, in any order.
+"""
+
+import hashlib
+import math
+from typing import Dict, Hashable, Iterable
+
+DEFAULT_PRECISION = 12
+
+
+def _hash64(value: Hashable) -> int:
+    return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """Mergeable approximate distinct counter"""
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Hashable) -> bool:
+        """Add a value; returns True if a register changed"""
+        x = _hash64(value)
+        width = 64 - self.precision
+        index = x >> width
+        rank = width - (x & ((1 << width) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def update(self, values: Iterable[Hashable]):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog"):
+        """Absorb another sketch of the same precision"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """Estimated number of distinct values added"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def nonzero_registers(self) -> Dict[str, int]:
+        """Set registers as {"index": rank}, the form stored in MongoDB"""
+        return {str(i): r for i, r in enumerate(self.registers) if r}
+
+    @classmethod
+    def from_registers(cls, registers: Dict[str, int], precision: int = DEFAULT_PRECISION) -> "HyperLogLog":
+        """Rebuild a sketch from nonzero_registers() output"""
+        sketch = cls(precision)
+        for index, rank in registers.items():
+            sketch.registers[int(index)] = rank
+        return sketch
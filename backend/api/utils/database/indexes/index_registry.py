@@ -0,0 +1,120 @@
+"""
+Index Registry
+8-Level Nested Architecture: utils/database/indexes/index_registry.py
+
+Every handler module declares the indexes its queries rely on in a module-level
+INDEXES dict ({collection_name: [IndexModel, ...]}). This module collects those
+declarations, applies them idempotently and reports drift between the declared
+and the live indexes.
+"""
+
+import importlib
+import logging
+from typing import Any, Dict, List
+
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Handler modules that declare an INDEXES dict
+INDEX_MODULES = [
+    "api.routes.admin.jobs.management.crud.operations.handlers.job_handlers",
+    "api.routes.admin.internships.management.crud.operations.handlers.internship_handlers",
+    "api.routes.admin.scholarships.management.crud.operations.handlers.scholarship_handlers",
+    "api.routes.admin.articles.management.crud.operations.handlers.article_handlers",
+    "api.routes.admin.dsa.topics.management.crud.operations.handlers.topic_handlers",
+    "api.routes.admin.dsa.questions.management.crud.operations.handlers.question_handlers",
+    "api.routes.admin.dsa.sheets.management.crud.operations.handlers.sheet_handlers",
+    "api.routes.admin.dsa.companies.management.crud.operations.handlers.company_handlers",
+    "api.routes.admin.roadmaps.management.crud.operations.handlers.roadmap_handlers",
+    "api.routes.auth.management.operations.handlers.auth_handlers",
+    "api.routes.career_tools.management.operations.handlers.career_tools_handlers",
+    "api.routes.admin.analytics.management.crud.operations.handlers.analytics_handlers",
+    "api.routes.admin.analytics.management.crud.operations.handlers.activity_rollups",
+    "api.routes.admin.advanced.management.operations.handlers.advanced_handlers",
+    "api.routes.admin.advanced.management.operations.handlers.push_dispatcher",
+    "api.routes.admin.bulk.management.operations.handlers.bulk_handlers",
+    "api.routes.admin.ai_batch.management.operations.handlers.ai_batch_handlers",
+]
+
+# Index options that make two indexes with the same key pattern different
+COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+
+def get_declared_indexes() -> Dict[str, List[IndexModel]]:
+    """Collect INDEXES declarations from every registered module"""
+    declared: Dict[str, List[IndexModel]] = {}
+    for module_path in INDEX_MODULES:
+        module = importlib.import_module(module_path)
+        for collection_name, indexes in getattr(module, "INDEXES", {}).items():
+            declared.setdefault(collection_name, []).extend(indexes)
+    return declared
+
+
+def _normalize_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce an index spec to the parts that matter for comparison"""
+    key = spec["key"]
+    key = list(key.items()) if hasattr(key, "items") else list(key)
+    normalized = {"key": [(field, direction) for field, direction in key]}
+    for option in COMPARED_OPTIONS:
+        if spec.get(option) not in (None, False):
+            normalized[option] = spec[option]
+    return normalized
+
+
+async def ensure_indexes(db) -> Dict[str, Any]:
+    """
+    Create every declared index (no-op for indexes that already exist)
+
+    Returns:
+        Per-collection list of created index names and any errors
+    """
+    results: Dict[str, Any] = {}
+    for collection_name, indexes in get_declared_indexes().items():
+        try:
+            names = await db[collection_name].create_indexes(indexes)
+            results[collection_name] = {"indexes": names}
+        except OperationFailure as e:
+            # e.g. a unique index over existing duplicates, or a conflicting
+            # index with the same name; keep going with the other collections
+            logger.error(f"Failed to create indexes on {collection_name}: {e}")
+            results[collection_name] = {"error": str(e)}
+    return results
+
+
+async def get_index_drift(db) -> Dict[str, Any]:
+    """
+    Compare declared indexes with the live ones
+
+    Returns:
+        Per-collection missing, mismatched and undeclared ("extra") indexes
+    """
+    report: Dict[str, Any] = {}
+    existing_collections = set(await db.list_collection_names())
+
+    for collection_name, indexes in get_declared_indexes().items():
+        live = {}
+        if collection_name in existing_collections:
+            live = await db[collection_name].index_information()
+        live.pop("_id_", None)
+
+        missing, mismatched = [], []
+        for index in indexes:
+            declared = _normalize_spec(index.document)
+            name = index.document["name"]
+            if name not in live:
+                missing.append(name)
+                continue
+            actual = _normalize_spec(live.pop(name))
+            if actual != declared:
+                mismatched.append({"name": name, "declared": declared, "live": actual})
+
+        report[collection_name] = {
+            "missing": missing,
+            "mismatched": mismatched,
+            "extra": sorted(live),
+            "in_sync": not (missing or mismatched or live)
+        }
+
+    return report
@@ -0,0 +1,151 @@
+"""
+List Total Count Cache
+Caches count_documents results per (collection, normalized filter) so browse
+pages do not pay for a full count on every request.
+
+Count modes accepted by list endpoints:
+    exact      - always run count_documents (result is cached for later reads)
+    estimated  - serve a cached count while fresh; unfiltered totals come from
+                 collection metadata (estimated_document_count)
+    none       - skip the total entirely (returns None)
+
+Handlers call invalidate(collection_name) after writes so cached totals do not
+outlive the data in this process; the TTL bounds staleness from writes made
+by other workers.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from bson import json_util
+
+COUNT_MODES = ("exact", "estimated", "none")
+
+
+class CountCache:
+    """TTL + LRU cache of count_documents results"""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: int = 2000):
+        self.ttl = ttl if ttl is not None else float(os.environ.get("COUNT_CACHE_TTL_SECONDS", 30))
+        self.max_entries = max_entries
+        self._entries: Dict[str, "OrderedDict[str, Tuple[int, float]]"] = {}
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._generations: Dict[str, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @staticmethod
+    def _key(filter_query: Dict[str, Any]) -> str:
+        """Normalize a filter so equivalent queries share an entry"""
+        return json_util.dumps(filter_query, sort_keys=True)
+
+    def _get(self, collection_name: str, key: str) -> Optional[int]:
+        entries = self._entries.get(collection_name)
+        if not entries or key not in entries:
+            return None
+        count, expires_at = entries[key]
+        if expires_at < time.monotonic():
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+        return count
+
+    def _set(self, collection_name: str, key: str, count: int, generation: int):
+        # A write landed while this count was running; the result may be stale
+        if self._generations.get(collection_name, 0) != generation:
+            return
+        entries = self._entries.setdefault(collection_name, OrderedDict())
+        entries[key] = (count, time.monotonic() + self.ttl)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    async def _count_once(self, collection, key: str, filter_query: Dict[str, Any]) -> int:
+        """Run one count per (collection, filter) even under concurrent misses"""
+        flight_key = (collection.name, key)
+        future = self._in_flight.get(flight_key)
+        if future is not None:
+            # wait() leaves the outcome on the future: only this caller's own
+            # cancellation raises here
+            await asyncio.wait([future])
+            if not future.cancelled():
+                return future.result()
+            # The caller counting was cancelled; count here instead
+            return await self._count_once(collection, key, filter_query)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[flight_key] = future
+        generation = self._generations.get(collection.name, 0)
+        try:
+            if filter_query:
+                count = await collection.count_documents(filter_query)
+            else:
+                count = await collection.estimated_document_count()
+            self._set(collection.name, key, count, generation)
+            future.set_result(count)
+            return count
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged as a warning
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(flight_key, None)
+
+    async def count(
+        self,
+        collection,
+        filter_query: Dict[str, Any],
+        mode: str = "exact",
+        cursor: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Get the total for a list response
+
+        Continuation pages (cursor set) never pay for an exact recount; they
+        get the cached estimate instead.
+        """
+        if mode == "none":
+            return None
+        if mode == "exact" and cursor:
+            mode = "estimated"
+
+        key = self._key(filter_query)
+        if mode == "estimated":
+            cached = self._get(collection.name, key)
+            if cached is not None:
+                self._stats["hits"] += 1
+                return cached
+            self._stats["misses"] += 1
+            return await self._count_once(collection, key, filter_query)
+
+        self._stats["misses"] += 1
+        generation = self._generations.get(collection.name, 0)
+        count = await collection.count_documents(filter_query)
+        self._set(collection.name, key, count, generation)
+        return count
+
+    def invalidate(self, collection_name: str):
+        """Drop every cached total for a collection after a write"""
+        self._generations[collection_name] = self._generations.get(collection_name, 0) + 1
+        self._entries.pop(collection_name, None)
+        self._stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss metrics"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": sum(len(entries) for entries in self._entries.values()),
+            "ttl_seconds": self.ttl
+        }
+
+
+# Shared cache used by every list handler
+count_cache = CountCache()
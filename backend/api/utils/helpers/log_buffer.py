@@ -0,0 +1,149 @@
+"""
+Buffered Log Writer
+Collects log documents in memory and writes them with one insert_many per
+flush, instead of an insert_one on the request path.
+
+Documents are flushed every flush_interval seconds, or as soon as
+flush_events have accumulated, and once more on shutdown. The buffer is a
+bounded ring: if the database is unavailable for long enough that max_buffer
+documents pile up, the oldest are dropped (and counted) rather than growing
+memory without limit. A failed flush puts the documents that were not
+written back at the front; after a partial BulkWriteError those are only the
+ones listed in writeErrors (duplicate keys excepted: those already exist,
+e.g. from a retried insert that had reached the server).
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+class BufferedLogWriter:
+    """Write-behind buffer for append-only log collections"""
+
+    def __init__(self, name: str, flush_interval: float = 5, flush_events: int = 500, max_buffer: int = 10000):
+        self.name = name
+        self.flush_interval = flush_interval
+        self.flush_events = flush_events
+        self.max_buffer = max_buffer
+        self._collection = None
+        self._buffer: deque = deque(maxlen=max_buffer)
+        self._oldest_pending_at: Optional[float] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._event_flush: Optional[asyncio.Task] = None
+        self._stats = {
+            "recorded": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "flushed_documents": 0,
+            "flush_failures": 0,
+            "last_flush_ms": None
+        }
+
+    def bind(self, collection):
+        """Set the collection flushes write to"""
+        self._collection = collection
+
+    def record(self, document: Dict[str, Any]):
+        """Buffer a document; never touches the database"""
+        if len(self._buffer) == self.max_buffer:
+            self._stats["dropped"] += 1
+        self._buffer.append(document)
+        self._stats["recorded"] += 1
+        if self._oldest_pending_at is None:
+            self._oldest_pending_at = time.monotonic()
+
+        if len(self._buffer) >= self.flush_events and self._event_flush is None:
+            try:
+                self._event_flush = asyncio.get_running_loop().create_task(self._flush_on_threshold())
+            except RuntimeError:
+                pass
+
+    async def _flush_on_threshold(self):
+        try:
+            await self.flush()
+        finally:
+            self._event_flush = None
+
+    def _requeue(self, batch: List[Dict[str, Any]], oldest: Optional[float]):
+        """Retry with the next flush, ahead of anything recorded since"""
+        room = self.max_buffer - len(self._buffer)
+        if room < len(batch):
+            self._stats["dropped"] += len(batch) - room
+            batch = batch[len(batch) - room:] if room else []
+        self._buffer.extendleft(reversed(batch))
+        if self._buffer:
+            self._oldest_pending_at = oldest or time.monotonic()
+
+    async def flush(self) -> int:
+        """Write every buffered document; returns the number written"""
+        async with self._flush_lock:
+            if not self._buffer or self._collection is None:
+                return 0
+
+            batch = list(self._buffer)
+            self._buffer.clear()
+            oldest, self._oldest_pending_at = self._oldest_pending_at, None
+            started = time.monotonic()
+            try:
+                await self._collection.insert_many(batch, ordered=False)
+            except BulkWriteError as e:
+                # Unordered: everything without a write error was inserted
+                errors = e.details.get("writeErrors", [])
+                failed = [batch[error["index"]] for error in errors if error.get("code") != DUPLICATE_KEY]
+                self._stats["flush_failures"] += 1
+                logger.error(f"Failed to flush {len(errors)} of {len(batch)} {self.name} documents: {e}")
+                self._requeue(failed, oldest)
+                written = len(batch) - len(errors)
+                self._stats["flushed_documents"] += written
+                return written
+            except Exception as e:
+                self._stats["flush_failures"] += 1
+                logger.error(f"Failed to flush {len(batch)} {self.name} documents: {e}")
+                self._requeue(batch, oldest)
+                return 0
+
+            self._stats["flushes"] += 1
+            self._stats["flushed_documents"] += len(batch)
+            self._stats["last_flush_ms"] = round((time.monotonic() - started) * 1000, 2)
+            return len(batch)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"{self.name} log flush failed: {e}")
+
+    def start(self):
+        """Start the periodic flusher"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def stop(self):
+        """Stop the periodic flusher and write everything still buffered"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer depth, flush lag and flush metrics"""
+        return {
+            **self._stats,
+            "pending": len(self._buffer),
+            "lag_seconds": round(time.monotonic() - self._oldest_pending_at, 2) if self._oldest_pending_at is not None else 0.0,
+            "flush_interval_seconds": self.flush_interval,
+            "flush_events": self.flush_events,
+            "max_buffer": self.max_buffer
+        }
@@ -0,0 +1,125 @@
+"""
+Keyset (Cursor) Pagination Helper
+Pages through a collection by (sort field, _id) instead of skip/limit so deep
+pages cost the same as the first one.
+"""
+
+import base64
+import json
+from functools import reduce
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+from fastapi import HTTPException
+
+
+class InvalidCursor(HTTPException):
+    """Raised for malformed cursors or cursors from a different sort"""
+
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(status_code=400, detail=detail)
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Encode a cursor payload as an opaque URL-safe string"""
+    raw = json_util.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json_util.loads(raw)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise InvalidCursor()
+    if not isinstance(payload, dict):
+        raise InvalidCursor()
+    return payload
+
+
+def _get_field(doc: Dict[str, Any], field: str) -> Any:
+    """Read a (possibly dotted) field from a document"""
+    return reduce(lambda value, key: value.get(key) if isinstance(value, dict) else None, field.split("."), doc)
+
+
+def _keyset_condition(sort_by: str, sort_order: int, value: Any, last_id: Any) -> Dict[str, Any]:
+    """Build the filter selecting documents strictly after (value, last_id)"""
+    after = "$gt" if sort_order == 1 else "$lt"
+    if sort_by == "_id":
+        return {"_id": {after: last_id}}
+
+    ties = {sort_by: value, "_id": {after: last_id}}
+
+    # Missing/null values sort before everything else, and $gt/$lt never match
+    # across types, so the null bucket needs explicit handling
+    if value is None:
+        if sort_order == 1:
+            return {"$or": [ties, {sort_by: {"$ne": None}}]}
+        return ties
+    if sort_order == 1:
+        return {"$or": [{sort_by: {after: value}}, ties]}
+    return {"$or": [{sort_by: {after: value}}, ties, {sort_by: None}]}
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Cursor for relevance-ranked results, which have no stable sort key"""
+    return encode_cursor({"offset": offset})
+
+
+def decode_offset_cursor(cursor: Optional[str], skip: int = 0) -> int:
+    """Resolve the offset for a relevance-ranked page"""
+    if not cursor:
+        return skip
+    offset = decode_cursor(cursor).get("offset")
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursor()
+    return offset
+
+
+async def fetch_page(
+    collection,
+    filter_query: Dict[str, Any],
+    sort_by: str = "created_at",
+    sort_order: int = -1,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    projection: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page sorted by (sort_by, _id)
+
+    When a cursor is given, skip is ignored and the page starts right after
+    the document the cursor points at. Without a cursor, skip/limit work as
+    before, so existing clients are unaffected.
+
+    Returns:
+        (documents, next_cursor) where next_cursor is None on the last page
+    """
+    sort_order = 1 if sort_order == 1 else -1
+    sort = [("_id", sort_order)] if sort_by == "_id" else [(sort_by, sort_order), ("_id", sort_order)]
+
+    query = filter_query
+    if cursor:
+        position = decode_cursor(cursor)
+        if position.get("s") != sort_by or position.get("o") != sort_order or "id" not in position:
+            raise InvalidCursor("Cursor does not match the requested sort")
+        keyset = _keyset_condition(sort_by, sort_order, position.get("v"), position["id"])
+        query = {"$and": [filter_query, keyset]} if filter_query else keyset
+        skip = 0
+
+    docs = await collection.find(query, projection).sort(sort).skip(skip).limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        next_cursor = encode_cursor({
+            "s": sort_by,
+            "o": sort_order,
+            "v": _get_field(last, sort_by),
+            "id": last["_id"]
+        })
+
+    return docs, next_cursor
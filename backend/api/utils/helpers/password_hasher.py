@@ -0,0 +1,134 @@
+"""
+Password Hasher
+Runs bcrypt hashing and verification on a dedicated thread pool so a burst of
+logins does not stall the event loop. bcrypt releases the GIL while it works,
+so the pool scales across cores.
+
+At most max_concurrent operations are admitted (running or queued for a
+worker); callers that cannot get a slot within queue_timeout are rejected
+with 503 instead of piling up behind the pool.
+
+Cost is configured with BCRYPT_ROUNDS. Hashes made with any other cost are
+reported by verify_and_update() so login can transparently rehash them.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 12))
+
+# Hashes outside [min_rounds, max_rounds] need an update, so pinning both to
+# the configured cost upgrades (or downgrades) old hashes on the next login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+
+
+class PasswordHasherBusy(HTTPException):
+    """Raised when no hashing slot frees up within the queue timeout"""
+
+    def __init__(self):
+        super().__init__(
+            status_code=503,
+            detail="Authentication is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+
+
+class PasswordHasher:
+    """bcrypt on a bounded worker pool"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_concurrent: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        context: CryptContext = pwd_context
+    ):
+        self.max_workers = max_workers or int(os.environ.get("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+        self.max_concurrent = max_concurrent or int(
+            os.environ.get("PASSWORD_HASH_MAX_CONCURRENT", self.max_workers * 4)
+        )
+        self.queue_timeout = queue_timeout if queue_timeout is not None else float(
+            os.environ.get("PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", 5)
+        )
+        self.context = context
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._stats = {
+            "hashes": 0,
+            "verifications": 0,
+            "rehashes": 0,
+            "rejected": 0,
+            "in_flight": 0,
+            "total_ms": 0.0
+        }
+
+    async def _run(self, func, *args) -> Any:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._stats["rejected"] += 1
+            raise PasswordHasherBusy()
+
+        self._stats["in_flight"] += 1
+        started = time.monotonic()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._stats["in_flight"] -= 1
+            self._stats["total_ms"] += (time.monotonic() - started) * 1000
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost"""
+        self._stats["hashes"] += 1
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        """Verify a password against its hash"""
+        self._stats["verifications"] += 1
+        return await self._run(self.context.verify, password, password_hash)
+
+    async def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and rehash it if the stored cost is outdated
+
+        Returns:
+            (valid, new_hash) where new_hash is None unless it should be stored
+        """
+        self._stats["verifications"] += 1
+        valid, new_hash = await self._run(self.context.verify_and_update, password, password_hash)
+        if new_hash:
+            self._stats["rehashes"] += 1
+        return valid, new_hash
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage metrics"""
+        operations = self._stats["hashes"] + self._stats["verifications"]
+        return {
+            **{k: v for k, v in self._stats.items() if k != "total_ms"},
+            "avg_ms": round(self._stats["total_ms"] / operations, 2) if operations else 0.0,
+            "rounds": BCRYPT_ROUNDS,
+            "max_workers": self.max_workers,
+            "max_concurrent": self.max_concurrent,
+            "queue_timeout_seconds": self.queue_timeout
+        }
+
+
+# Shared hasher used by the auth handlers
+password_hasher = PasswordHasher()
@@ -0,0 +1,89 @@
+"""
+Authenticated Principal Cache
+Caches the user document resolved from a bearer token so authenticated
+requests skip the admin_users/app_users lookup.
+
+Entries are keyed by a SHA-256 of the token (raw tokens are never stored) and
+live for at most ttl seconds, and never past the token's own exp. Handlers
+call invalidate_user() when an account changes (status toggle, delete,
+password change, profile/role update) so this process stops serving the old
+principal immediately; the TTL bounds staleness from changes made by other
+workers.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+
+class PrincipalCache:
+    """TTL + LRU cache of token -> principal"""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: int = 10000):
+        self.ttl = ttl if ttl is not None else float(os.environ.get("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", 60))
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float, Tuple[str, str]]]" = OrderedDict()
+        self._by_user: Dict[Tuple[str, str], Set[str]] = {}
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        tokens = self._by_user.get(entry[2])
+        if tokens is not None:
+            tokens.discard(key)
+            if not tokens:
+                del self._by_user[entry[2]]
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of the cached principal for a token"""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.time():
+            if entry is not None:
+                self._drop(key)
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        # Callers may mutate the principal; never hand out the cached dict
+        return dict(entry[0])
+
+    def set(self, token: str, principal: Dict[str, Any], expires_at: Optional[float] = None):
+        """Cache a principal until min(now + ttl, token exp)"""
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        if deadline <= time.time():
+            return
+
+        key = self._key(token)
+        self._drop(key)
+        user_key = (principal.get("user_type", ""), principal.get("id", ""))
+        self._entries[key] = (dict(principal), deadline, user_key)
+        self._by_user.setdefault(user_key, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate_user(self, user_type: str, user_id: str):
+        """Drop every cached token of one account"""
+        for key in list(self._by_user.get((user_type, str(user_id)), ())):
+            self._drop(key)
+        self._stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss metrics"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl
+        }
@@ -0,0 +1,125 @@
+"""
+Prompt Template Cache
+Keeps admin-managed prompt templates in memory, precompiled, so building a
+prompt is pure string substitution with no database round trip.
+
+Templates are loaded at startup and reloaded after every local create, update
+or delete. Each write also bumps a version document in cache_versions; other
+workers poll that single document (by _id) and reload when it changes. Version
+polling is used instead of change streams because it also works on a
+standalone mongod.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledTemplate:
+    """A str.format template parsed once into literal and field segments"""
+
+    def __init__(self, text: str):
+        self.text = text
+        # Content address of the template, used in AI response cache keys
+        self.digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        self._segments: List[Tuple[str, Optional[str]]] = []
+        self._simple = True
+        for literal, field_name, format_spec, conversion in Formatter().parse(text):
+            if field_name is not None and (format_spec or conversion or not field_name.isidentifier()):
+                # Attribute/index access or format specs: leave it to str.format
+                self._simple = False
+            self._segments.append((literal, field_name))
+
+    def format(self, **values: Any) -> str:
+        """Substitute values; same result (and KeyError on a missing field) as str.format"""
+        if not self._simple:
+            return self.text.format(**values)
+        parts = []
+        for literal, field_name in self._segments:
+            parts.append(literal)
+            if field_name is not None:
+                parts.append(str(values[field_name]))
+        return "".join(parts)
+
+
+class PromptTemplateCache:
+    """In-memory, version-polled copy of a prompt template collection"""
+
+    def __init__(self, collection, defaults: Dict[str, str], poll_interval: Optional[float] = None):
+        self.collection = collection
+        self.versions = collection.database["cache_versions"]
+        self.poll_interval = poll_interval if poll_interval is not None else float(
+            os.environ.get("PROMPT_TEMPLATE_POLL_SECONDS", 30)
+        )
+        self._defaults = {tool_type: CompiledTemplate(text) for tool_type, text in defaults.items()}
+        self._templates: Optional[Dict[str, CompiledTemplate]] = None
+        self._version: Optional[int] = None
+        self._load_lock = asyncio.Lock()
+        self._poller: Optional[asyncio.Task] = None
+        self._stats = {"hits": 0, "loads": 0, "remote_reloads": 0, "last_load_ms": None}
+
+    async def _read_version(self) -> int:
+        doc = await self.versions.find_one({"_id": self.collection.name})
+        return doc.get("version", 0) if doc else 0
+
+    async def load(self):
+        """(Re)load every active template from the database"""
+        async with self._load_lock:
+            started = time.monotonic()
+            version = await self._read_version()
+            templates: Dict[str, CompiledTemplate] = {}
+            async for doc in self.collection.find({"is_active": True}, {"tool_type": 1, "prompt_template": 1}):
+                # First active template per tool wins, as with the old find_one
+                if doc.get("tool_type") and doc.get("prompt_template") and doc["tool_type"] not in templates:
+                    templates[doc["tool_type"]] = CompiledTemplate(doc["prompt_template"])
+            self._templates = templates
+            self._version = version
+            self._stats["loads"] += 1
+            self._stats["last_load_ms"] = round((time.monotonic() - started) * 1000, 2)
+
+    async def get(self, tool_type: str) -> Optional[CompiledTemplate]:
+        """Get the active template for a tool, falling back to the built-in default"""
+        if self._templates is None:
+            await self.load()
+        self._stats["hits"] += 1
+        return self._templates.get(tool_type) or self._defaults.get(tool_type)
+
+    async def invalidate(self):
+        """Reload after a local write and signal other workers to do the same"""
+        await self.versions.update_one({"_id": self.collection.name}, {"$inc": {"version": 1}}, upsert=True)
+        await self.load()
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if await self._read_version() != self._version:
+                    self._stats["remote_reloads"] += 1
+                    await self.load()
+            except Exception as e:
+                logger.warning(f"Prompt template version poll failed: {e}")
+
+    def start(self):
+        """Start polling for changes made by other workers"""
+        if self._poller is None and self.poll_interval > 0:
+            self._poller = asyncio.get_running_loop().create_task(self._poll())
+
+    def stop(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache contents and reload metrics"""
+        return {
+            **self._stats,
+            "version": self._version,
+            "custom_templates": sorted(self._templates) if self._templates is not None else None,
+            "poll_interval_seconds": self.poll_interval
+        }
@@ -0,0 +1,190 @@
+"""
+Materialized Snapshot Cache
+Holds a precomputed read model in memory and serves it with
+stale-while-revalidate semantics: once the first snapshot is loaded, reads
+never wait on the database.
+
+A snapshot is rebuilt in the background when:
+    - a writer calls mark_dirty() (rebuilds are debounced so a burst of
+      writes costs one rebuild)
+    - it is older than max_age when it is read
+    - the periodic refresher started with start() fires
+
+The builder is bound by the handler that owns the queries, so write
+handlers only need the shared instance to mark it dirty.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+Builder = Callable[[], Awaitable[Any]]
+
+
+class SnapshotCache:
+    """In-memory materialized view with background rebuilds"""
+
+    def __init__(self, name: str, max_age: float = 60, debounce: float = 2):
+        self.name = name
+        self.max_age = max_age
+        self.debounce = debounce
+        self._build: Optional[Builder] = None
+        self._load: Optional[Builder] = None
+        self._value: Any = None
+        self._built_at: Optional[float] = None
+        self._dirty = False
+        self._cold_load: Optional[asyncio.Task] = None
+        self._rebuild: Optional[asyncio.Task] = None
+        self._refresher: Optional[asyncio.Task] = None
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "cold_loads": 0,
+            "rebuilds": 0,
+            "rebuild_failures": 0,
+            "dirty_marks": 0,
+            "last_rebuild_ms": None
+        }
+
+    def bind(self, build: Builder, load: Optional[Builder] = None):
+        """
+        Attach the snapshot builder
+
+        Args:
+            build: Recomputes the snapshot from the source collections
+            load: Optional cheap read of a persisted snapshot, used on a cold
+                  start before the first rebuild finishes
+        """
+        self._build = build
+        self._load = load
+
+    def _is_stale(self) -> bool:
+        return self._dirty or self._built_at is None or time.monotonic() - self._built_at > self.max_age
+
+    async def _run_build(self):
+        started = time.monotonic()
+        # Writes that land while the build runs mark the snapshot dirty again
+        self._dirty = False
+        try:
+            value = await self._build()
+        except Exception as e:
+            self._dirty = True
+            self._stats["rebuild_failures"] += 1
+            logger.error(f"Failed to rebuild {self.name} snapshot: {e}")
+            raise
+        self._value = value
+        self._built_at = time.monotonic()
+        self._stats["rebuilds"] += 1
+        self._stats["last_rebuild_ms"] = round((self._built_at - started) * 1000, 2)
+
+    async def _rebuild_in_background(self, delay: float = 0):
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            await self._run_build()
+        except Exception:
+            pass  # already logged; the stale snapshot keeps being served
+        finally:
+            self._rebuild = None
+
+    def _schedule_rebuild(self, delay: float = 0):
+        if self._build is None or self._rebuild is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._rebuild = loop.create_task(self._rebuild_in_background(delay))
+
+    async def _load_cold(self):
+        self._stats["cold_loads"] += 1
+        if self._load is not None:
+            try:
+                value = await self._load()
+            except Exception as e:
+                logger.warning(f"Failed to load persisted {self.name} snapshot: {e}")
+                value = None
+            if value is not None:
+                # Persisted snapshots may be old; refresh right after serving
+                self._value = value
+                self._dirty = True
+                return
+        await self._run_build()
+
+    async def get(self) -> Any:
+        """Get the current snapshot, scheduling a rebuild if it is stale"""
+        if self._value is None:
+            if self._build is None:
+                raise RuntimeError(f"{self.name} snapshot has no builder bound")
+            if self._cold_load is None:
+                self._cold_load = asyncio.ensure_future(self._load_cold())
+            try:
+                await asyncio.shield(self._cold_load)
+            finally:
+                if self._cold_load is not None and self._cold_load.done():
+                    self._cold_load = None
+
+        if self._is_stale():
+            self._stats["stale_hits"] += 1
+            self._schedule_rebuild()
+        else:
+            self._stats["hits"] += 1
+        return self._value
+
+    def mark_dirty(self):
+        """Flag the snapshot as out of date after a write to a source collection"""
+        self._dirty = True
+        self._stats["dirty_marks"] += 1
+        if self._value is not None:
+            self._schedule_rebuild(self.debounce)
+
+    async def refresh(self) -> Any:
+        """Rebuild now and return the new snapshot"""
+        await self._run_build()
+        return self._value
+
+    async def _refresh_periodically(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            if self._rebuild is None:
+                try:
+                    await self._run_build()
+                except Exception:
+                    pass
+
+    def start(self, interval: Optional[float] = None):
+        """Start rebuilding on a fixed schedule (defaults to max_age)"""
+        if self._refresher is None and self._build is not None:
+            self._refresher = asyncio.get_running_loop().create_task(
+                self._refresh_periodically(interval or self.max_age)
+            )
+
+    def stop(self):
+        """Cancel the periodic refresher and any pending rebuild"""
+        for task in (self._refresher, self._rebuild):
+            if task is not None:
+                task.cancel()
+        self._refresher = None
+        self._rebuild = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get snapshot freshness and rebuild metrics"""
+        return {
+            **self._stats,
+            "loaded": self._value is not None,
+            "dirty": self._dirty,
+            "age_seconds": round(time.monotonic() - self._built_at, 2) if self._built_at is not None else None,
+            "max_age_seconds": self.max_age
+        }
+
+
+# Landing page of the public DSA section; rebuilt on topic, question, sheet
+# and company writes
+dsa_dashboard_snapshot = SnapshotCache(
+    "dsa_dashboard",
+    max_age=float(os.environ.get("DSA_DASHBOARD_MAX_AGE_SECONDS", 60))
+)
@@ -0,0 +1,40 @@
+"""
+Server-Sent Events Helper
+Turns an async iterator of {"event": name, "data": payload} dicts into a
+text/event-stream response.
+
+Event names used by the AI streaming endpoints:
+    delta  - {"text": "..."} a piece of generated text
+    done   - the same payload the non-streaming endpoint returns
+    error  - {"success": False, "error": "..."}
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """Encode one SSE frame (data is JSON-encoded onto a single line)"""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data, default=str, ensure_ascii=False)}\n\n"
+
+
+async def _encode(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    # Padding comment so proxies that buffer small responses flush right away
+    yield ": stream\n\n"
+    try:
+        async for event in events:
+            yield format_sse(event.get("data"), event.get("event"))
+    except Exception as e:
+        yield format_sse({"success": False, "error": str(e)}, "error")
+
+
+def sse_response(events: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """Stream events to the client as they are produced"""
+    return StreamingResponse(
+        _encode(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,83 @@
+"""
+Admin Stats Cache
+Keeps the result of each admin stats aggregation for a few seconds, so a
+dashboard that polls several stats endpoints (or several admins watching it)
+costs one aggregation per window instead of one per request.
+
+Concurrent misses for the same key share one computation. Staleness is
+bounded by the TTL (STATS_CACHE_TTL_SECONDS, default 5).
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class StatsCache:
+    """Short-TTL, single-flight cache of computed stats"""
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl if ttl is not None else float(os.environ.get("STATS_CACHE_TTL_SECONDS", 5))
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._stats = {"hits": 0, "misses": 0}
+
+    async def get(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, computing it on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._stats["hits"] += 1
+            return entry[0]
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self._stats["hits"] += 1
+            # wait() leaves the outcome on the future: only this caller's own
+            # cancellation raises here
+            await asyncio.wait([future])
+            if not future.cancelled():
+                return future.result()
+            # The caller computing it was cancelled; compute it here instead
+            return await self.get(key, compute)
+
+        self._stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await compute()
+            if self.ttl > 0:
+                self._entries[key] = (value, time.monotonic() + self.ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged as a warning
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one cached value, or all of them"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss metrics"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl
+        }
+
+
+# Shared cache for the admin stats endpoints
+stats_cache = StatsCache()
@@ -0,0 +1,160 @@
+"""
+Write-Behind View Counter
+Aggregates page-view increments in memory and applies them with one
+bulk_write per collection, instead of an $inc update_one on every read.
+
+Pending increments are flushed every flush_interval seconds, or as soon as
+max_pending_events views have accumulated, and once more on shutdown. If a
+flush fails the increments that were not applied are merged back so they go
+out with the next one (after a partial BulkWriteError, only the failed ops).
+A hard crash loses at most one flush window of views.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounterBuffer:
+    """Buffers $inc updates per (collection, field, _id)"""
+
+    def __init__(self, flush_interval: Optional[float] = None, max_pending_events: Optional[int] = None):
+        self.flush_interval = flush_interval if flush_interval is not None else float(
+            os.environ.get("VIEW_COUNTER_FLUSH_SECONDS", 5)
+        )
+        self.max_pending_events = max_pending_events if max_pending_events is not None else int(
+            os.environ.get("VIEW_COUNTER_FLUSH_EVENTS", 1000)
+        )
+        self._collections: Dict[str, Any] = {}
+        self._pending: Dict[Tuple[str, str], Counter] = {}
+        self._pending_events = 0
+        self._oldest_pending_at: Optional[float] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._event_flush: Optional[asyncio.Task] = None
+        self._stats = {
+            "recorded": 0,
+            "flushes": 0,
+            "flushed_events": 0,
+            "flushed_documents": 0,
+            "flush_failures": 0,
+            "last_flush_ms": None
+        }
+
+    def record(self, collection, doc_id: Any, field: str = "views_count", amount: int = 1):
+        """Buffer an increment; never touches the database"""
+        self._collections[collection.name] = collection
+        self._pending.setdefault((collection.name, field), Counter())[doc_id] += amount
+        self._pending_events += amount
+        self._stats["recorded"] += amount
+        if self._oldest_pending_at is None:
+            self._oldest_pending_at = time.monotonic()
+
+        if self._pending_events >= self.max_pending_events and self._event_flush is None:
+            try:
+                self._event_flush = asyncio.get_running_loop().create_task(self._flush_on_threshold())
+            except RuntimeError:
+                pass
+
+    def pending(self, collection, doc_id: Any, field: str = "views_count") -> int:
+        """Increments for a document that have not been written yet"""
+        counts = self._pending.get((collection.name, field))
+        return counts.get(doc_id, 0) if counts else 0
+
+    async def _flush_on_threshold(self):
+        try:
+            await self.flush()
+        finally:
+            self._event_flush = None
+
+    async def flush(self) -> int:
+        """Write every pending increment; returns the number of views flushed"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            pending, self._pending = self._pending, {}
+            events, self._pending_events = self._pending_events, 0
+            oldest, self._oldest_pending_at = self._oldest_pending_at, None
+            started = time.monotonic()
+
+            # collection -> [((collection, field), doc_id, count)], in op order
+            increments: Dict[str, list] = {}
+            for key, counts in pending.items():
+                increments.setdefault(key[0], []).extend((key, doc_id, count) for doc_id, count in counts.items())
+
+            failed = []
+            for collection_name, entries in increments.items():
+                ops = [UpdateOne({"_id": doc_id}, {"$inc": {key[1]: count}}) for key, doc_id, count in entries]
+                try:
+                    await self._collections[collection_name].bulk_write(ops, ordered=False)
+                    self._stats["flushed_documents"] += len(ops)
+                except BulkWriteError as e:
+                    # Unordered: every op without a write error was applied
+                    # and must not be retried
+                    errors = e.details.get("writeErrors", [])
+                    self._stats["flush_failures"] += 1
+                    self._stats["flushed_documents"] += len(ops) - len(errors)
+                    logger.error(f"Failed to flush {len(errors)} of {len(ops)} view counters for {collection_name}: {e}")
+                    failed.extend(entries[error["index"]] for error in errors)
+                except Exception as e:
+                    self._stats["flush_failures"] += 1
+                    logger.error(f"Failed to flush view counters for {collection_name}: {e}")
+                    failed.extend(entries)
+
+            if failed:
+                # Put the increments back so the next flush retries them
+                for key, doc_id, count in failed:
+                    self._pending.setdefault(key, Counter())[doc_id] += count
+                    self._pending_events += count
+                    events -= count
+                if oldest is not None:
+                    self._oldest_pending_at = min(oldest, self._oldest_pending_at or oldest)
+
+            self._stats["flushes"] += 1
+            self._stats["flushed_events"] += events
+            self._stats["last_flush_ms"] = round((time.monotonic() - started) * 1000, 2)
+            return events
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"View counter flush failed: {e}")
+
+    def start(self):
+        """Start the periodic flusher"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def stop(self):
+        """Stop the periodic flusher and write everything still buffered"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer depth, flush lag and flush metrics"""
+        return {
+            **self._stats,
+            "pending_events": self._pending_events,
+            "pending_documents": sum(len(counts) for counts in self._pending.values()),
+            "lag_seconds": round(time.monotonic() - self._oldest_pending_at, 2) if self._oldest_pending_at is not None else 0.0,
+            "flush_interval_seconds": self.flush_interval,
+            "max_pending_events": self.max_pending_events
+        }
+
+
+# Shared buffer for article and roadmap page views
+view_counter = ViewCounterBuffer()
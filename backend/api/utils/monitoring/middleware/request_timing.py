@@ -0,0 +1,76 @@
+"""
+Request Timing Middleware
+8-Level Nested Architecture: utils/monitoring/middleware/request_timing.py
+
+Pure ASGI middleware that records one api_usage_logs document per HTTP
+request: route template, method, status, latency and the authenticated user.
+It is added around the whole app in server.py.
+
+Recording never waits on the database. Documents go into a bounded ring
+buffer (utils/helpers/log_buffer.py) that a background task drains with
+insert_many. When the database falls behind, the buffer drops its oldest
+entries instead of slowing requests down.
+
+The route template (e.g. /api/admin/jobs/{job_id}) is read from the matched
+route after the app has handled the request, so log cardinality does not grow
+with ids. Requests that match no route are logged as "unmatched". The auth
+dependency puts the user id on request.state.
+"""
+
+import os
+import time
+from datetime import datetime
+
+from api.utils.helpers.log_buffer import BufferedLogWriter
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestTimingMiddleware:
+    """Times every HTTP request and buffers an api_usage_logs entry for it"""
+
+    def __init__(self, app, log: BufferedLogWriter):
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        error_message = None
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            error_message = f"{type(e).__name__}: {e}"[:500]
+            raise
+        finally:
+            route = scope.get("route")
+            state = scope.get("state") or {}
+            self.log.record({
+                "endpoint": getattr(route, "path", None) or UNMATCHED_ROUTE,
+                "method": scope["method"],
+                "user_id": state.get("user_id"),
+                "status_code": status_code,
+                "response_time": round(time.perf_counter() - started, 5),
+                "error_message": error_message,
+                "timestamp": datetime.utcnow()
+            })
+
+
+# Shared buffer drained into api_usage_logs; server.py binds the collection
+api_usage_log = BufferedLogWriter(
+    "api_usage_logs",
+    flush_interval=float(os.environ.get("API_LOG_FLUSH_SECONDS", 2)),
+    flush_events=int(os.environ.get("API_LOG_FLUSH_EVENTS", 1000)),
+    max_buffer=int(os.environ.get("API_LOG_MAX_BUFFER", 20000))
+)
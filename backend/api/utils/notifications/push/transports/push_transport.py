@@ -0,0 +1,106 @@
+"""
+Push Notification Transports
+8-Level Nested Architecture: utils/notifications/push/transports/push_transport.py
+
+The push dispatcher hands recipients to a transport one provider-sized batch
+at a time. A transport only has to implement send_batch(); everything else
+(target resolution, batching, retries, bookkeeping) lives in the dispatcher.
+
+FakePushTransport delivers nowhere. It simulates provider latency and
+per-recipient failures so the pipeline can be exercised locally and in load
+tests. A real provider (FCM, APNs, OneSignal) is another subclass registered
+in TRANSPORTS.
+
+Selected with PUSH_TRANSPORT (default "fake").
+"""
+
+import asyncio
+import os
+import zlib
+from typing import Any, Dict, List
+
+
+class PushTransport:
+    """Sends one notification to a batch of recipients"""
+
+    name = "base"
+
+    def __init__(self, max_batch_size: int = 500):
+        self.max_batch_size = max_batch_size
+
+    async def send_batch(self, message: Dict[str, Any], recipients: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Deliver a message to up to max_batch_size recipients
+
+        Args:
+            message: title, message and data of the notification
+            recipients: {"user_id", "token"} dicts
+
+        Returns:
+            user_id -> error for recipients that were not delivered (empty when
+            all succeeded)
+
+        Raises:
+            Any exception for a batch-level failure; the dispatcher retries it
+        """
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"transport": self.name, "max_batch_size": self.max_batch_size}
+
+
+class FakePushTransport(PushTransport):
+    """Local transport that records deliveries without sending anything"""
+
+    name = "fake"
+
+    def __init__(self, max_batch_size: int = 500, latency: float = 0.0, failure_rate: float = 0.0):
+        super().__init__(max_batch_size)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._stats = {"batches": 0, "delivered": 0, "rejected": 0}
+
+    async def send_batch(self, message: Dict[str, Any], recipients: List[Dict[str, Any]]) -> Dict[str, str]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        failures = {}
+        if self.failure_rate:
+            # Deterministic per recipient, so a retried batch fails the same way
+            threshold = int(self.failure_rate * 10000)
+            failures = {
+                r["user_id"]: "Unregistered device"
+                for r in recipients
+                if zlib.crc32(r["user_id"].encode()) % 10000 < threshold
+            }
+        self._stats["batches"] += 1
+        self._stats["delivered"] += len(recipients) - len(failures)
+        self._stats["rejected"] += len(failures)
+        return failures
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **super().get_stats(),
+            **self._stats,
+            "latency_seconds": self.latency,
+            "failure_rate": self.failure_rate
+        }
+
+
+TRANSPORTS = {
+    "fake": FakePushTransport,
+}
+
+
+def get_push_transport() -> PushTransport:
+    """Build the transport named by PUSH_TRANSPORT"""
+    name = os.environ.get("PUSH_TRANSPORT", "fake").lower()
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown push transport: {name}")
+    batch_size = int(os.environ.get("PUSH_BATCH_SIZE", 500))
+    if name == "fake":
+        return FakePushTransport(
+            batch_size,
+            latency=float(os.environ.get("PUSH_FAKE_LATENCY_MS", 0)) / 1000,
+            failure_rate=float(os.environ.get("PUSH_FAKE_FAILURE_RATE", 0))
+        )
+    return TRANSPORTS[name](batch_size)
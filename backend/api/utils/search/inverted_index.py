@@ -0,0 +1,483 @@
+"""
+In-Process Full-Text Search Index
+8-Level Nested Architecture: utils/search/inverted_index.py
+
+Replaces unanchored case-insensitive $regex scans for listing search boxes.
+Documents are tokenized and lightly stemmed into a weighted inverted index,
+ranked with BM25, and the last query word is prefix-matched so results update
+as the user types.
+
+CollectionSearchIndex keeps one InvertedIndex per collection. It is built and
+refreshed by a background task started with start(); requests never build it
+and fall back to the regex path until the first build is in. Every operation
+on the live index (searches and incremental updates) runs on one dedicated
+thread, in submission order, so ranking does not block the event loop.
+"""
+
+import asyncio
+import bisect
+import heapq
+import logging
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "the", "to", "with", "we", "you", "our", "your"
+}
+
+# BM25 tuning
+K1 = 1.2
+B = 0.75
+
+# Upper bound on vocabulary terms a single prefix can expand to
+MAX_PREFIX_EXPANSIONS = 50
+
+
+def stem(token: str) -> str:
+    """Light English suffix stripping (plurals, -ing, -ed)"""
+    if len(token) <= 3 or not token.isalpha():
+        return token
+
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("sses"):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+
+    for suffix, min_length in (("ing", 6), ("ed", 5)):
+        if token.endswith(suffix) and len(token) >= min_length:
+            token = token[:-len(suffix)]
+            # running -> runn -> run
+            if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "lsz":
+                token = token[:-1]
+            break
+
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase, non-stop-word tokens"""
+    if not text:
+        return []
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+
+
+class InvertedIndex:
+    """Weighted inverted index with BM25 ranking and prefix matching"""
+
+    def __init__(self, fields: Dict[str, float], filter_fields: Tuple[str, ...] = ()):
+        """
+        Args:
+            fields: Mapping of document field name to its ranking weight
+            filter_fields: Fields kept per document so searches can apply
+                equality filters before ranking
+        """
+        self.fields = fields
+        self.filter_fields = tuple(filter_fields)
+        self._postings: Dict[str, Dict[Hashable, float]] = {}
+        self._doc_terms: Dict[Hashable, Tuple[str, ...]] = {}
+        self._doc_filters: Dict[Hashable, Tuple[Any, ...]] = {}
+        self._doc_lengths: Dict[Hashable, float] = {}
+        self._total_length = 0.0
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def add(self, doc_id: Hashable, doc: Dict[str, Any]):
+        """Index (or re-index) a document"""
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+
+        term_weights: Dict[str, float] = {}
+        for field, weight in self.fields.items():
+            value = doc.get(field)
+            if isinstance(value, list):
+                value = " ".join(str(v) for v in value)
+            for token in tokenize(value if isinstance(value, str) else ""):
+                term = stem(token)
+                term_weights[term] = term_weights.get(term, 0.0) + weight
+
+        length = sum(term_weights.values())
+        for term, weight in term_weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary_dirty = True
+            postings[doc_id] = weight
+
+        self._doc_terms[doc_id] = tuple(term_weights)
+        if self.filter_fields:
+            self._doc_filters[doc_id] = tuple(doc.get(field) for field in self.filter_fields)
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: Hashable):
+        """Remove a document from the index"""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._doc_filters.pop(doc_id, None)
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary_dirty = True
+
+        self._total_length -= self._doc_lengths.pop(doc_id, 0.0)
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """Get vocabulary terms starting with prefix"""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        matches = []
+        for term in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def supports_filters(self, filters: Dict[str, Any]) -> bool:
+        """Whether every filter is an equality on a stored filter field"""
+        return all(
+            field in self.filter_fields and not isinstance(value, dict)
+            for field, value in filters.items()
+        )
+
+    def _score(self, query: str, prefix: bool, filters: Optional[Dict[str, Any]]) -> Dict[Hashable, float]:
+        """BM25 scores of every document matching the query and filters"""
+        tokens = tokenize(query)
+        if not tokens or not self._doc_terms:
+            return {}
+
+        # Each query word expands to one or more (term, boost) alternatives
+        clauses: List[List[Tuple[str, float]]] = []
+        for position, token in enumerate(tokens):
+            alternatives = {stem(token): 1.0}
+            if prefix and position == len(tokens) - 1:
+                for term in self._expand_prefix(token):
+                    alternatives.setdefault(term, 0.8)
+            clauses.append([(t, boost) for t, boost in alternatives.items() if t in self._postings])
+            if not clauses[-1]:
+                return {}
+
+        # Intersect candidate sets, smallest clause first
+        def clause_docs(clause) -> Set[Hashable]:
+            docs: Set[Hashable] = set()
+            for term, _ in clause:
+                docs.update(self._postings[term])
+            return docs
+
+        clauses.sort(key=lambda c: sum(len(self._postings[t]) for t, _ in c))
+        candidates = clause_docs(clauses[0])
+        for clause in clauses[1:]:
+            candidates &= clause_docs(clause)
+            if not candidates:
+                return {}
+
+        # Equality filters on the stored filter fields, before ranking
+        if filters:
+            checks = [(self.filter_fields.index(field), value) for field, value in filters.items()]
+            candidates = {
+                doc_id for doc_id in candidates
+                if all(self._doc_filters[doc_id][position] == value for position, value in checks)
+            }
+            if not candidates:
+                return {}
+
+        total_docs = len(self._doc_terms)
+        avg_length = self._total_length / total_docs if total_docs else 1.0
+        scores: Dict[Hashable, float] = {}
+
+        for clause in clauses:
+            for term, boost in clause:
+                postings = self._postings[term]
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id in candidates.intersection(postings):
+                    tf = postings[doc_id]
+                    norm = K1 * (1 - B + B * self._doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + boost * idf * tf * (K1 + 1) / (tf + norm)
+        return scores
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        prefix: bool = True,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Search the index
+
+        Every query word must match (AND semantics). The last word is also
+        matched as a prefix when prefix=True. filters are equality matches on
+        filter_fields (see supports_filters).
+
+        Returns:
+            List of (doc_id, score) sorted by descending relevance
+        """
+        scores = self._score(query, prefix, filters)
+        if limit and limit < len(scores):
+            return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def search_page(
+        self,
+        query: str,
+        offset: int,
+        limit: int,
+        filters: Optional[Dict[str, Any]] = None,
+        prefix: bool = True
+    ) -> Tuple[int, List[Hashable]]:
+        """
+        One page of ranked results
+
+        Returns:
+            (total matches, doc ids of the page in relevance order)
+        """
+        scores = self._score(query, prefix, filters)
+        if offset >= len(scores):
+            return len(scores), []
+        ranked = heapq.nlargest(offset + limit, scores.items(), key=lambda item: item[1])
+        return len(scores), [doc_id for doc_id, _ in ranked[offset:]]
+
+
+class CollectionSearchIndex:
+    """Keeps an InvertedIndex in sync with a Mongo collection"""
+
+    def __init__(
+        self,
+        collection,
+        fields: Dict[str, float],
+        filter_fields: Tuple[str, ...] = (),
+        refresh_interval: float = 300,
+        filter_batch_size: int = 1000,
+        build_batch_size: int = 1000
+    ):
+        """
+        Args:
+            collection: Motor collection to index
+            fields: Mapping of field name to ranking weight
+            filter_fields: Equality-filterable fields stored in the index
+                (e.g. is_active, category) so filters apply before ranking
+            refresh_interval: Seconds between background rebuilds, which pick
+                up writes made by other workers or bulk operations
+            filter_batch_size: Ranked ids per $in query when a filter has to
+                be checked in Mongo instead of the index
+            build_batch_size: Documents indexed per off-loop step of a rebuild
+        """
+        self.collection = collection
+        self.fields = fields
+        self.filter_fields = tuple(filter_fields)
+        self.refresh_interval = refresh_interval
+        self.filter_batch_size = filter_batch_size
+        self.build_batch_size = build_batch_size
+        self._index: Optional[InvertedIndex] = None
+        self._built_at: Optional[float] = None
+        # Owns the live index: searches, upserts, removes and the swap to a
+        # rebuilt index all run here, one at a time
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"search-{collection.name}")
+        # Updates seen while a rebuild is reading the collection, replayed
+        # onto the new index before it goes live
+        self._replay: Optional[List[Tuple[str, Any]]] = None
+        self._refresher: Optional[asyncio.Task] = None
+        self._stats = {
+            "searches": 0,
+            "rebuilds": 0,
+            "rebuild_failures": 0,
+            "last_rebuild_ms": None
+        }
+
+    @property
+    def ready(self) -> bool:
+        """Whether the first build has finished"""
+        return self._index is not None
+
+    # =============================================================================
+    # BUILDING
+    # =============================================================================
+
+    @staticmethod
+    def _apply(index: InvertedIndex, op: str, arg: Any):
+        if op == "add":
+            index.add(arg["_id"], arg)
+        else:
+            index.remove(arg)
+
+    def _apply_live(self, op: str, arg: Any):
+        if self._index is not None:
+            self._apply(self._index, op, arg)
+
+    def _swap(self, index: InvertedIndex, replay: List[Tuple[str, Any]]):
+        for op, arg in replay:
+            self._apply(index, op, arg)
+        self._index = index
+
+    @staticmethod
+    def _add_batch(index: InvertedIndex, docs: List[Dict[str, Any]]):
+        for doc in docs:
+            index.add(doc["_id"], doc)
+
+    async def rebuild(self):
+        """Build a fresh index off the event loop and swap it in"""
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        index = InvertedIndex(self.fields, self.filter_fields)
+        projection = {field: 1 for field in (*self.fields, *self.filter_fields)}
+        self._replay = []
+        try:
+            # The new index is private until the swap, so batches can be
+            # indexed on the default executor while the worker keeps serving
+            batch = []
+            async for doc in self.collection.find({}, projection).batch_size(self.build_batch_size):
+                batch.append(doc)
+                if len(batch) >= self.build_batch_size:
+                    await loop.run_in_executor(None, self._add_batch, index, batch)
+                    batch = []
+            if batch:
+                await loop.run_in_executor(None, self._add_batch, index, batch)
+        except BaseException:
+            self._replay = None
+            raise
+
+        replay, self._replay = self._replay, None
+        await loop.run_in_executor(self._worker, self._swap, index, replay)
+        self._built_at = time.monotonic()
+        self._stats["rebuilds"] += 1
+        self._stats["last_rebuild_ms"] = round((self._built_at - started) * 1000, 2)
+        logger.info(f"Built search index for {self.collection.name}: {len(index)} docs in {self._built_at - started:.2f}s")
+
+    async def _refresh_periodically(self):
+        while True:
+            try:
+                await self.rebuild()
+                delay = self.refresh_interval
+            except Exception as e:
+                self._stats["rebuild_failures"] += 1
+                logger.error(f"Failed to build search index for {self.collection.name}: {e}")
+                # Retry sooner while there is no index to serve from
+                delay = self.refresh_interval if self.ready else min(self.refresh_interval, 30)
+            await asyncio.sleep(delay)
+
+    def start(self):
+        """Build the index now and rebuild it every refresh_interval seconds"""
+        if self._refresher is None:
+            self._refresher = asyncio.get_running_loop().create_task(self._refresh_periodically())
+
+    async def stop(self):
+        """Cancel the refresher and release the worker thread"""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+        self._worker.shutdown(wait=False)
+
+    # =============================================================================
+    # UPDATES
+    # =============================================================================
+
+    def _submit(self, op: str, arg: Any):
+        if self._replay is not None:
+            self._replay.append((op, arg))
+        if self._index is not None or self._refresher is not None:
+            self._worker.submit(self._apply_live, op, arg)
+
+    def upsert(self, doc: Dict[str, Any]):
+        """Index a created or updated document"""
+        if doc and "_id" in doc:
+            # Copied now: callers go on to mutate the document (e.g. str(_id))
+            # before the worker gets to it
+            self._submit("add", {
+                "_id": doc["_id"],
+                **{field: doc[field] for field in (*self.fields, *self.filter_fields) if field in doc}
+            })
+
+    def remove(self, doc_id: Hashable):
+        """Drop a deleted document from the index"""
+        self._submit("remove", doc_id)
+
+    # =============================================================================
+    # SEARCH
+    # =============================================================================
+
+    def _search(self, query: str, filter_query: Dict[str, Any], skip: int, limit: int) -> Tuple[Optional[int], List[Hashable]]:
+        """
+        Runs on the worker thread
+
+        Returns:
+            (total, page ids) when the index can apply filter_query itself,
+            otherwise (None, every ranked id) for filtering in Mongo
+        """
+        if self._index.supports_filters(filter_query):
+            return self._index.search_page(query, skip, limit, filters=filter_query)
+        return None, [doc_id for doc_id, _ in self._index.search(query)]
+
+    async def _filter_in_mongo(self, ranked_ids: List[Hashable], filter_query: Dict[str, Any]) -> List[Hashable]:
+        """Ranked ids that match filter_query, checked in batches (nothing is cut off)"""
+        matched: Set[Hashable] = set()
+        for i in range(0, len(ranked_ids), self.filter_batch_size):
+            batch = ranked_ids[i:i + self.filter_batch_size]
+            async for doc in self.collection.find({**filter_query, "_id": {"$in": batch}}, {"_id": 1}):
+                matched.add(doc["_id"])
+        return [doc_id for doc_id in ranked_ids if doc_id in matched]
+
+    async def search_documents(self, query: str, filter_query: Dict[str, Any], skip: int, limit: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Run a ranked search combined with regular Mongo filters
+
+        Equality filters on filter_fields are applied inside the index before
+        ranking, so the total is exact and every page is reachable. Any other
+        filter is checked in Mongo against all ranked hits. Callers check
+        ready first; the index is never built on the request path.
+
+        Returns:
+            (total matches, page of documents in relevance order)
+        """
+        if not self.ready:
+            raise RuntimeError(f"Search index for {self.collection.name} is not built yet")
+
+        self._stats["searches"] += 1
+        total, page_ids = await asyncio.get_running_loop().run_in_executor(
+            self._worker, self._search, query, filter_query, skip, limit
+        )
+        if total is None:
+            ranked_ids = await self._filter_in_mongo(page_ids, filter_query)
+            total, page_ids = len(ranked_ids), ranked_ids[skip:skip + limit]
+        if not page_ids:
+            return total, []
+
+        # filter_query is re-applied so a write from another worker that the
+        # index has not seen yet cannot leak a non-matching document
+        docs = await self.collection.find({**filter_query, "_id": {"$in": page_ids}}).to_list(length=len(page_ids))
+        by_id = {doc["_id"]: doc for doc in docs}
+        return total, [by_id[doc_id] for doc_id in page_ids if doc_id in by_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index size and rebuild metrics"""
+        return {
+            **self._stats,
+            "ready": self.ready,
+            "documents": len(self._index) if self._index is not None else 0,
+            "age_seconds": round(time.monotonic() - self._built_at, 2) if self._built_at is not None else None,
+            "refresh_interval_seconds": self.refresh_interval
+        }
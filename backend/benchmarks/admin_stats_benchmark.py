@@ -0,0 +1,181 @@
+"""
+Admin Stats Benchmark
+Compares the old sequential count_documents + aggregate stats queries with
+the single-pass aggregations, uncached and through the stats cache, for:
+content approval, push notifications, DSA sheets and job applications.
+
+Round trips are counted with a pymongo command listener, so they are the
+commands actually sent to the server per stats call.
+
+Needs a running MongoDB (MONGO_URL, default mongodb://localhost:27017). Data
+is seeded into a throwaway database that is dropped afterwards.
+
+Usage:
+    python benchmarks/admin_stats_benchmark.py [documents per collection]
+
+    python benchmarks/admin_stats_benchmark.py 200000
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from api.routes.admin.advanced.management.operations.handlers.advanced_handlers import ContentApprovalHandlers, PushNotificationHandlers
+from api.routes.admin.analytics.management.crud.operations.handlers.analytics_handlers import AnalyticsHandlers
+from api.routes.admin.dsa.sheets.management.crud.operations.handlers.sheet_handlers import DSASheetHandlers
+from api.utils.database.indexes.index_registry import ensure_indexes
+from api.utils.helpers.stats_cache import stats_cache
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017/")
+DB_NAME = os.getenv("BENCH_DB_NAME", "careerguide_benchmark")
+ROUNDS = int(os.getenv("BENCH_ROUNDS", 5))
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to the server"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def insert_in_batches(collection, make, count):
+    batch = []
+    for i in range(count):
+        batch.append(make(i))
+        if len(batch) == 5000:
+            await collection.insert_many(batch)
+            batch = []
+    if batch:
+        await collection.insert_many(batch)
+
+
+async def seed(db, count):
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    await insert_in_batches(db.content_submissions, lambda i: {
+        "content_type": rng.choice(["jobs", "internships", "articles"]),
+        "content_data": {"title": f"Submission {i}"},
+        "status": rng.choice(["pending", "approved", "rejected"]),
+        "submitted_at": now - timedelta(minutes=i)
+    }, count)
+    await insert_in_batches(db.push_notifications, lambda i: {
+        "title": f"Notification {i}",
+        "status": rng.choice(["pending", "sent", "failed"]),
+        "sent_count": rng.randint(0, 5000),
+        "created_at": now - timedelta(minutes=i)
+    }, count)
+    await insert_in_batches(db.dsa_sheets, lambda i: {
+        "name": f"Sheet {i}",
+        "level": rng.choice(["beginner", "intermediate", "advanced"]),
+        "is_published": rng.random() < 0.7,
+        "is_featured": rng.random() < 0.1,
+        "created_at": now - timedelta(minutes=i)
+    }, count)
+    await insert_in_batches(db.jobs, lambda i: {
+        "title": f"Job {i}",
+        "company": f"Company {i % 500}",
+        "views": rng.randint(0, 100000),
+        "created_at": now - timedelta(minutes=i)
+    }, count)
+    await insert_in_batches(db.applications, lambda i: {
+        "job_id": str(i % 1000),
+        "applied_at": now - timedelta(hours=rng.randint(0, 24 * 60))
+    }, count)
+    await ensure_indexes(db)
+
+
+# Before: the sequential queries the stats endpoints used to run
+
+async def old_submission_stats(db):
+    for status in ("pending", "approved", "rejected"):
+        await db.content_submissions.count_documents({"status": status})
+    pipeline = [{"$group": {"_id": {"type": "$content_type", "status": "$status"}, "count": {"$sum": 1}}}]
+    await db.content_submissions.aggregate(pipeline).to_list(length=None)
+
+
+async def old_notification_stats(db):
+    for status in ("sent", "pending", "failed"):
+        await db.push_notifications.count_documents({"status": status})
+    pipeline = [
+        {"$match": {"status": "sent"}},
+        {"$group": {"_id": None, "total_recipients": {"$sum": "$sent_count"}}}
+    ]
+    await db.push_notifications.aggregate(pipeline).to_list(length=None)
+
+
+async def old_sheet_stats(db):
+    await db.dsa_sheets.count_documents({})
+    await db.dsa_sheets.count_documents({"is_published": True})
+    await db.dsa_sheets.count_documents({"is_featured": True})
+    await db.dsa_sheets.aggregate([{"$group": {"_id": "$level", "count": {"$sum": 1}}}]).to_list(length=None)
+
+
+async def old_job_application_metrics(db):
+    now = datetime.utcnow()
+    await db.applications.count_documents({})
+    for start in (datetime(now.year, now.month, now.day), now - timedelta(days=7), now - timedelta(days=30)):
+        await db.applications.count_documents({"applied_at": {"$gte": start}})
+    await db.jobs.count_documents({})
+    pipeline = [{"$sort": {"views": -1}}, {"$limit": 5}, {"$project": {"title": 1, "company": 1, "views": 1}}]
+    await db.jobs.aggregate(pipeline).to_list(length=None)
+
+
+async def measure(label, func, counter, cached=False):
+    samples = []
+    trips = 0
+    for _ in range(ROUNDS):
+        if not cached:
+            stats_cache.invalidate()
+        before = counter.count
+        started = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - started) * 1000)
+        trips = counter.count - before
+    print(f"  {label:<28} round trips {trips:3d}   median {statistics.median(samples):9.2f}ms  max {max(samples):9.2f}ms")
+
+
+async def main(count):
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(MONGO_URL, event_listeners=[counter])
+    await client.drop_database(DB_NAME)
+    db = client[DB_NAME]
+    try:
+        print(f"Seeding {count} documents per collection...")
+        await seed(db, count)
+
+        endpoints = [
+            ("Content approval stats", old_submission_stats, ContentApprovalHandlers(db).get_submission_stats),
+            ("Push notification stats", old_notification_stats, PushNotificationHandlers(db, None).get_notification_stats),
+            ("DSA sheet stats", old_sheet_stats, DSASheetHandlers(db).get_sheet_stats),
+            ("Job application metrics", old_job_application_metrics, AnalyticsHandlers(db).get_job_application_metrics),
+        ]
+        for title, old, new in endpoints:
+            print(f"{title}:")
+            await measure("before: sequential queries", lambda: old(db), counter)
+            await measure("after: single pass", new, counter)
+            await measure("after: cached", new, counter, cached=True)
+    finally:
+        await client.drop_database(DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:2]]
+    asyncio.run(main(*(args or [200_000])))
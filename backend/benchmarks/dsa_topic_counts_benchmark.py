@@ -0,0 +1,111 @@
+"""
+DSA Topic Counts Benchmark
+Compares the old per-topic count_documents (N+1) against a single grouped
+aggregation and the maintained dsa_topics.question_count counters.
+
+Needs a running MongoDB (MONGO_URL, default mongodb://localhost:27017). Data
+is seeded into a throwaway database that is dropped afterwards.
+
+Usage:
+    python benchmarks/dsa_topic_counts_benchmark.py [topics] [questions]
+
+    python benchmarks/dsa_topic_counts_benchmark.py 500 50000
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from api.routes.admin.dsa.topics.management.crud.operations.handlers.topic_handlers import DSATopicHandlers
+from api.routes.admin.dsa.questions.management.crud.operations.handlers.question_handlers import DSAQuestionHandlers
+from api.utils.database.indexes.index_registry import ensure_indexes
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017/")
+DB_NAME = os.getenv("BENCH_DB_NAME", "careerguide_benchmark")
+ROUNDS = int(os.getenv("BENCH_ROUNDS", 5))
+
+
+async def seed(db, topic_count, question_count):
+    rng = random.Random(7)
+    result = await db.dsa_topics.insert_many(
+        [{"name": f"Topic {i:04d}", "is_active": True, "question_count": 0} for i in range(topic_count)]
+    )
+    topic_ids = [str(_id) for _id in result.inserted_ids]
+
+    batch = []
+    for i in range(question_count):
+        batch.append({
+            "title": f"Question {i}",
+            "difficulty": rng.choice(["easy", "medium", "hard"]),
+            "topics": rng.sample(topic_ids, rng.randint(1, 3)),
+            "is_active": True
+        })
+        if len(batch) == 5000:
+            await db.dsa_questions.insert_many(batch)
+            batch = []
+    if batch:
+        await db.dsa_questions.insert_many(batch)
+
+    await ensure_indexes(db)
+    # Populate the counters the same way the repair job would
+    await DSATopicHandlers(db).repair_question_counts()
+
+
+async def time_it(label, func):
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"  {label:<44} median {statistics.median(samples):9.1f}ms  max {max(samples):9.1f}ms")
+
+
+async def main(topic_count, question_count):
+    client = AsyncIOMotorClient(MONGO_URL)
+    await client.drop_database(DB_NAME)
+    db = client[DB_NAME]
+    try:
+        print(f"Seeding {topic_count} topics x {question_count} questions...")
+        await seed(db, topic_count, question_count)
+
+        topics = DSATopicHandlers(db)
+        questions = DSAQuestionHandlers(db)
+
+        async def n_plus_one_page():
+            page = await db.dsa_topics.find().sort("name", 1).limit(100).to_list(length=100)
+            for topic in page:
+                await db.dsa_questions.count_documents({"topics": str(topic["_id"])})
+
+        async def n_plus_one_all():
+            for topic in await db.dsa_topics.find().to_list(length=None):
+                await db.dsa_questions.count_documents({"topics": str(topic["_id"])})
+
+        async def grouped_aggregation():
+            pipeline = [{"$unwind": "$topics"}, {"$group": {"_id": "$topics", "count": {"$sum": 1}}}]
+            await db.dsa_questions.aggregate(pipeline).to_list(length=None)
+
+        print("Topic list page (100 topics):")
+        await time_it("before: count_documents per topic", n_plus_one_page)
+        await time_it("after: maintained counters", lambda: topics.get_all_topics(limit=100, count="none"))
+
+        print(f"Questions by topic ({topic_count} topics):")
+        await time_it("before: count_documents per topic", n_plus_one_all)
+        await time_it("alternative: single $group aggregation", grouped_aggregation)
+        await time_it("after: maintained counters", questions.get_questions_by_topic)
+
+        print("Repair job:")
+        await time_it("repair_question_counts", topics.repair_question_counts)
+    finally:
+        await client.drop_database(DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*(args + [500, 50_000][len(args):])))
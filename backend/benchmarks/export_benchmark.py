@@ -0,0 +1,125 @@
+"""
+Export Throughput Benchmark
+Measures rows/s, bytes/s and peak memory of the streamed job exports (CSV and
+NDJSON, plain and gzipped) against the old approach of building the whole
+file in a StringIO.
+
+Needs a running MongoDB (MONGO_URL, default mongodb://localhost:27017). Data
+is seeded into a throwaway database that is dropped afterwards. Peak RSS is
+monotonic, so the StringIO baseline runs last.
+
+Usage:
+    python benchmarks/export_benchmark.py [documents] [batch_size]
+
+    python benchmarks/export_benchmark.py 1000000 1000
+"""
+
+import asyncio
+import csv
+import io
+import os
+import random
+import resource
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from api.routes.admin.bulk.management.operations.handlers.bulk_handlers import (
+    BulkOperationsHandlers, JOB_EXPORT_COLUMNS, _export_value
+)
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017/")
+DB_NAME = os.getenv("BENCH_DB_NAME", "careerguide_benchmark")
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def seed(db, document_count):
+    rng = random.Random(7)
+    words = ["python", "react", "data", "cloud", "backend", "mobile", "security", "design"]
+    batch = []
+    for i in range(document_count):
+        batch.append({
+            "title": f"{rng.choice(words).title()} Engineer {i}",
+            "company": f"Company {rng.randint(1, 5000)}",
+            "location": rng.choice(["Remote", "Bengaluru", "Berlin", "New York"]),
+            "job_type": rng.choice(["full-time", "part-time", "contract"]),
+            "category": rng.choice(["software", "marketing", "finance"]),
+            "experience_level": rng.choice(["entry", "mid", "senior"]),
+            "salary_min": rng.randint(30, 90) * 1000,
+            "salary_max": rng.randint(90, 200) * 1000,
+            "currency": "USD",
+            "description": " ".join(rng.choices(words, k=60)),
+            "skills_required": rng.sample(words, 3),
+            "qualifications": ["Degree in a related field"],
+            "responsibilities": ["Build things", "Review code"],
+            "benefits": ["Health insurance"],
+            "is_active": True,
+            "created_at": datetime.utcnow()
+        })
+        if len(batch) == 10_000:
+            await db.jobs.insert_many(batch)
+            batch = []
+    if batch:
+        await db.jobs.insert_many(batch)
+
+
+async def consume(chunks):
+    total_bytes = 0
+    async for chunk in chunks:
+        total_bytes += len(chunk)
+    return total_bytes
+
+
+async def stringio_baseline(db):
+    """The previous export: every row written into one StringIO"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow([header for header, _ in JOB_EXPORT_COLUMNS])
+    async for job in db.jobs.find({}):
+        writer.writerow([_export_value(job.get(field)) for _, field in JOB_EXPORT_COLUMNS])
+    return len(output.getvalue().encode("utf-8"))
+
+
+async def measure(label, document_count, func):
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    total_bytes = await func()
+    elapsed = time.perf_counter() - started
+    print(
+        f"  {label:<22} {elapsed:7.2f}s  {document_count / elapsed:10,.0f} rows/s  "
+        f"{total_bytes / elapsed / 1e6:7.1f} MB/s  {total_bytes / 1e6:8.1f} MB  "
+        f"peak RSS +{peak_rss_mb() - rss_before:6.1f} MB"
+    )
+
+
+async def main(document_count, batch_size):
+    client = AsyncIOMotorClient(MONGO_URL)
+    await client.drop_database(DB_NAME)
+    db = client[DB_NAME]
+    try:
+        print(f"Seeding {document_count:,} jobs...")
+        await seed(db, document_count)
+        handlers = BulkOperationsHandlers(db)
+
+        print(f"Exporting {document_count:,} jobs (batch_size={batch_size}):")
+        for format in ("csv", "ndjson"):
+            for compress in (False, True):
+                label = f"stream {format}" + (" + gzip" if compress else "")
+                await measure(label, document_count, lambda: consume(
+                    handlers.export_jobs(format=format, compress=compress, batch_size=batch_size)
+                ))
+        await measure("StringIO csv (before)", document_count, lambda: stringio_baseline(db))
+    finally:
+        await client.drop_database(DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*(args + [1_000_000, 1000][len(args):])))
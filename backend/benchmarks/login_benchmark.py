@@ -0,0 +1,76 @@
+"""
+Login Throughput Benchmark
+Measures password verifications per second (the CPU-bound part of a login)
+and the worst event-loop stall while a burst of logins is in flight.
+
+Compares verifying inline on the event loop (the old behaviour) with the
+password hasher pool at 1, 4 and 8 workers. Worker counts above the number
+of cores this process may use cannot scale further; pin the run with
+taskset to measure specific core counts. No database is needed.
+
+Usage:
+    python benchmarks/login_benchmark.py [logins] [rounds]
+
+    python benchmarks/login_benchmark.py 64 12
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passlib.context import CryptContext
+from api.utils.helpers.password_hasher import PasswordHasher
+
+PASSWORD = "correct horse battery staple"
+
+
+async def watch_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Worst delay between when a timer should fire and when it did"""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run(label, logins, verify):
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop_lag(stop))
+    await asyncio.sleep(0.02)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(verify() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    worst_lag = await watcher
+    assert all(results)
+    print(f"  {label:<22} {logins / elapsed:8.1f} logins/s   worst loop stall {worst_lag * 1000:8.1f}ms")
+
+
+async def main(logins, rounds):
+    context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds)
+    password_hash = context.hash(PASSWORD)
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(f"{logins} concurrent logins, bcrypt cost {rounds}, {cores} usable cores:")
+
+    async def inline():
+        return context.verify(PASSWORD, password_hash)
+
+    await run("inline (before)", logins, inline)
+
+    for workers in (1, 4, 8):
+        hasher = PasswordHasher(max_workers=workers, max_concurrent=logins, queue_timeout=600, context=context)
+        try:
+            await run(f"pool, {workers} worker(s)", logins, lambda: hasher.verify(PASSWORD, password_hash))
+        finally:
+            hasher.shutdown()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*(args + [64, 12][len(args):])))
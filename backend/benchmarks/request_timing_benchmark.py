@@ -0,0 +1,106 @@
+"""
+Request Timing Middleware Overhead Benchmark
+Measures the per-request cost of RequestTimingMiddleware by driving a small
+FastAPI app directly over ASGI (no sockets, no server). It runs the same
+requests with and without the middleware and compares:
+
+    - a plain route
+    - a route with a path parameter (template lookup)
+    - the drop path: the buffer is full and nothing drains it, which is what
+      requests see while the database is unavailable
+
+No database is needed: the log buffer is never bound, so nothing is written.
+
+Usage:
+    python benchmarks/request_timing_benchmark.py [requests] [rounds]
+
+    python benchmarks/request_timing_benchmark.py 20000 5
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from api.utils.helpers.log_buffer import BufferedLogWriter
+from api.utils.monitoring.middleware.request_timing import RequestTimingMiddleware
+
+
+def build_app(log=None):
+    app = FastAPI()
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/api/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    if log is not None:
+        app.add_middleware(RequestTimingMiddleware, log=log)
+    return app
+
+
+async def call(app, path):
+    """One GET through the ASGI interface"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80)
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]["status"]
+
+
+async def per_request_us(app, path, requests, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await call(app, path)
+        samples.append((time.perf_counter() - started) * 1e6 / requests)
+    return statistics.median(samples)
+
+
+async def main(requests, rounds):
+    plain = build_app()
+    log = BufferedLogWriter("api_usage_logs", flush_events=10 ** 9, max_buffer=requests * rounds * 10)
+    timed = build_app(log)
+    full = BufferedLogWriter("api_usage_logs", flush_events=10 ** 9, max_buffer=1000)
+    dropping = build_app(full)
+
+    # Warm up routing and the event loop
+    for app in (plain, timed, dropping):
+        await per_request_us(app, "/api/ping", 200, 1)
+
+    print(f"{requests} requests x {rounds} rounds (median per request):")
+    for label, path in (("plain route", "/api/ping"), ("path parameter route", "/api/items/abc123")):
+        base = await per_request_us(plain, path, requests, rounds)
+        with_mw = await per_request_us(timed, path, requests, rounds)
+        print(f"  {label:<22} without {base:7.1f}us   with {with_mw:7.1f}us   overhead {with_mw - base:6.1f}us ({(with_mw / base - 1) * 100:4.1f}%)")
+
+    base = await per_request_us(plain, "/api/ping", requests, rounds)
+    with_mw = await per_request_us(dropping, "/api/ping", requests, rounds)
+    print(f"  {'full buffer (dropping)':<22} without {base:7.1f}us   with {with_mw:7.1f}us   overhead {with_mw - base:6.1f}us ({(with_mw / base - 1) * 100:4.1f}%)")
+
+    sample = log._buffer[-1]
+    print(f"Buffered {len(log._buffer)} entries, e.g. {sample['method']} {sample['endpoint']} -> {sample['status_code']}")
+    print(f"Dropped under backpressure: {full.get_stats()['dropped']}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*(args + [20_000, 5][len(args):])))
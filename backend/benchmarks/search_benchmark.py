@@ -0,0 +1,146 @@
+"""
+Search Benchmark
+Times a listing search end to end through CollectionSearchIndex.search_documents
+(ranking on the index worker, filters, and loading the page from MongoDB)
+against the legacy path: a case-insensitive $regex $or query with a
+count_documents for the total and a sorted skip/limit page.
+
+Each query runs unfiltered, with is_active=True, with is_active + category,
+and as a deep page (offset 500) of the is_active search.
+
+Needs a running MongoDB (MONGO_URL, default mongodb://localhost:27017). Data
+is seeded into a throwaway database that is dropped afterwards.
+
+Usage:
+    python benchmarks/search_benchmark.py [sizes...]
+
+    python benchmarks/search_benchmark.py 10000 100000 1000000
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from api.utils.database.indexes.index_registry import ensure_indexes
+from api.utils.search.inverted_index import CollectionSearchIndex
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017/")
+DB_NAME = os.getenv("BENCH_DB_NAME", "careerguide_benchmark")
+ROUNDS = int(os.getenv("BENCH_ROUNDS", 5))
+
+TITLES = ["Software Engineer", "Data Scientist", "Backend Developer", "Frontend Developer",
+          "Product Manager", "DevOps Engineer", "Machine Learning Engineer", "QA Analyst",
+          "Mobile Developer", "Security Engineer", "Cloud Architect", "Data Analyst"]
+SENIORITY = ["Junior", "Senior", "Lead", "Staff", "Principal", "Intern", ""]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka",
+             "Cyberdyne", "Tyrell", "Soylent", "Vandelay"]
+SKILLS = ["python", "java", "react", "kubernetes", "aws", "sql", "go", "rust", "docker",
+          "typescript", "spark", "tensorflow", "django", "fastapi", "mongodb", "graphql"]
+CATEGORIES = ["technology", "finance", "healthcare", "education", "retail"]
+
+QUERIES = ["python", "senior backend", "data", "react developer", "kube", "machine learning",
+           "cloud architect aws", "eng", "acme software", "security"]
+
+# Same configuration as JobHandlers
+FIELDS = {"title": 3.0, "company": 2.0, "skills_required": 1.5, "description": 1.0}
+FILTER_FIELDS = ("is_active", "category", "job_type", "experience_level")
+
+CASES = [
+    ("unfiltered", {}, 0),
+    ("is_active", {"is_active": True}, 0),
+    ("is_active+category", {"is_active": True, "category": "technology"}, 0),
+    ("deep page", {"is_active": True}, 500),
+]
+PAGE_SIZE = 20
+
+
+async def seed(db, count):
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    batch = []
+    for i in range(count):
+        skills = rng.sample(SKILLS, 4)
+        batch.append({
+            "title": f"{rng.choice(SENIORITY)} {rng.choice(TITLES)}".strip(),
+            "company": f"{rng.choice(COMPANIES)} {i % 997}",
+            "skills_required": skills,
+            "description": " ".join(skills) + " experience required",
+            "category": rng.choice(CATEGORIES),
+            "job_type": rng.choice(["full_time", "part_time", "contract"]),
+            "experience_level": rng.choice(["entry", "mid", "senior"]),
+            "is_active": rng.random() < 0.8,
+            "created_at": now - timedelta(minutes=i)
+        })
+        if len(batch) == 5000:
+            await db.jobs.insert_many(batch)
+            batch = []
+    if batch:
+        await db.jobs.insert_many(batch)
+    await ensure_indexes(db)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def regex_search(collection, query, filters, skip):
+    """What JobHandlers.get_all_jobs does with search_mode "regex" """
+    filter_query = {
+        "$or": [{field: {"$regex": query, "$options": "i"}} for field in ("title", "company", "description")],
+        **filters
+    }
+    total = await collection.count_documents(filter_query)
+    docs = await collection.find(filter_query).sort("created_at", -1).skip(skip).limit(PAGE_SIZE).to_list(length=PAGE_SIZE)
+    return total, docs
+
+
+async def timed(search, rounds):
+    samples = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            started = time.perf_counter()
+            await search(query)
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def run(client, size):
+    await client.drop_database(DB_NAME)
+    db = client[DB_NAME]
+    try:
+        await seed(db, size)
+        index = CollectionSearchIndex(db.jobs, FIELDS, filter_fields=FILTER_FIELDS)
+        started = time.perf_counter()
+        await index.rebuild()
+        build_seconds = time.perf_counter() - started
+
+        print(f"{size:>9,} docs | index build {build_seconds:6.1f}s")
+        for label, filters, skip in CASES:
+            index_ms = await timed(lambda q: index.search_documents(q, filters, skip, PAGE_SIZE), ROUNDS)
+            regex_ms = await timed(lambda q: regex_search(db.jobs, q, filters, skip), max(1, ROUNDS if size <= 100_000 else 1))
+            print(f"  {label:<20} index p50 {percentile(index_ms, 50):8.2f}ms p99 {percentile(index_ms, 99):8.2f}ms | "
+                  f"regex p50 {percentile(regex_ms, 50):8.2f}ms p99 {percentile(regex_ms, 99):8.2f}ms")
+        await index.stop()
+    finally:
+        await client.drop_database(DB_NAME)
+
+
+async def main(sizes):
+    client = AsyncIOMotorClient(MONGO_URL)
+    print(f"Queries: {len(QUERIES)} x {ROUNDS} rounds, page size {PAGE_SIZE}")
+    try:
+        for size in sizes:
+            await run(client, size)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]))
@@ -0,0 +1,78 @@
+"""
+Manage Database Indexes
+Applies the indexes declared by the handler modules, or reports drift between
+the declared and the live indexes.
+
+Usage:
+    python manage_indexes.py apply
+    python manage_indexes.py drift
+"""
+
+import asyncio
+import json
+import os
+import sys
+from dotenv import load_dotenv
+load_dotenv()
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from api.utils.database.indexes.index_registry import ensure_indexes, get_index_drift
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017/")
+DB_NAME = os.getenv("DB_NAME", "careerguide")
+
+
+async def apply(db) -> int:
+    results = await ensure_indexes(db)
+    failed = 0
+    for collection_name, result in sorted(results.items()):
+        if "error" in result:
+            failed += 1
+            print(f"✗ {collection_name}: {result['error']}")
+        else:
+            print(f"✓ {collection_name}: {', '.join(result['indexes'])}")
+    return 1 if failed else 0
+
+
+async def drift(db) -> int:
+    report = await get_index_drift(db)
+    out_of_sync = 0
+    for collection_name, result in sorted(report.items()):
+        if result["in_sync"]:
+            print(f"✓ {collection_name}: in sync")
+            continue
+        out_of_sync += 1
+        print(f"✗ {collection_name}:")
+        for name in result["missing"]:
+            print(f"    missing:    {name}")
+        for item in result["mismatched"]:
+            print(f"    mismatched: {item['name']} declared={json.dumps(item['declared'], default=str)} "
+                  f"live={json.dumps(item['live'], default=str)}")
+        for name in result["extra"]:
+            print(f"    extra:      {name}")
+    return 1 if out_of_sync else 0
+
+
+async def main(command: str) -> int:
+    client = AsyncIOMotorClient(MONGO_URL)
+    try:
+        db = client[DB_NAME]
+        if command == "apply":
+            return await apply(db)
+        return await drift(db)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in ("apply", "drift"):
+        print(__doc__)
+        sys.exit(2)
+    try:
+        sys.exit(asyncio.run(main(sys.argv[1])))
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        sys.exit(1)
@@ -14,11 +14,10 @@ load_dotenv()
 sys.path.insert(0, os.path.dirname(__file__))
 
 from pymongo import MongoClient
-from passlib.context import CryptContext
 from datetime import datetime
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (same cost settings as the API)
+from api.utils.helpers.password_hasher import pwd_context
 
 # MongoDB connection
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017/")
@@ -1,11 +1,14 @@
-from fastapi import FastAPI, APIRouter, Query, Depends, HTTPException, Header
+from fastapi import FastAPI, APIRouter, Query, Depends, HTTPException, Header, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from bson import ObjectId
 import os
 import logging
 from pathlib import Path
+from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 # Import models
@@ -18,6 +21,8 @@ from api.models.schemas.dsa.questions.fields.validators.custom.question_model im
 from api.models.schemas.dsa.sheets.fields.validators.custom.sheet_model import DSASheetCreate, DSASheetUpdate, DSASheetResponse
 from api.models.schemas.dsa.companies.fields.validators.custom.company_model import CompanyCreate, CompanyUpdate, Company
 from api.models.schemas.roadmaps.fields.validators.custom.roadmap_model import RoadmapCreate, RoadmapUpdate, Roadmap, RoadmapNode, RoadmapAIGenerate
+from api.models.schemas.ai_batch.fields.validators.custom.ai_batch_model import JobAIBatch, InternshipAIBatch, ScholarshipAIBatch
+from api.models.schemas.content_approval.fields.validators.custom.content_approval_model import BulkApproveRequest, BulkRejectRequest
 from api.models.schemas.auth.fields.validators.custom.auth_model import AdminRegister, UserRegister, LoginRequest, ChangePasswordRequest, UpdateProfileRequest
 from api.models.schemas.career_tools.fields.validators.custom.career_tools_model import (
     ResumeReviewRequest, CoverLetterRequest, ATSHackRequest, ColdEmailRequest, 
@@ -33,18 +38,35 @@ from api.routes.admin.dsa.topics.management.crud.operations.handlers.topic_handl
 from api.routes.admin.dsa.questions.management.crud.operations.handlers.question_handlers import DSAQuestionHandlers
 from api.routes.admin.dsa.sheets.management.crud.operations.handlers.sheet_handlers import DSASheetHandlers
 from api.routes.admin.dsa.companies.management.crud.operations.handlers.company_handlers import CompanyHandlers
+from api.routes.admin.dsa.dashboard.management.operations.handlers.dashboard_handlers import DSADashboardHandlers
 from api.routes.admin.roadmaps.management.crud.operations.handlers.roadmap_handlers import RoadmapHandlers
 from api.routes.auth.management.operations.handlers.auth_handlers import AuthHandlers
 from api.routes.career_tools.management.operations.handlers.career_tools_handlers import CareerToolsHandlers
 from api.routes.admin.analytics.management.crud.operations.handlers.analytics_handlers import AnalyticsHandlers
 from api.routes.admin.bulk.management.operations.handlers.bulk_handlers import BulkOperationsHandlers
+from api.routes.admin.ai_batch.management.operations.handlers.ai_batch_handlers import AIBatchHandlers
 from api.routes.admin.advanced.management.operations.handlers.advanced_handlers import ContentApprovalHandlers, PushNotificationHandlers
+from api.routes.admin.advanced.management.operations.handlers.push_dispatcher import PushDispatcher
 
 # Import AI generators
 from api.utils.ai.gemini.generators.jobs.prompts.generator import GeminiJobGenerator
 from api.utils.ai.gemini.generators.articles.prompts.generator import GeminiArticleGenerator
 from api.utils.ai.gemini.generators.dsa.questions.prompts.generator import GeminiDSAGenerator
 from api.utils.ai.gemini.generators.roadmaps.prompts.generator import GeminiRoadmapGenerator
+from api.utils.ai.gemini.clients.model_registry import gemini_models
+from api.utils.ai.gemini.executor.ai_executor import ai_executor
+from api.utils.ai.gemini.limits.rate_limiter import ai_rate_limiter
+from api.utils.ai.gemini.parsing.json_parser import parse_metrics
+from api.utils.ai.gemini.usage.usage_log import gemini_usage_log
+from api.utils.notifications.push.transports.push_transport import get_push_transport
+from api.utils.monitoring.middleware.request_timing import RequestTimingMiddleware, api_usage_log
+from api.utils.database.indexes.index_registry import ensure_indexes, get_index_drift
+from api.utils.helpers.pagination import fetch_page
+from api.utils.helpers.count_cache import count_cache
+from api.utils.helpers.view_counter import view_counter
+from api.utils.helpers.stats_cache import stats_cache
+from api.utils.helpers.password_hasher import password_hasher
+from api.utils.helpers.sse import sse_response
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -54,6 +76,13 @@ mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
+# Collections queried directly by the public DSA and roadmap routes
+dsa_topics_collection = db.dsa_topics
+dsa_questions_collection = db.dsa_questions
+dsa_sheets_collection = db.dsa_sheets
+dsa_companies_collection = db.dsa_companies
+roadmaps_collection = db.roadmaps
+
 # Initialize handlers
 job_handlers = JobHandlers(db)
 internship_handlers = InternshipHandlers(db)
@@ -63,20 +92,38 @@ dsa_topic_handlers = DSATopicHandlers(db)
 dsa_question_handlers = DSAQuestionHandlers(db)
 dsa_sheet_handlers = DSASheetHandlers(db)
 company_handlers = CompanyHandlers(db)
+dsa_dashboard_handlers = DSADashboardHandlers(db)
 roadmap_handlers = RoadmapHandlers(db)
 auth_handlers = AuthHandlers(db)
 analytics_handlers = AnalyticsHandlers(db)
-bulk_operations_handlers = BulkOperationsHandlers(db)
-content_approval_handlers = ContentApprovalHandlers(db)
-push_notification_handlers = PushNotificationHandlers(db)
+bulk_operations_handlers = BulkOperationsHandlers(db, search_indexes={
+    "jobs": job_handlers.search_index,
+    "internships": internship_handlers.search_index
+})
+content_approval_handlers = ContentApprovalHandlers(db, search_indexes={
+    "jobs": job_handlers.search_index,
+    "internships": internship_handlers.search_index
+})
+push_dispatcher = PushDispatcher(db, get_push_transport())
+push_notification_handlers = PushNotificationHandlers(db, push_dispatcher)
 
 # Initialize Gemini AI
 gemini_api_key = os.environ.get('GEMINI_API_KEY')
-gemini_generator = GeminiJobGenerator(gemini_api_key) if gemini_api_key else None
-article_gemini_generator = GeminiArticleGenerator(gemini_api_key) if gemini_api_key else None
-dsa_gemini_generator = GeminiDSAGenerator(gemini_api_key) if gemini_api_key else None
-roadmap_gemini_generator = GeminiRoadmapGenerator(gemini_api_key) if gemini_api_key else None
-career_tools_handlers = CareerToolsHandlers(db, gemini_api_key) if gemini_api_key else None
+if gemini_api_key:
+    gemini_models.configure(gemini_api_key)
+# Every executor call is logged here, written in batches by the flusher
+gemini_usage_log.bind(db["gemini_api_logs"])
+api_usage_log.bind(db["api_usage_logs"])
+gemini_generator = GeminiJobGenerator() if gemini_api_key else None
+article_gemini_generator = GeminiArticleGenerator() if gemini_api_key else None
+dsa_gemini_generator = GeminiDSAGenerator() if gemini_api_key else None
+roadmap_gemini_generator = GeminiRoadmapGenerator() if gemini_api_key else None
+career_tools_handlers = CareerToolsHandlers(db) if gemini_api_key else None
+ai_batch_handlers = AIBatchHandlers(db, gemini_generator, search_indexes={
+    "jobs": job_handlers.search_index,
+    "internships": internship_handlers.search_index,
+    "scholarships": scholarship_handlers.search_index
+})
 
 # Security
 security = HTTPBearer()
@@ -85,12 +132,14 @@ security = HTTPBearer()
 # AUTH DEPENDENCY
 # =============================================================================
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current authenticated user from token"""
     token = credentials.credentials
     user = await auth_handlers.get_current_user(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    # Picked up by the request timing middleware for api_usage_logs
+    request.state.user_id = user.get("id")
     return user
 
 async def get_current_admin(user = Depends(get_current_user)):
@@ -99,6 +148,14 @@ async def get_current_admin(user = Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Admin access required")
     return user
 
+async def admit_career_tool_request(user = Depends(get_current_user)):
+    """Apply the per-user AI rate limit and the career tools quota"""
+    if not career_tools_handlers:
+        raise HTTPException(status_code=503, detail="Career tools service not available")
+    ai_rate_limiter.check_user(user["id"])
+    await career_tools_handlers.check_quota(user["id"])
+    return user
+
 # Create the main app without a prefix
 app = FastAPI(title="CareerGuide API", version="1.0.0")
 
@@ -139,6 +196,11 @@ async def generate_job_with_ai(
     generated_job = await gemini_generator.generate_job_listing(prompt_data)
     return await job_handlers.create_job(generated_job)
 
+@api_router.post("/admin/jobs/generate-ai/batch", tags=["Admin - AI Batch Generation"])
+async def generate_jobs_batch_with_ai(batch: JobAIBatch, admin = Depends(get_current_admin)):
+    """Generate many job listings in the background; poll /admin/ai-batches/{batch_id}"""
+    return await ai_batch_handlers.create_batch("jobs", [item.dict() for item in batch.items])
+
 @api_router.get("/admin/jobs", tags=["Admin - Jobs"])
 async def get_all_jobs(
     skip: int = Query(0, ge=0),
@@ -149,7 +211,10 @@ async def get_all_jobs(
     experience_level: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
     sort_by: str = Query("created_at"),
-    sort_order: int = Query(-1, ge=-1, le=1)
+    sort_order: int = Query(-1, ge=-1, le=1),
+    search_mode: str = Query("index", pattern="^(index|regex)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get all jobs with filtering, searching, and sorting"""
     return await job_handlers.get_all_jobs(
@@ -161,7 +226,10 @@ async def get_all_jobs(
         experience_level=experience_level,
         is_active=is_active,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        search_mode=search_mode,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/admin/jobs/{job_id}", tags=["Admin - Jobs"])
@@ -211,6 +279,11 @@ async def generate_internship_with_ai(
     generated_internship = await gemini_generator.generate_internship_listing(prompt_data)
     return await internship_handlers.create_internship(generated_internship)
 
+@api_router.post("/admin/internships/generate-ai/batch", tags=["Admin - AI Batch Generation"])
+async def generate_internships_batch_with_ai(batch: InternshipAIBatch, admin = Depends(get_current_admin)):
+    """Generate many internship listings in the background; poll /admin/ai-batches/{batch_id}"""
+    return await ai_batch_handlers.create_batch("internships", [item.dict() for item in batch.items])
+
 @api_router.get("/admin/internships", tags=["Admin - Internships"])
 async def get_all_internships(
     skip: int = Query(0, ge=0),
@@ -220,7 +293,10 @@ async def get_all_internships(
     internship_type: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
     sort_by: str = Query("created_at"),
-    sort_order: int = Query(-1, ge=-1, le=1)
+    sort_order: int = Query(-1, ge=-1, le=1),
+    search_mode: str = Query("index", pattern="^(index|regex)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get all internships with filtering and sorting"""
     return await internship_handlers.get_all_internships(
@@ -231,7 +307,10 @@ async def get_all_internships(
         internship_type=internship_type,
         is_active=is_active,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        search_mode=search_mode,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/admin/internships/{internship_id}", tags=["Admin - Internships"])
@@ -279,6 +358,21 @@ async def generate_scholarship_with_ai(
     generated_scholarship = await gemini_generator.generate_scholarship_listing(prompt_data)
     return await scholarship_handlers.create_scholarship(generated_scholarship)
 
+@api_router.post("/admin/scholarships/generate-ai/batch", tags=["Admin - AI Batch Generation"])
+async def generate_scholarships_batch_with_ai(batch: ScholarshipAIBatch, admin = Depends(get_current_admin)):
+    """Generate many scholarship listings in the background; poll /admin/ai-batches/{batch_id}"""
+    return await ai_batch_handlers.create_batch("scholarships", [item.dict() for item in batch.items])
+
+@api_router.get("/admin/ai-batches", tags=["Admin - AI Batch Generation"])
+async def list_ai_batches(limit: int = Query(20, ge=1, le=100), admin = Depends(get_current_admin)):
+    """List recent AI batch generation jobs"""
+    return await ai_batch_handlers.list_batches(limit)
+
+@api_router.get("/admin/ai-batches/{batch_id}", tags=["Admin - AI Batch Generation"])
+async def get_ai_batch(batch_id: str, admin = Depends(get_current_admin)):
+    """Get AI batch status and per-item results"""
+    return await ai_batch_handlers.get_batch(batch_id)
+
 @api_router.get("/admin/scholarships", tags=["Admin - Scholarships"])
 async def get_all_scholarships(
     skip: int = Query(0, ge=0),
@@ -289,7 +383,10 @@ async def get_all_scholarships(
     country: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
     sort_by: str = Query("created_at"),
-    sort_order: int = Query(-1, ge=-1, le=1)
+    sort_order: int = Query(-1, ge=-1, le=1),
+    search_mode: str = Query("index", pattern="^(index|regex)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get all scholarships with filtering and sorting"""
     return await scholarship_handlers.get_all_scholarships(
@@ -301,7 +398,10 @@ async def get_all_scholarships(
         country=country,
         is_active=is_active,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        search_mode=search_mode,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/admin/scholarships/{scholarship_id}", tags=["Admin - Scholarships"])
@@ -334,7 +434,8 @@ async def generate_article_with_ai(
     category: str = Query(default="technology", description="Article category"),
     author: str = Query(default="Admin", description="Author name"),
     target_audience: str = Query(default="professionals and students", description="Target audience"),
-    key_points: Optional[str] = Query(None, description="Comma-separated key points to cover")
+    key_points: Optional[str] = Query(None, description="Comma-separated key points to cover"),
+    stream: bool = Query(False, description="Stream generation progress as server-sent events")
 ):
     """Generate an article using Gemini AI"""
     if not article_gemini_generator:
@@ -351,6 +452,15 @@ async def generate_article_with_ai(
     if key_points:
         prompt_data["key_points"] = [kp.strip() for kp in key_points.split(",")]
     
+    if stream:
+        async def events():
+            async for event in article_gemini_generator.stream_article(prompt_data):
+                if event["event"] == "result":
+                    yield {"event": "done", "data": await article_handlers.create_article(event["data"])}
+                else:
+                    yield event
+        return sse_response(events())
+    
     generated_article = await article_gemini_generator.generate_article(prompt_data)
     return await article_handlers.create_article(generated_article)
 
@@ -363,7 +473,9 @@ async def get_all_articles(
     tags: Optional[str] = Query(None, description="Comma-separated tags"),
     is_published: Optional[bool] = Query(None),
     sort_by: str = Query("created_at"),
-    sort_order: int = Query(-1, ge=-1, le=1)
+    sort_order: int = Query(-1, ge=-1, le=1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get all articles with filtering and sorting"""
     tags_list = [tag.strip() for tag in tags.split(",")] if tags else None
@@ -376,7 +488,9 @@ async def get_all_articles(
         tags=tags_list,
         is_published=is_published,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/admin/articles/{article_id}", tags=["Admin - Articles"])
@@ -416,7 +530,9 @@ async def get_all_dsa_topics(
     is_active: Optional[bool] = Query(None),
     parent_topic: Optional[str] = Query(None),
     sort_by: str = Query("name"),
-    sort_order: int = Query(1)
+    sort_order: int = Query(1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get all DSA topics with filtering and sorting"""
     return await dsa_topic_handlers.get_all_topics(
@@ -426,7 +542,9 @@ async def get_all_dsa_topics(
         is_active=is_active,
         parent_topic=parent_topic,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/admin/dsa/topics/stats", tags=["Admin - DSA Topics"])
@@ -434,6 +552,11 @@ async def get_dsa_topic_stats():
     """Get statistics for DSA topics"""
     return await dsa_topic_handlers.get_topic_stats()
 
+@api_router.post("/admin/dsa/topics/repair-counts", tags=["Admin - DSA Topics"])
+async def repair_dsa_topic_counts(admin = Depends(get_current_admin)):
+    """Recompute the denormalized question_count of every topic"""
+    return await dsa_topic_handlers.repair_question_counts()
+
 @api_router.get("/admin/dsa/topics/{topic_id}", tags=["Admin - DSA Topics"])
 async def get_dsa_topic(topic_id: str):
     """Get a specific DSA topic by ID"""
@@ -488,7 +611,9 @@ async def get_all_dsa_questions(
     is_active: Optional[bool] = Query(None),
     is_premium: Optional[bool] = Query(None),
     sort_by: str = Query("created_at"),
-    sort_order: int = Query(-1)
+    sort_order: int = Query(-1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get all DSA questions with filtering and sorting"""
     return await dsa_question_handlers.get_all_questions(
@@ -501,7 +626,9 @@ async def get_all_dsa_questions(
         is_active=is_active,
         is_premium=is_premium,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/admin/dsa/questions/stats/difficulty", tags=["Admin - DSA Questions"])
@@ -573,7 +700,9 @@ async def get_all_dsa_sheets(
     is_featured: Optional[bool] = Query(None),
     is_premium: Optional[bool] = Query(None),
     sort_by: str = Query("created_at"),
-    sort_order: int = Query(-1)
+    sort_order: int = Query(-1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get all DSA sheets with filtering and sorting"""
     return await dsa_sheet_handlers.get_all_sheets(
@@ -586,7 +715,9 @@ async def get_all_dsa_sheets(
         is_featured=is_featured,
         is_premium=is_premium,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/admin/dsa/sheets/stats", tags=["Admin - DSA Sheets"])
@@ -645,7 +776,9 @@ async def get_all_companies(
     industry: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
     sort_by: str = Query("name"),
-    sort_order: str = Query("asc")
+    sort_order: str = Query("asc"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get list of companies with filters"""
     return await company_handlers.get_companies(
@@ -655,7 +788,9 @@ async def get_all_companies(
         industry=industry,
         is_active=is_active,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/admin/dsa/companies/stats", tags=["Admin - DSA Companies"])
@@ -687,6 +822,11 @@ async def delete_company(company_id: str):
     success = await company_handlers.delete_company(company_id)
     return {"success": success, "message": "Company deleted" if success else "Company not found"}
 
+@api_router.post("/admin/dsa/dashboard/rebuild", tags=["Admin - DSA Dashboard"])
+async def rebuild_dsa_dashboard(admin = Depends(get_current_admin)):
+    """Rebuild the public DSA dashboard snapshot immediately"""
+    return await dsa_dashboard_handlers.rebuild_dashboard()
+
 # =============================================================================
 # ADMIN ROUTES - ROADMAPS
 # =============================================================================
@@ -697,11 +837,23 @@ async def create_roadmap(roadmap: RoadmapCreate):
     return await roadmap_handlers.create_roadmap(roadmap.dict())
 
 @api_router.post("/admin/roadmaps/generate-ai", response_model=dict, tags=["Admin - Roadmaps"])
-async def generate_roadmap_with_ai(prompt_data: RoadmapAIGenerate):
+async def generate_roadmap_with_ai(
+    prompt_data: RoadmapAIGenerate,
+    stream: bool = Query(False, description="Stream generation progress as server-sent events")
+):
     """Generate a complete roadmap using Gemini AI"""
     if not roadmap_gemini_generator:
         return {"error": "Gemini API not configured"}
     
+    if stream:
+        async def events():
+            async for event in roadmap_gemini_generator.stream_roadmap(prompt_data.dict()):
+                if event["event"] == "result":
+                    yield {"event": "done", "data": await roadmap_handlers.create_roadmap(event["data"])}
+                else:
+                    yield event
+        return sse_response(events())
+    
     generated_roadmap = await roadmap_gemini_generator.generate_roadmap(prompt_data.dict())
     return await roadmap_handlers.create_roadmap(generated_roadmap)
 
@@ -716,7 +868,9 @@ async def get_all_roadmaps(
     is_published: Optional[bool] = Query(None),
     is_active: Optional[bool] = Query(None),
     sort_by: str = Query("created_at"),
-    sort_order: str = Query("desc")
+    sort_order: str = Query("desc"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get list of roadmaps with filters"""
     return await roadmap_handlers.get_roadmaps(
@@ -729,7 +883,9 @@ async def get_all_roadmaps(
         is_published=is_published,
         is_active=is_active,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/admin/roadmaps/stats", tags=["Admin - Roadmaps"])
@@ -837,6 +993,8 @@ async def get_all_admins(
     skip: int = 0,
     limit: int = 50,
     role: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$"),
     current_user = Depends(get_current_user)
 ):
     """Get list of all admins (Super Admin only)"""
@@ -844,7 +1002,7 @@ async def get_all_admins(
         raise HTTPException(status_code=403, detail="Admin access required")
     if current_user.get("role") != "super_admin":
         raise HTTPException(status_code=403, detail="Super admin access required")
-    return await auth_handlers.get_all_admins(skip, limit, role)
+    return await auth_handlers.get_all_admins(skip, limit, role, cursor=cursor, count=count)
 
 @api_router.get("/admin/sub-admins/{admin_id}", tags=["Admin Management"])
 async def get_admin_by_id(admin_id: str, current_user = Depends(get_current_user)):
@@ -888,31 +1046,55 @@ async def toggle_admin_status(admin_id: str, current_user = Depends(get_current_
 # =============================================================================
 
 @api_router.post("/career-tools/resume-review", tags=["Career Tools"])
-async def review_resume(request_data: ResumeReviewRequest, current_user = Depends(get_current_user)):
+async def review_resume(
+    request_data: ResumeReviewRequest,
+    stream: bool = Query(False, description="Stream the output as server-sent events"),
+    current_user = Depends(admit_career_tool_request)
+):
     """Review resume using AI (Auth Required)"""
     if not career_tools_handlers:
         raise HTTPException(status_code=503, detail="Career tools service not available")
+    if stream:
+        return sse_response(career_tools_handlers.stream_tool(current_user["id"], "resume_review", request_data.dict()))
     return await career_tools_handlers.review_resume(current_user["id"], request_data.dict())
 
 @api_router.post("/career-tools/cover-letter", tags=["Career Tools"])
-async def generate_cover_letter(request_data: CoverLetterRequest, current_user = Depends(get_current_user)):
+async def generate_cover_letter(
+    request_data: CoverLetterRequest,
+    stream: bool = Query(False, description="Stream the output as server-sent events"),
+    current_user = Depends(admit_career_tool_request)
+):
     """Generate cover letter using AI (Auth Required)"""
     if not career_tools_handlers:
         raise HTTPException(status_code=503, detail="Career tools service not available")
+    if stream:
+        return sse_response(career_tools_handlers.stream_tool(current_user["id"], "cover_letter", request_data.dict()))
     return await career_tools_handlers.generate_cover_letter(current_user["id"], request_data.dict())
 
 @api_router.post("/career-tools/ats-hack", tags=["Career Tools"])
-async def optimize_for_ats(request_data: ATSHackRequest, current_user = Depends(get_current_user)):
+async def optimize_for_ats(
+    request_data: ATSHackRequest,
+    stream: bool = Query(False, description="Stream the output as server-sent events"),
+    current_user = Depends(admit_career_tool_request)
+):
     """Optimize resume for ATS using AI (Auth Required)"""
     if not career_tools_handlers:
         raise HTTPException(status_code=503, detail="Career tools service not available")
+    if stream:
+        return sse_response(career_tools_handlers.stream_tool(current_user["id"], "ats_hack", request_data.dict()))
     return await career_tools_handlers.optimize_for_ats(current_user["id"], request_data.dict())
 
 @api_router.post("/career-tools/cold-email", tags=["Career Tools"])
-async def generate_cold_email(request_data: ColdEmailRequest, current_user = Depends(get_current_user)):
+async def generate_cold_email(
+    request_data: ColdEmailRequest,
+    stream: bool = Query(False, description="Stream the output as server-sent events"),
+    current_user = Depends(admit_career_tool_request)
+):
     """Generate cold email using AI (Auth Required)"""
     if not career_tools_handlers:
         raise HTTPException(status_code=503, detail="Career tools service not available")
+    if stream:
+        return sse_response(career_tools_handlers.stream_tool(current_user["id"], "cold_email", request_data.dict()))
     return await career_tools_handlers.generate_cold_email(current_user["id"], request_data.dict())
 
 @api_router.get("/career-tools/my-usage", tags=["Career Tools"])
@@ -977,6 +1159,14 @@ async def get_user_engagement_metrics(admin = Depends(get_current_admin)):
     metrics = await analytics_handlers.get_user_engagement_metrics()
     return {"success": True, "data": metrics}
 
+@api_router.post("/admin/analytics/rollups/rebuild", tags=["Admin - Analytics"])
+async def rebuild_activity_rollups(
+    days: int = Query(30, ge=1, le=400),
+    admin = Depends(get_current_admin)
+):
+    """Recompute the active-user rollups from user_activities"""
+    return {"success": True, "data": await analytics_handlers.rollups.rebuild(days)}
+
 @api_router.get("/admin/analytics/job-applications", tags=["Admin - Analytics"])
 async def get_job_application_metrics(admin = Depends(get_current_admin)):
     """Get job application statistics"""
@@ -987,6 +1177,7 @@ async def get_job_application_metrics(admin = Depends(get_current_admin)):
 async def get_gemini_usage_metrics(admin = Depends(get_current_admin)):
     """Get Gemini API usage tracking"""
     metrics = await analytics_handlers.get_gemini_api_usage_metrics()
+    metrics["rate_limiter"] = ai_rate_limiter.get_stats()
     return {"success": True, "data": metrics}
 
 @api_router.get("/admin/analytics/api-logs", tags=["Admin - Analytics"])
@@ -994,61 +1185,129 @@ async def get_api_logs(
     admin = Depends(get_current_admin),
     limit: int = Query(100, ge=1, le=500),
     skip: int = Query(0, ge=0),
-    status_code: Optional[int] = Query(None)
+    status_code: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get API usage logs"""
-    return await analytics_handlers.get_api_usage_logs(limit=limit, skip=skip, status_code=status_code)
+    return await analytics_handlers.get_api_usage_logs(limit=limit, skip=skip, status_code=status_code, cursor=cursor, count=count)
 
 @api_router.get("/admin/analytics/error-logs", tags=["Admin - Analytics"])
 async def get_error_logs(
     admin = Depends(get_current_admin),
     limit: int = Query(100, ge=1, le=500),
-    skip: int = Query(0, ge=0)
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get error logs (status code >= 400)"""
-    return await analytics_handlers.get_error_logs(limit=limit, skip=skip)
+    return await analytics_handlers.get_error_logs(limit=limit, skip=skip, cursor=cursor, count=count)
+
+@api_router.get("/admin/analytics/runtime", tags=["Admin - Analytics"])
+async def get_runtime_metrics(admin = Depends(get_current_admin)):
+    """Get in-process runtime metrics (AI executor queues, caches)"""
+    return {
+        "success": True,
+        "data": {
+            "ai_executor": ai_executor.get_stats(),
+            "ai_parsing": parse_metrics.get_stats(),
+            "gemini_models": gemini_models.get_stats(),
+            "count_cache": count_cache.get_stats(),
+            "stats_cache": stats_cache.get_stats(),
+            "dsa_dashboard": dsa_dashboard_handlers.snapshot.get_stats(),
+            "view_counter": view_counter.get_stats(),
+            "activity_rollups": analytics_handlers.rollups.get_stats(),
+            "api_usage_log": api_usage_log.get_stats(),
+            "principal_cache": auth_handlers.principal_cache.get_stats(),
+            "password_hasher": password_hasher.get_stats(),
+            "ai_batches": ai_batch_handlers.get_stats(),
+            "push_dispatch": push_dispatcher.get_stats(),
+            "search_indexes": {
+                "jobs": job_handlers.search_index.get_stats(),
+                "internships": internship_handlers.search_index.get_stats(),
+                "scholarships": scholarship_handlers.search_index.get_stats()
+            },
+            "prompt_templates": career_tools_handlers.template_cache.get_stats() if career_tools_handlers else None
+        }
+    }
+
+@api_router.get("/admin/system/indexes", tags=["Admin - System"])
+async def get_index_report(admin = Depends(get_current_admin)):
+    """Compare declared collection indexes with the live ones"""
+    return {"success": True, "data": await get_index_drift(db)}
+
+@api_router.post("/admin/system/indexes", tags=["Admin - System"])
+async def apply_indexes(admin = Depends(get_current_admin)):
+    """Create any missing declared indexes"""
+    return {"success": True, "data": await ensure_indexes(db)}
 
 # =============================================================================
 # ADMIN ROUTES - BULK OPERATIONS (MODULE 6)
 # =============================================================================
 
-@api_router.get("/admin/bulk/jobs/export", tags=["Admin - Bulk Operations"])
-async def export_jobs_csv(admin = Depends(get_current_admin)):
-    """Export jobs to CSV format"""
-    from fastapi.responses import StreamingResponse
-    import io
-    
-    csv_data = await bulk_operations_handlers.export_jobs_csv()
-    
+def export_response(chunks, basename: str, format: str, gzip: bool) -> StreamingResponse:
+    """Wrap an export chunk stream as a file download"""
+    filename = f"{basename}.{format}" + (".gz" if gzip else "")
+    media_type = "application/gzip" if gzip else ("text/csv" if format == "csv" else "application/x-ndjson")
     return StreamingResponse(
-        io.StringIO(csv_data),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=jobs_export.csv"}
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@api_router.get("/admin/bulk/jobs/export", tags=["Admin - Bulk Operations"])
+async def export_jobs_csv(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    batch_size: int = Query(1000, ge=1, le=10000),
+    admin = Depends(get_current_admin)
+):
+    """Export jobs as a streamed CSV or NDJSON download, optionally gzipped"""
+    return export_response(
+        bulk_operations_handlers.export_jobs(format=format, compress=gzip, batch_size=batch_size),
+        "jobs_export", format, gzip
     )
 
 @api_router.post("/admin/bulk/jobs/import", tags=["Admin - Bulk Operations"])
-async def import_jobs_csv(csv_data: str, admin = Depends(get_current_admin)):
-    """Import jobs from CSV data"""
-    return await bulk_operations_handlers.import_jobs_csv(csv_data)
+async def import_jobs_csv(
+    request: Request,
+    batch_size: int = Query(1000, ge=1, le=5000),
+    admin = Depends(get_current_admin)
+):
+    """
+    Import jobs from a CSV request body (Content-Type: text/csv)
+
+    The body is parsed as it arrives and written in insert_many batches;
+    rows matching an existing title + company + location are skipped.
+    """
+    return await bulk_operations_handlers.import_jobs_csv(request.stream(), batch_size)
 
 @api_router.get("/admin/bulk/internships/export", tags=["Admin - Bulk Operations"])
-async def export_internships_csv(admin = Depends(get_current_admin)):
-    """Export internships to CSV format"""
-    from fastapi.responses import StreamingResponse
-    import io
-    
-    csv_data = await bulk_operations_handlers.export_internships_csv()
-    
-    return StreamingResponse(
-        io.StringIO(csv_data),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=internships_export.csv"}
+async def export_internships_csv(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    batch_size: int = Query(1000, ge=1, le=10000),
+    admin = Depends(get_current_admin)
+):
+    """Export internships as a streamed CSV or NDJSON download, optionally gzipped"""
+    return export_response(
+        bulk_operations_handlers.export_internships(format=format, compress=gzip, batch_size=batch_size),
+        "internships_export", format, gzip
     )
 
 @api_router.post("/admin/bulk/internships/import", tags=["Admin - Bulk Operations"])
-async def import_internships_csv(csv_data: str, admin = Depends(get_current_admin)):
-    """Import internships from CSV data"""
-    return await bulk_operations_handlers.import_internships_csv(csv_data)
+async def import_internships_csv(
+    request: Request,
+    batch_size: int = Query(1000, ge=1, le=5000),
+    admin = Depends(get_current_admin)
+):
+    """
+    Import internships from a CSV request body (Content-Type: text/csv)
+
+    The body is parsed as it arrives and written in insert_many batches;
+    rows matching an existing title + company + location are skipped.
+    """
+    return await bulk_operations_handlers.import_internships_csv(request.stream(), batch_size)
 
 @api_router.post("/admin/bulk/jobs/delete", tags=["Admin - Bulk Operations"])
 async def bulk_delete_jobs(job_ids: List[str], admin = Depends(get_current_admin)):
@@ -1092,13 +1351,35 @@ async def get_pending_submissions(
     admin = Depends(get_current_admin),
     content_type: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=200),
-    skip: int = Query(0, ge=0)
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get all pending content submissions"""
     return await content_approval_handlers.get_pending_submissions(
         content_type=content_type,
         limit=limit,
-        skip=skip
+        skip=skip,
+        cursor=cursor,
+        count=count
+    )
+
+@api_router.post("/admin/content/bulk/approve", tags=["Admin - Content Approval"])
+async def bulk_approve_submissions(request: BulkApproveRequest, admin = Depends(get_current_admin)):
+    """Approve and publish many content submissions"""
+    return await content_approval_handlers.bulk_approve_submissions(
+        submission_ids=request.submission_ids,
+        reviewed_by=admin.get("id"),
+        review_notes=request.review_notes
+    )
+
+@api_router.post("/admin/content/bulk/reject", tags=["Admin - Content Approval"])
+async def bulk_reject_submissions(request: BulkRejectRequest, admin = Depends(get_current_admin)):
+    """Reject many content submissions"""
+    return await content_approval_handlers.bulk_reject_submissions(
+        submission_ids=request.submission_ids,
+        reviewed_by=admin.get("id"),
+        review_notes=request.review_notes
     )
 
 @api_router.post("/admin/content/{submission_id}/approve", tags=["Admin - Content Approval"])
@@ -1143,6 +1424,7 @@ async def create_notification(
     target: str = Query(..., description="all, specific_users, admins"),
     target_ids: Optional[List[str]] = None,
     data: Optional[Dict] = None,
+    scheduled_at: Optional[datetime] = Query(None, description="UTC send time; sent by the scheduler once due. Without it the notification waits for POST /admin/notifications/{id}/send"),
     admin = Depends(get_current_admin)
 ):
     """Create a push notification"""
@@ -1151,7 +1433,8 @@ async def create_notification(
         message=message,
         target=target,
         target_ids=target_ids,
-        data=data
+        data=data,
+        scheduled_at=scheduled_at
     )
 
 @api_router.get("/admin/notifications", tags=["Admin - Push Notifications"])
@@ -1159,20 +1442,35 @@ async def get_notifications(
     admin = Depends(get_current_admin),
     status: Optional[str] = Query(None, description="pending, sent, failed"),
     limit: int = Query(50, ge=1, le=200),
-    skip: int = Query(0, ge=0)
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("exact", pattern="^(exact|estimated|none)$")
 ):
     """Get push notifications"""
     return await push_notification_handlers.get_notifications(
         status=status,
         limit=limit,
-        skip=skip
+        skip=skip,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.post("/admin/notifications/{notification_id}/send", tags=["Admin - Push Notifications"])
 async def send_notification(notification_id: str, admin = Depends(get_current_admin)):
-    """Send a push notification"""
+    """Send a push notification now (delivered in the background)"""
     return await push_notification_handlers.send_notification(notification_id)
 
+@api_router.get("/admin/notifications/{notification_id}/deliveries", tags=["Admin - Push Notifications"])
+async def get_notification_deliveries(
+    notification_id: str,
+    admin = Depends(get_current_admin),
+    limit: int = Query(50, ge=1, le=200),
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """Get per-batch delivery results of a push notification"""
+    return await push_notification_handlers.get_deliveries(notification_id, limit=limit, skip=skip, cursor=cursor)
+
 @api_router.delete("/admin/notifications/{notification_id}", tags=["Admin - Push Notifications"])
 async def delete_notification(notification_id: str, admin = Depends(get_current_admin)):
     """Delete a push notification"""
@@ -1196,7 +1494,10 @@ async def get_user_jobs(
     job_type: Optional[str] = Query(None),
     experience_level: Optional[str] = Query(None),
     sort_by: str = Query("created_at"),
-    sort_order: int = Query(-1)
+    sort_order: int = Query(-1),
+    search_mode: str = Query("index", pattern="^(index|regex)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("estimated", pattern="^(exact|estimated|none)$")
 ):
     """Public endpoint for users to browse active jobs"""
     return await job_handlers.get_all_jobs(
@@ -1208,7 +1509,10 @@ async def get_user_jobs(
         experience_level=experience_level,
         is_active=True,  # Only show active jobs
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        search_mode=search_mode,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/user/jobs/{job_id}", tags=["User - Jobs"])
@@ -1224,7 +1528,10 @@ async def get_user_internships(
     category: Optional[str] = Query(None),
     internship_type: Optional[str] = Query(None),
     sort_by: str = Query("created_at"),
-    sort_order: int = Query(-1)
+    sort_order: int = Query(-1),
+    search_mode: str = Query("index", pattern="^(index|regex)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("estimated", pattern="^(exact|estimated|none)$")
 ):
     """Public endpoint for users to browse active internships"""
     return await internship_handlers.get_all_internships(
@@ -1235,7 +1542,10 @@ async def get_user_internships(
         internship_type=internship_type,
         is_active=True,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        search_mode=search_mode,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/user/scholarships", tags=["User - Scholarships"])
@@ -1247,7 +1557,10 @@ async def get_user_scholarships(
     education_level: Optional[str] = Query(None),
     country: Optional[str] = Query(None),
     sort_by: str = Query("created_at"),
-    sort_order: int = Query(-1)
+    sort_order: int = Query(-1),
+    search_mode: str = Query("index", pattern="^(index|regex)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("estimated", pattern="^(exact|estimated|none)$")
 ):
     """Public endpoint for users to browse active scholarships"""
     return await scholarship_handlers.get_all_scholarships(
@@ -1259,7 +1572,10 @@ async def get_user_scholarships(
         country=country,
         is_active=True,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        search_mode=search_mode,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/user/articles", tags=["User - Articles"])
@@ -1270,7 +1586,9 @@ async def get_user_articles(
     category: Optional[str] = Query(None),
     tags: Optional[str] = Query(None),
     sort_by: str = Query("created_at"),
-    sort_order: int = Query(-1)
+    sort_order: int = Query(-1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("estimated", pattern="^(exact|estimated|none)$")
 ):
     """Public endpoint for users to browse published articles"""
     tags_list = [tag.strip() for tag in tags.split(",")] if tags else None
@@ -1283,7 +1601,9 @@ async def get_user_articles(
         tags=tags_list,
         is_published=True,  # Only show published articles
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        count=count
     )
 
 @api_router.get("/user/articles/{article_id}", tags=["User - Articles"])
@@ -1300,7 +1620,8 @@ async def get_user_dsa_topics(
     is_active: Optional[bool] = None,
     search: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
     """Public endpoint to get DSA topics"""
     filters = {}
@@ -1312,8 +1633,7 @@ async def get_user_dsa_topics(
             {"description": {"$regex": search, "$options": "i"}}
         ]
     
-    topics_cursor = dsa_topics_collection.find(filters).skip(skip).limit(limit)
-    topics = await topics_cursor.to_list(length=limit)
+    topics, next_cursor = await fetch_page(dsa_topics_collection, filters, "_id", 1, limit, cursor=cursor, skip=skip)
     
     for topic in topics:
         topic["_id"] = str(topic["_id"])
@@ -1322,7 +1642,7 @@ async def get_user_dsa_topics(
         if "updated_at" in topic:
             topic["updated_at"] = topic["updated_at"].isoformat()
     
-    return {"success": True, "data": topics}
+    return {"success": True, "data": topics, "next_cursor": next_cursor}
 
 @api_router.get("/user/dsa/questions", tags=["User - DSA"])
 async def get_user_dsa_questions(
@@ -1331,7 +1651,8 @@ async def get_user_dsa_questions(
     company: Optional[str] = None,
     search: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
     """Public endpoint to get DSA questions"""
     filters = {}
@@ -1347,8 +1668,7 @@ async def get_user_dsa_questions(
             {"description": {"$regex": search, "$options": "i"}}
         ]
     
-    questions_cursor = dsa_questions_collection.find(filters).skip(skip).limit(limit)
-    questions = await questions_cursor.to_list(length=limit)
+    questions, next_cursor = await fetch_page(dsa_questions_collection, filters, "_id", 1, limit, cursor=cursor, skip=skip)
     
     for question in questions:
         question["_id"] = str(question["_id"])
@@ -1357,7 +1677,7 @@ async def get_user_dsa_questions(
         if "updated_at" in question:
             question["updated_at"] = question["updated_at"].isoformat()
     
-    return {"success": True, "data": questions}
+    return {"success": True, "data": questions, "next_cursor": next_cursor}
 
 @api_router.get("/user/dsa/questions/{question_id}", tags=["User - DSA"])
 async def get_user_dsa_question(question_id: str):
@@ -1383,7 +1703,8 @@ async def get_user_dsa_sheets(
     level: Optional[str] = None,
     search: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
     """Public endpoint to get DSA sheets (only published)"""
     filters = {}
@@ -1397,8 +1718,7 @@ async def get_user_dsa_sheets(
             {"description": {"$regex": search, "$options": "i"}}
         ]
     
-    sheets_cursor = dsa_sheets_collection.find(filters).skip(skip).limit(limit)
-    sheets = await sheets_cursor.to_list(length=limit)
+    sheets, next_cursor = await fetch_page(dsa_sheets_collection, filters, "_id", 1, limit, cursor=cursor, skip=skip)
     
     for sheet in sheets:
         sheet["_id"] = str(sheet["_id"])
@@ -1407,14 +1727,15 @@ async def get_user_dsa_sheets(
         if "updated_at" in sheet:
             sheet["updated_at"] = sheet["updated_at"].isoformat()
     
-    return {"success": True, "data": sheets}
+    return {"success": True, "data": sheets, "next_cursor": next_cursor}
 
 @api_router.get("/user/dsa/companies", tags=["User - DSA"])
 async def get_user_dsa_companies(
     is_active: Optional[bool] = None,
     search: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
     """Public endpoint to get DSA companies"""
     filters = {}
@@ -1426,8 +1747,7 @@ async def get_user_dsa_companies(
             {"industry": {"$regex": search, "$options": "i"}}
         ]
     
-    companies_cursor = dsa_companies_collection.find(filters).skip(skip).limit(limit)
-    companies = await companies_cursor.to_list(length=limit)
+    companies, next_cursor = await fetch_page(dsa_companies_collection, filters, "_id", 1, limit, cursor=cursor, skip=skip)
     
     for company in companies:
         company["_id"] = str(company["_id"])
@@ -1436,7 +1756,7 @@ async def get_user_dsa_companies(
         if "updated_at" in company:
             company["updated_at"] = company["updated_at"].isoformat()
     
-    return {"success": True, "data": companies}
+    return {"success": True, "data": companies, "next_cursor": next_cursor}
 
 @api_router.get("/user/dsa/companies/top", tags=["User - DSA"])
 async def get_user_top_dsa_companies(limit: int = 10):
@@ -1455,40 +1775,8 @@ async def get_user_top_dsa_companies(limit: int = 10):
 
 @api_router.get("/user/dsa/dashboard", tags=["User - DSA"])
 async def get_user_dsa_dashboard():
-    """Public endpoint to get DSA dashboard data"""
-    # Get counts
-    topics_count = await dsa_topics_collection.count_documents({"is_active": True})
-    questions_count = await dsa_questions_collection.count_documents({})
-    sheets_count = await dsa_sheets_collection.count_documents({"is_published": True})
-    companies_count = await dsa_companies_collection.count_documents({"is_active": True})
-    
-    # Get top topics by question count
-    top_topics_cursor = dsa_topics_collection.find({"is_active": True}).sort("question_count", -1).limit(5)
-    top_topics = await top_topics_cursor.to_list(length=5)
-    
-    # Get top companies
-    top_companies_cursor = dsa_companies_collection.find({"is_active": True}).sort("problem_count", -1).limit(5)
-    top_companies = await top_companies_cursor.to_list(length=5)
-    
-    for topic in top_topics:
-        topic["_id"] = str(topic["_id"])
-    
-    for company in top_companies:
-        company["_id"] = str(company["_id"])
-    
-    return {
-        "success": True,
-        "data": {
-            "stats": {
-                "total_topics": topics_count,
-                "total_questions": questions_count,
-                "total_sheets": sheets_count,
-                "total_companies": companies_count
-            },
-            "top_topics": top_topics,
-            "top_companies": top_companies
-        }
-    }
+    """Public endpoint to get DSA dashboard data (served from the in-memory snapshot)"""
+    return await dsa_dashboard_handlers.get_dashboard()
 
 # =============================================================================
 # USER - ROADMAPS ENDPOINTS
@@ -1501,7 +1789,8 @@ async def get_user_roadmaps(
     difficulty: Optional[str] = None,
     search: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ):
     """Public endpoint to get roadmaps (only published)"""
     filters = {}
@@ -1517,8 +1806,7 @@ async def get_user_roadmaps(
             {"description": {"$regex": search, "$options": "i"}}
         ]
     
-    roadmaps_cursor = roadmaps_collection.find(filters).skip(skip).limit(limit)
-    roadmaps = await roadmaps_cursor.to_list(length=limit)
+    roadmaps, next_cursor = await fetch_page(roadmaps_collection, filters, "_id", 1, limit, cursor=cursor, skip=skip)
     
     for roadmap in roadmaps:
         roadmap["_id"] = str(roadmap["_id"])
@@ -1527,7 +1815,7 @@ async def get_user_roadmaps(
         if "updated_at" in roadmap:
             roadmap["updated_at"] = roadmap["updated_at"].isoformat()
     
-    return {"success": True, "data": roadmaps}
+    return {"success": True, "data": roadmaps, "next_cursor": next_cursor}
 
 @api_router.get("/user/roadmaps/{roadmap_id}", tags=["User - Roadmaps"])
 async def get_user_roadmap(roadmap_id: str):
@@ -1539,11 +1827,8 @@ async def get_user_roadmap(roadmap_id: str):
     if not roadmap:
         raise HTTPException(status_code=404, detail="Roadmap not found")
     
-    # Increment view count
-    await roadmaps_collection.update_one(
-        {"_id": ObjectId(roadmap_id)},
-        {"$inc": {"views": 1}}
-    )
+    # Count the view (written behind in batches)
+    view_counter.record(roadmaps_collection, roadmap["_id"])
     
     roadmap["_id"] = str(roadmap["_id"])
     if "created_at" in roadmap:
@@ -1584,6 +1869,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so latency covers every other middleware too
+app.add_middleware(RequestTimingMiddleware, log=api_usage_log)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -1591,6 +1879,62 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def ensure_db_indexes():
+    if os.environ.get("ENSURE_INDEXES_ON_STARTUP", "true").lower() != "true":
+        return
+    try:
+        await ensure_indexes(db)
+        logger.info("Database indexes ensured")
+    except Exception as e:
+        logger.error(f"Failed to ensure database indexes: {e}")
+
+@app.on_event("startup")
+async def repair_topic_question_counts():
+    # Reads trust dsa_topics.question_count; backfill it (and fix any drift)
+    # before serving, since topics created earlier were stored with 0
+    if os.environ.get("REPAIR_TOPIC_COUNTS_ON_STARTUP", "true").lower() != "true":
+        return
+    try:
+        result = await dsa_topic_handlers.repair_question_counts()
+        logger.info(f"DSA topic question counts checked: {result['data']}")
+    except Exception as e:
+        logger.error(f"Failed to repair DSA topic question counts: {e}")
+
+@app.on_event("startup")
+async def start_background_workers():
+    dsa_dashboard_handlers.snapshot.start()
+    view_counter.start()
+    gemini_usage_log.start()
+    api_usage_log.start()
+    analytics_handlers.rollups.start()
+    push_dispatcher.start()
+    for handlers in (job_handlers, internship_handlers, scholarship_handlers):
+        handlers.search_index.start()
+    try:
+        await ai_batch_handlers.recover_interrupted()
+    except Exception as e:
+        logger.error(f"Failed to recover AI batches: {e}")
+    if career_tools_handlers:
+        try:
+            await career_tools_handlers.template_cache.load()
+        except Exception as e:
+            logger.error(f"Failed to load prompt templates: {e}")
+        career_tools_handlers.template_cache.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    dsa_dashboard_handlers.snapshot.stop()
+    if career_tools_handlers:
+        career_tools_handlers.template_cache.stop()
+    await view_counter.stop()
+    await ai_batch_handlers.shutdown()
+    await push_dispatcher.stop()
+    await gemini_usage_log.stop()
+    await api_usage_log.stop()
+    await analytics_handlers.rollups.stop()
+    for handlers in (job_handlers, internship_handlers, scholarship_handlers):
+        await handlers.search_index.stop()
+    ai_executor.shutdown()
+    password_hasher.shutdown()
     client.close()
@@ -0,0 +1,26 @@
+"""
+Regression checks for the Gemini JSON response parser
+(backend/api/utils/ai/gemini/parsing/json_parser.py)
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from api.utils.ai.gemini.parsing.json_parser import AIResponseParseError, extract_json
+
+
+def test_skips_bracketed_prose_before_the_value():
+    assert extract_json('Sure [see below]: {"a":1}') == ({"a": 1}, "extracted")
+
+
+def test_fenced_object_with_trailing_comma_is_repaired():
+    assert extract_json('```json\n{"a": [1, 2,],}\n```') == ({"a": [1, 2]}, "repaired")
+
+
+def test_raises_when_no_span_parses():
+    with pytest.raises(AIResponseParseError, match="Invalid JSON"):
+        extract_json("Options: [a] or [b]")